@@ -7,17 +7,51 @@ from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, DataTable, Static, Input
 from textual.containers import Container, Vertical, Horizontal
 from textual.binding import Binding
-from textual.screen import ModalScreen
-from textual import on, events
+from textual.screen import ModalScreen, Screen
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.geometry import Size
+from textual.message import Message
+from textual import on, events, work
+from textual.css.query import NoMatches
 from textual.reactive import reactive
+from textual.worker import get_current_worker
+from rich.cells import set_cell_size
+from rich.markup import escape
+from rich.segment import Segment
 from rich.text import Text
 import webbrowser
 import platform
 import time
-
-from crawler import HITCONVulsCrawler, Vulnerability
+from collections import OrderedDict
+
+from crawler import (
+    SITE_URL,
+    HITCONVulsCrawler,
+    PageResult,
+    Vulnerability,
+    VulnerabilityColumns,
+    VulnerabilityDetail,
+)
 from config_loader import ConfigLoader
-from typing import List, Optional
+from page_archive import PageArchive
+from page_cache import DiskPageCache, LRUPageCache
+from metrics import write_prometheus_textfile
+from search_index import SearchHit, SearchIndex
+from transport import LiveTransport, Transport, create_transport
+from watch import DisclosureWatcher
+from typing import List, Optional, Sequence, Set
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    """Format a histogram bucket bound for the stats panel"""
+    if value is None:
+        return "-"
+    if value == float("inf"):
+        return ">30s"
+    if value < 1:
+        return f"{value * 1000:.0f}ms"
+    return f"{value:.1f}s"
 
 
 class HelpScreen(ModalScreen):
@@ -56,6 +90,10 @@ class HelpScreen(ModalScreen):
             "first_page": "Jump to first page",
             "last_page": "Jump to last page",
             "jump_to_page": "Jump to specific page",
+            "search": "Search crawled titles",
+            "archive": "Browse every crawled vulnerability",
+            "toggle_stats": "Toggle crawler stats panel",
+            "toggle_details": "Toggle vulnerability detail panel",
             "open_browser": "Open in browser",
             "refresh": "Refresh current page",
             "help": "Show this help",
@@ -73,6 +111,8 @@ class HelpScreen(ModalScreen):
             "[bold yellow]Features:[/bold yellow]",
             "  • Vim-style navigation (configurable)",
             "  • Page caching for faster browsing",
+            "  • Offline search over every title seen so far",
+            "  • Details of the selected row load in the side panel",
             "  • Customizable keybindings via config.json",
             "",
             "[dim]Press ESC or q to close this help[/dim]"
@@ -113,6 +153,66 @@ class JumpPageScreen(ModalScreen):
             self.query_one(Input).value = ""
 
 
+class SearchScreen(ModalScreen):
+    """Modal screen for searching titles in the local index"""
+
+    BINDINGS = [
+        ("escape", "dismiss", "Cancel"),
+    ]
+
+    MAX_RESULTS = 50
+
+    def __init__(self, index: SearchIndex):
+        super().__init__()
+        self.index = index
+        self.hits: List[SearchHit] = []
+
+    def compose(self) -> ComposeResult:
+        """Compose the search screen"""
+        yield Container(
+            Static(f"[bold]Search {len(self.index)} titles:[/bold]", id="search-label"),
+            Input(placeholder="Keywords (中文 / English)...", id="search-input"),
+            DataTable(id="search-results", cursor_type="row", zebra_stripes=True),
+            id="search-dialog"
+        )
+
+    def on_mount(self) -> None:
+        """Set up result columns and focus the input"""
+        self.query_one("#search-results", DataTable).add_columns("ZD ID", "Title")
+        self.query_one(Input).focus()
+
+    @on(Input.Changed)
+    def handle_change(self, event: Input.Changed) -> None:
+        """Re-run the search on every keystroke"""
+        started = time.perf_counter()
+        self.hits = self.index.search(event.value, limit=self.MAX_RESULTS)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        table = self.query_one("#search-results", DataTable)
+        table.clear()
+        for hit in self.hits:
+            table.add_row(hit.zd_id, Text(hit.title, overflow="ellipsis"))
+
+        label = self.query_one("#search-label", Static)
+        if event.value.strip():
+            label.update(f"[bold]{len(self.hits)} hits[/bold] [dim]({elapsed_ms:.1f} ms)[/dim]")
+        else:
+            label.update(f"[bold]Search {len(self.index)} titles:[/bold]")
+
+    @on(Input.Submitted)
+    def handle_submit(self, event: Input.Submitted) -> None:
+        """Move focus to the results so they can be browsed"""
+        if self.hits:
+            self.query_one("#search-results", DataTable).focus()
+
+    @on(DataTable.RowSelected)
+    def handle_select(self, event: DataTable.RowSelected) -> None:
+        """Return the chosen hit to the app"""
+        event.stop()
+        if 0 <= event.cursor_row < len(self.hits):
+            self.dismiss(self.hits[event.cursor_row])
+
+
 class VulnerabilityTable(DataTable):
     """Custom DataTable for displaying vulnerabilities"""
 
@@ -122,6 +222,272 @@ class VulnerabilityTable(DataTable):
         self.zebra_stripes = True
 
 
+class VirtualVulnerabilityTable(ScrollView, can_focus=True):
+    """
+    Table that renders only the rows currently in view
+
+    Rows are read on demand from any indexable sequence, such as a
+    VulnerabilityColumns store, and rendered strips are kept in a small
+    LRU sized to the viewport. Memory use and redraw time therefore do
+    not grow with the number of rows.
+    """
+
+    BINDINGS = [
+        Binding("down", "cursor_down", show=False),
+        Binding("up", "cursor_up", show=False),
+        Binding("pagedown", "page_down", show=False),
+        Binding("pageup", "page_up", show=False),
+        Binding("home", "first_row", show=False),
+        Binding("end", "last_row", show=False),
+        Binding("enter", "select_row", show=False),
+    ]
+
+    COMPONENT_CLASSES = {"virtual-table--cursor", "virtual-table--odd"}
+
+    DEFAULT_CSS = """
+    VirtualVulnerabilityTable {
+        height: 1fr;
+        overflow-x: hidden;
+    }
+
+    VirtualVulnerabilityTable > .virtual-table--cursor {
+        background: $primary;
+        color: $text;
+        text-style: bold;
+    }
+
+    VirtualVulnerabilityTable > .virtual-table--odd {
+        background: $boost;
+    }
+    """
+
+    cursor_row = reactive(0)
+
+    class RowHighlighted(Message):
+        """The cursor moved to another row"""
+
+        def __init__(self, table: "VirtualVulnerabilityTable", row: int) -> None:
+            super().__init__()
+            self.table = table
+            self.row = row
+
+    class RowSelected(Message):
+        """A row was chosen with Enter or a double click"""
+
+        def __init__(self, table: "VirtualVulnerabilityTable", row: int) -> None:
+            super().__init__()
+            self.table = table
+            self.row = row
+
+    def __init__(self, rows: Sequence[Vulnerability] = (), **kwargs):
+        super().__init__(**kwargs)
+        self._rows = rows
+        self._strips: "OrderedDict[tuple, Strip]" = OrderedDict()
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    def set_rows(self, rows: Sequence[Vulnerability]) -> None:
+        """Replace the backing store and move back to the top"""
+        self._rows = rows
+        self._strips.clear()
+        self.virtual_size = Size(self.scrollable_content_region.width, len(rows))
+        self.scroll_to(y=0, animate=False)
+        self.cursor_row = 0
+        self.refresh()
+
+    def selected(self) -> Optional[Vulnerability]:
+        """Return the record under the cursor, if any"""
+        if 0 <= self.cursor_row < len(self._rows):
+            return self._rows[self.cursor_row]
+        return None
+
+    def on_resize(self, event: events.Resize) -> None:
+        self._strips.clear()
+        self.virtual_size = Size(self.scrollable_content_region.width, len(self._rows))
+
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self._strips.clear()
+
+    def validate_cursor_row(self, row: int) -> int:
+        return max(0, min(row, len(self._rows) - 1))
+
+    def watch_cursor_row(self, old_row: int, new_row: int) -> None:
+        height = self.scrollable_content_region.height
+        top = round(self.scroll_y)
+        if new_row < top:
+            self.scroll_to(y=new_row, animate=False)
+        elif height and new_row >= top + height:
+            self.scroll_to(y=new_row - height + 1, animate=False)
+        self.refresh()
+        self.post_message(self.RowHighlighted(self, new_row))
+
+    def render_line(self, y: int) -> Strip:
+        """Render one visible line, reusing the strip if the row was drawn recently"""
+        width = self.scrollable_content_region.width
+        index = round(self.scroll_y) + y
+        if index >= len(self._rows):
+            return Strip.blank(width, self.rich_style)
+
+        key = (index, index == self.cursor_row, width)
+        strip = self._strips.get(key)
+        if strip is not None:
+            self._strips.move_to_end(key)
+            return strip
+
+        strip = self._render_row(index, width, key[1])
+        self._strips[key] = strip
+        while len(self._strips) > max(64, 2 * self.size.height):
+            self._strips.popitem(last=False)
+        return strip
+
+    def _render_row(self, index: int, width: int, is_cursor: bool) -> Strip:
+        vul = self._rows[index]
+        digits = len(str(len(self._rows)))
+        text = set_cell_size(f" {index + 1:>{digits}}  {vul.zd_id:<15} {vul.title}", width)
+
+        style = self.rich_style
+        if is_cursor:
+            style += self.get_component_rich_style("virtual-table--cursor")
+        elif index % 2:
+            style += self.get_component_rich_style("virtual-table--odd")
+        return Strip([Segment(text, style)], width)
+
+    def on_click(self, event: events.Click) -> None:
+        self.cursor_row = round(self.scroll_y) + event.y
+        if event.chain == 2:
+            self.action_select_row()
+
+    def action_cursor_down(self) -> None:
+        self.cursor_row += 1
+
+    def action_cursor_up(self) -> None:
+        self.cursor_row -= 1
+
+    def action_page_down(self) -> None:
+        self.cursor_row += max(1, self.scrollable_content_region.height)
+
+    def action_page_up(self) -> None:
+        self.cursor_row -= max(1, self.scrollable_content_region.height)
+
+    def action_first_row(self) -> None:
+        self.cursor_row = 0
+
+    def action_last_row(self) -> None:
+        self.cursor_row = len(self._rows) - 1
+
+    def action_select_row(self) -> None:
+        if self._rows:
+            self.post_message(self.RowSelected(self, self.cursor_row))
+
+
+class ArchiveScreen(Screen):
+    """Every vulnerability seen so far in one scrollable view"""
+
+    BINDINGS = [
+        ("escape", "dismiss", "Close"),
+    ]
+
+    DEFAULT_CSS = """
+    #archive-status {
+        dock: top;
+        height: 3;
+        background: $primary;
+        color: $text;
+        padding: 1;
+    }
+
+    #archive-table {
+        border: solid $primary;
+    }
+    """
+
+    def __init__(self, index: SearchIndex):
+        super().__init__()
+        self.index = index
+        self.last_g = 0.0
+
+    def compose(self) -> ComposeResult:
+        """Compose the archive screen"""
+        yield Header(show_clock=True)
+        yield Static("[bold yellow]Loading archive...[/bold yellow]", id="archive-status")
+        yield VirtualVulnerabilityTable(id="archive-table")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.query_one(VirtualVulnerabilityTable).focus()
+        self.load_archive()
+
+    @work(thread=True, exclusive=True, group="archive")
+    def load_archive(self) -> None:
+        """Build the column store off the UI thread"""
+        rows = VulnerabilityColumns(
+            Vulnerability(url=url, title=title) for _, url, title in self.index.documents()
+        )
+        self.app.call_from_thread(self.show_rows, rows)
+
+    def show_rows(self, rows: VulnerabilityColumns) -> None:
+        self.query_one(VirtualVulnerabilityTable).set_rows(rows)
+        self.update_status()
+
+    def update_status(self) -> None:
+        table = self.query_one(VirtualVulnerabilityTable)
+        if not table.row_count:
+            text = "[bold cyan]Archive:[/bold cyan] empty | [dim]Pages you browse or crawl are added here[/dim]"
+        else:
+            text = (
+                f"[bold cyan]Archive:[/bold cyan] {table.cursor_row + 1}/{table.row_count}"
+                " | [dim]b/Enter open, Esc back[/dim]"
+            )
+        self.query_one("#archive-status", Static).update(text)
+
+    def on_virtual_vulnerability_table_row_highlighted(
+        self, event: VirtualVulnerabilityTable.RowHighlighted
+    ) -> None:
+        self.update_status()
+
+    def on_virtual_vulnerability_table_row_selected(
+        self, event: VirtualVulnerabilityTable.RowSelected
+    ) -> None:
+        vul = event.table.selected()
+        if vul is not None:
+            self.app.open_in_browser(vul.full_url)
+
+    def on_key(self, event: events.Key) -> None:
+        """Vim-style movement, mirroring the main table"""
+        table = self.query_one(VirtualVulnerabilityTable)
+        key_map = {
+            "j": table.action_cursor_down,
+            "k": table.action_cursor_up,
+            "ctrl+f": table.action_page_down,
+            "ctrl+b": table.action_page_up,
+            "G": table.action_last_row,
+            "b": table.action_select_row,
+            "q": self.dismiss,
+        }
+
+        if event.key == "g":
+            now = time.time()
+            if now - self.last_g < 0.5:
+                table.action_first_row()
+                self.last_g = 0.0
+            else:
+                self.last_g = now
+        elif event.key in key_map:
+            key_map[event.key]()
+        elif event.is_printable:
+            # Keep page-level shortcuts (h, l, s, ...) from reaching the main view
+            event.stop()
+            return
+        else:
+            return
+
+        event.prevent_default()
+        event.stop()
+
+
 class HITCONVulsTUI(App):
     """Main TUI application for HITCON Vuls Crawler"""
 
@@ -143,6 +509,30 @@ class HITCONVulsTUI(App):
         padding: 1;
     }
 
+    #stats-panel {
+        dock: right;
+        width: 38;
+        display: none;
+        border: solid $secondary;
+        padding: 0 1;
+    }
+
+    #stats-panel.visible {
+        display: block;
+    }
+
+    #detail-panel {
+        dock: right;
+        width: 48;
+        display: none;
+        border: solid $accent;
+        padding: 0 1;
+    }
+
+    #detail-panel.visible {
+        display: block;
+    }
+
     #vuls-table {
         border: solid $primary;
     }
@@ -176,6 +566,22 @@ class HITCONVulsTUI(App):
         width: 100%;
     }
 
+    #search-dialog {
+        width: 100;
+        height: 30;
+        background: $surface;
+        border: thick $primary;
+        padding: 1;
+    }
+
+    #search-label {
+        margin-bottom: 1;
+    }
+
+    #search-results {
+        height: 1fr;
+    }
+
     .status-info {
         color: $accent;
     }
@@ -183,6 +589,8 @@ class HITCONVulsTUI(App):
 
     current_page = reactive(1)
     loading = reactive(False)
+    # Seconds the cursor must rest on a row before its details are requested
+    DETAIL_DELAY = 0.15
     vim_command_buffer = ""
     last_key_time = 0
 
@@ -195,16 +603,93 @@ class HITCONVulsTUI(App):
     def __init__(self):
         super().__init__()
         self.config = ConfigLoader()
-        self.crawler = HITCONVulsCrawler()
+        cache_settings = self.config.get_cache_settings()
+        self.search_index = self._create_search_index()
+        self.crawler = HITCONVulsCrawler(
+            search_index=self.search_index,
+            disk_cache=self._create_disk_cache(),
+            archive=self._create_archive(),
+            transport=self._create_transport(),
+            memory_cache=LRUPageCache(
+                budget_bytes=int(cache_settings.get("memory_budget_mb", 32) * 1024 * 1024),
+                store_html=cache_settings.get("memory_store_html", True)
+            )
+        )
         self.vulnerabilities: List[Vulnerability] = []
+        # Page the rows in the table belong to
+        self.rows_page: Optional[int] = None
+        self.page_error: Optional[str] = None
+        self.page_count: Optional[int] = None
         self.keybindings = self.config.get_keybindings()
+        self.display_settings = self.config.get_display_settings()
         self.gg_pressed = False
+        watch_settings = self.config.get_watch_settings()
+        self.watcher: Optional[DisclosureWatcher] = None
+        if watch_settings.get("enabled", True) and not self.crawler.use_demo_data:
+            self.watcher = DisclosureWatcher(
+                self.crawler,
+                max_pages=watch_settings.get("max_pages", DisclosureWatcher.DEFAULT_MAX_PAGES)
+            )
+        # New disclosures seen by the watcher, and how many are not on screen yet
+        self.new_ids: Set[str] = set()
+        self.new_unseen = 0
+
+    def _create_disk_cache(self) -> Optional[DiskPageCache]:
+        """Open the persistent page cache if it is enabled in the config"""
+        settings = self.config.get_cache_settings()
+        if not settings.get("enabled", False):
+            return None
+
+        try:
+            return DiskPageCache(
+                path=settings.get("path", DiskPageCache.DEFAULT_PATH),
+                ttl=settings.get("ttl_seconds", DiskPageCache.DEFAULT_TTL)
+            )
+        except Exception as e:
+            print(f"Warning: Could not open page cache: {e}")
+            return None
+
+    def _create_archive(self) -> Optional[PageArchive]:
+        """Open the raw-page archive if an archive path is configured"""
+        path = self.config.get_cache_settings().get("archive_path")
+        if not path:
+            return None
+
+        try:
+            return PageArchive(path=path)
+        except Exception as e:
+            print(f"Warning: Could not open page archive: {e}")
+            return None
+
+    def _create_transport(self) -> Transport:
+        """Build the page source from the config, falling back to the live site"""
+        settings = self.config.get_transport_settings()
+        try:
+            return create_transport(
+                settings.get("mode", "live"),
+                path=settings.get("replay_path"),
+                latency=settings.get("latency_seconds", 0.0),
+                jitter=settings.get("jitter", 0.0),
+                page_count=settings.get("pages") or None
+            )
+        except Exception as e:
+            print(f"Warning: Could not set up transport, using the live site: {e}")
+            return LiveTransport()
+
+    def _create_search_index(self) -> SearchIndex:
+        """Load the search index, persisted only if enabled in the config"""
+        settings = self.config.get_search_settings()
+        path = settings.get("path", SearchIndex.DEFAULT_PATH) if settings.get("enabled", True) else None
+        # Loaded by load_search_index() once the first page is on screen
+        return SearchIndex(path=path, load=False)
 
     def compose(self) -> ComposeResult:
         """Compose the application layout"""
         yield Header(show_clock=True)
         yield Container(
             Static("", id="status-bar"),
+            Static("", id="stats-panel"),
+            Static("", id="detail-panel"),
             VulnerabilityTable(id="vuls-table"),
             id="main-container"
         )
@@ -215,7 +700,90 @@ class HITCONVulsTUI(App):
         table = self.query_one(VulnerabilityTable)
         table.add_columns("ID", "Title", "URL")
         table.focus()
+        if self.display_settings.get("show_details", True):
+            self.query_one("#detail-panel", Static).add_class("visible")
         self.load_page(1)
+        self.load_search_index()
+
+        self.set_interval(1.0, self.refresh_stats_panel)
+        if self.watcher is not None:
+            self.set_interval(
+                self.config.get_watch_settings().get(
+                    "interval_seconds", DisclosureWatcher.DEFAULT_INTERVAL
+                ),
+                self.poll_new_disclosures
+            )
+        metrics_settings = self.config.get_metrics_settings()
+        if metrics_settings.get("prometheus_textfile"):
+            self.set_interval(
+                metrics_settings.get("write_interval_seconds", 15),
+                self.write_metrics_textfile
+            )
+
+    @work(thread=True, group="index")
+    def load_search_index(self) -> None:
+        """Read the saved search index without delaying the first paint"""
+        self.search_index.load()
+
+    def on_unmount(self) -> None:
+        """Persist the search index and the page archive on exit"""
+        self.search_index.save()
+        if self.config.get_metrics_settings().get("prometheus_textfile"):
+            self.write_metrics_textfile()
+        if self.crawler.archive is not None:
+            try:
+                self.crawler.archive.sync()
+            except OSError as e:
+                print(f"Warning: Could not sync page archive: {e}")
+            self.crawler.archive.close()
+
+    def refresh_stats_panel(self) -> None:
+        """Redraw the crawler stats panel if it is showing"""
+        panel = self.query_one("#stats-panel", Static)
+        if not panel.has_class("visible"):
+            return
+
+        stats = self.crawler.stats()
+        memory = stats["memory_cache"]
+        lines = [
+            "[bold cyan]Crawler stats[/bold cyan]",
+            "",
+            "[bold yellow]Latency p50 / p95:[/bold yellow]",
+        ]
+        for phase, latency in stats["latency"].items():
+            if latency["count"]:
+                lines.append(
+                    f"  {phase:9}{_format_seconds(latency['p50']):>8} /"
+                    f"{_format_seconds(latency['p95']):>8}"
+                )
+        lines.extend([
+            "",
+            "[bold yellow]Requests:[/bold yellow]",
+            *(f"  {outcome:14}{n:>6}" for outcome, n in sorted(stats["requests"].items())),
+            f"  {'retries':14}{stats['retries']:>6}",
+            f"  {'received':14}{stats['bytes_received'] / 1024:>5.0f}K",
+            f"  {'concurrency':14}{stats['concurrency_limit']:>6.1f}",
+            f"  {'backoffs':14}{stats['concurrency_decreases']:>6}",
+            f"  {'error rate':14}{stats['error_rate']:>6.0%}",
+            *([f"  {'paused':14}{_format_seconds(stats['paused_for']):>6}"] if stats['paused_for'] else []),
+            f"  {'sessions':14}{stats['sessions']:>6}",
+            f"  {'worst session':14}{stats['session_success_min']:>6.0%}",
+            "",
+            "[bold yellow]Cache:[/bold yellow]",
+            f"  memory hit/miss {memory['hits']}/{memory['misses']}",
+            f"  evictions {memory['evictions']}, {memory['size_bytes'] / 1024:.0f}K",
+            f"  rebases {memory['rebases']}",
+            *(f"  {name} {n}" for name, n in sorted(stats["cache"].items())),
+        ])
+        panel.update("\n".join(lines))
+
+    def write_metrics_textfile(self) -> None:
+        """Write crawler metrics for the node exporter textfile collector"""
+        path = self.config.get_metrics_settings().get("prometheus_textfile")
+        try:
+            write_prometheus_textfile(path, self.crawler.prometheus_text())
+        except Exception as e:
+            self.page_error = f"Metrics export failed: {e}"
 
     def on_key(self, event: events.Key) -> None:
         """Handle key press events for vim-style navigation"""
@@ -261,6 +829,10 @@ class HITCONVulsTUI(App):
 
             # Special
             "/": self.action_jump_to_page,
+            "s": self.action_search,
+            "i": self.action_toggle_stats,
+            "d": self.action_toggle_details,
+            "a": self.action_archive,
             "?": self.action_show_help,
             "G": self.action_last_page,  # Shift+g
         }
@@ -278,48 +850,260 @@ class HITCONVulsTUI(App):
         else:
             vul_count = len(self.vulnerabilities)
             status_text = (
-                f"[bold cyan]Page:[/bold cyan] {self.current_page} | "
-                f"[bold cyan]Vulnerabilities:[/bold cyan] {vul_count}"
+                f"[bold cyan]Page:[/bold cyan] {self.current_page}"
+                + (f"/{self.page_count}" if self.page_count else "")
+                + f" | [bold cyan]Vulnerabilities:[/bold cyan] {vul_count}"
             )
 
             # Show demo mode indicator
             if self.crawler.use_demo_data:
                 status_text += " | [bold yellow]演示模式[/bold yellow]"
+            elif self.crawler.transport.label:
+                status_text += f" | [bold yellow]{self.crawler.transport.label}[/bold yellow]"
+
+            if self.new_unseen:
+                status_text += f" | [bold green]● {self.new_unseen} new on page 1[/bold green]"
 
             # Show last error if any
-            if self.crawler.last_error:
-                status_text += f" | [dim red]{self.crawler.last_error}[/dim red]"
+            if self.page_error:
+                status_text += f" | [dim red]{self.page_error}[/dim red]"
             else:
                 status_text += " | [dim]Press ? for help[/dim]"
 
             status.update(status_text)
 
     def load_page(self, page_num: int) -> None:
-        """Load vulnerabilities for a specific page"""
+        """Load vulnerabilities for a specific page without blocking the UI"""
         if page_num < 1:
             return
 
         self.loading = True
         self.current_page = page_num
+
+        # Show cached rows right away; only go to a worker if they are
+        # missing or stale (the worker then refreshes them in place)
+        vulns, fresh = self.crawler.peek_vulnerabilities(page_num)
+        if vulns is not None:
+            self.append_rows(page_num, vulns, replace=True)
+            if fresh:
+                self.workers.cancel_group(self, "load")
+                self.apply_page(page_num, vulns, None)
+                return
+
         self.update_status_bar()
+        # Starting a new load cancels any older one still in flight
+        self.fetch_page_in_background(page_num)
 
-        # Fetch vulnerabilities
-        self.vulnerabilities = self.crawler.get_vulnerabilities(page_num)
+    @work(thread=True, exclusive=True, group="load")
+    def fetch_page_in_background(self, page_num: int) -> None:
+        """Fetch a page on a worker thread, streaming rows to the UI as they arrive"""
+        worker = get_current_worker()
+        result = PageResult(page_num=page_num, html=None)
+        batches = self.crawler.stream_vulnerabilities(page_num, result=result)
+
+        try:
+            first_batch = True
+            for batch in batches:
+                if worker.is_cancelled:
+                    return
+                self.call_from_thread(self.append_rows, page_num, batch, first_batch)
+                first_batch = False
+        finally:
+            batches.close()
+
+        if not worker.is_cancelled:
+            self.call_from_thread(
+                self.apply_page, page_num, result.vulnerabilities or [], result.error
+            )
+
+    def append_rows(self, page_num: int, rows: List[Vulnerability], replace: bool) -> None:
+        """Add a batch of streamed rows, replacing the previous page on the first one"""
+        if page_num != self.current_page:
+            return
 
-        # Update table
         table = self.query_one(VulnerabilityTable)
-        table.clear()
+        if replace:
+            table.clear()
+            self.vulnerabilities = []
+            self.rows_page = page_num
+
+        for idx, vul in enumerate(rows, len(self.vulnerabilities) + 1):
+            if vul.zd_id in self.new_ids:
+                title = Text.assemble(("NEW ", "bold green"), vul.title, overflow="ellipsis")
+            else:
+                title = Text(vul.title, overflow="ellipsis")
+            table.add_row(
+                str(idx),
+                title,
+                Text(vul.full_url, style="link " + vul.full_url)
+            )
+        self.vulnerabilities = self.vulnerabilities + rows
+
+    def apply_page(
+        self,
+        page_num: int,
+        vulnerabilities: List[Vulnerability],
+        error: Optional[str]
+    ) -> None:
+        """Finish showing a fetched page, unless the user has already moved past it"""
+        if page_num != self.current_page:
+            return
 
-        if self.vulnerabilities:
-            for idx, vul in enumerate(self.vulnerabilities, 1):
-                table.add_row(
-                    str(idx),
-                    Text(vul.title, overflow="ellipsis"),
-                    Text(vul.full_url, style="link " + vul.full_url)
-                )
+        # A failed refresh keeps the stale cached rows load_page already showed
+        if error and not vulnerabilities and self.rows_page == page_num and self.vulnerabilities:
+            vulnerabilities = self.vulnerabilities
+            error = f"{error} (showing cached copy)"
+
+        # Nothing was streamed (error or empty page), so drop the old rows here
+        if len(self.vulnerabilities) != len(vulnerabilities) or not vulnerabilities:
+            self.append_rows(page_num, vulnerabilities, replace=True)
 
+        self.vulnerabilities = vulnerabilities
+        self.page_error = error
         self.loading = False
+        if page_num == 1 and not error and self.watcher is not None:
+            # Whatever page 1 showed is the baseline for the watcher
+            self.watcher.seed(vulnerabilities)
+            self.new_unseen = 0
         self.update_status_bar()
+        self.prefetch_neighbours(page_num)
+
+    @work(thread=True, exclusive=True, group="watch")
+    def poll_new_disclosures(self) -> None:
+        """Check page 1 for new disclosures (one conditional request)"""
+        new_vulns, _ = self.watcher.poll()
+        if new_vulns:
+            self.call_from_thread(self.show_new_disclosures, new_vulns)
+
+    def show_new_disclosures(self, vulns: List[Vulnerability]) -> None:
+        """Badge newly disclosed vulnerabilities, refreshing page 1 if it is showing"""
+        self.new_ids.update(vul.zd_id for vul in vulns)
+        self.new_unseen += len(vulns)
+        if self.current_page == 1 and not self.loading:
+            # The poll already updated the cache, so this does not refetch
+            self.load_page(1)
+        else:
+            self.update_status_bar()
+
+    @work(thread=True, exclusive=True, group="prefetch")
+    def prefetch_neighbours(self, page_num: int) -> None:
+        """Warm the cache for pages around `page_num` in the background"""
+        depth = self.display_settings.get("prefetch_depth", 1)
+        concurrency = self.display_settings.get("prefetch_concurrency", 2)
+        if depth <= 0 or self.crawler.use_demo_data:
+            return
+
+        # Nearest pages first, forward before backward
+        pages = []
+        for offset in range(1, depth + 1):
+            for candidate in (page_num + offset, page_num - offset):
+                if candidate >= 1 and not self.crawler.is_page_cached(candidate):
+                    pages.append(candidate)
+
+        worker = get_current_worker()
+        results = self.crawler.get_vulnerabilities_many(pages, concurrency=concurrency)
+        try:
+            for _ in results:
+                if worker.is_cancelled:
+                    break
+        finally:
+            results.close()
+
+    def selected_vulnerability(self) -> Optional[Vulnerability]:
+        """Return the record under the table cursor, if any"""
+        row_idx = self.query_one(VulnerabilityTable).cursor_row
+        if row_idx is None or not 0 <= row_idx < len(self.vulnerabilities):
+            return None
+        return self.vulnerabilities[row_idx]
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        """Show details for the row under the cursor"""
+        if isinstance(event.data_table, VulnerabilityTable):
+            try:
+                self.show_detail()
+            except NoMatches:
+                # Highlight queued while the screen was being torn down
+                pass
+
+    def show_detail(self) -> None:
+        """Render the selected row's details, fetching them if not cached yet"""
+        panel = self.query_one("#detail-panel", Static)
+        vul = self.selected_vulnerability()
+        if not panel.has_class("visible") or vul is None:
+            return
+
+        detail = self.crawler.get_cached_detail(vul)
+        if detail is not None:
+            self.render_detail(vul, detail, None)
+        else:
+            panel.update(
+                f"[bold cyan]{escape(vul.zd_id)}[/bold cyan]\n\n{escape(vul.title)}\n\n"
+                "[bold yellow]Loading details...[/bold yellow]"
+            )
+
+        # Warm the rows around the cursor even when this one is cached
+        self.fetch_details_in_background(self.query_one(VulnerabilityTable).cursor_row)
+
+    @work(thread=True, exclusive=True, group="details")
+    def fetch_details_in_background(self, row_idx: int) -> None:
+        """Fetch details for the selected row first, then the rows around it"""
+        worker = get_current_worker()
+        # Holding j/k starts a worker per row; only the last one gets past this
+        time.sleep(self.DETAIL_DELAY)
+        if worker.is_cancelled:
+            return
+
+        depth = self.display_settings.get("detail_prefetch_rows", 2)
+        concurrency = self.display_settings.get("detail_concurrency", 3)
+        rows = self.vulnerabilities
+        wanted = [row_idx]
+        for offset in range(1, depth + 1):
+            wanted.extend((row_idx + offset, row_idx - offset))
+        vulns = [rows[i] for i in wanted if 0 <= i < len(rows)]
+
+        results = self.crawler.fetch_details(vulns, concurrency=concurrency)
+        try:
+            for vul, detail, error in results:
+                if worker.is_cancelled:
+                    break
+                self.call_from_thread(self.render_detail, vul, detail, error)
+        finally:
+            results.close()
+
+    def render_detail(
+        self,
+        vul: Vulnerability,
+        detail: Optional[VulnerabilityDetail],
+        error: Optional[str]
+    ) -> None:
+        """Fill the detail panel, unless the cursor has moved to another row"""
+        panel = self.query_one("#detail-panel", Static)
+        if not panel.has_class("visible") or self.selected_vulnerability() is not vul:
+            return
+
+        lines = [f"[bold cyan]{escape(vul.zd_id)}[/bold cyan]", ""]
+        if detail is None:
+            lines.extend([escape(vul.title), "", f"[red]{escape(error or 'No details')}[/red]"])
+            panel.update("\n".join(lines))
+            return
+
+        lines.extend([f"[bold]{escape(detail.title or vul.title)}[/bold]", ""])
+        for label, value in (
+            ("Vendor", detail.vendor),
+            ("Severity", detail.severity),
+            ("Status", detail.status),
+        ):
+            if value:
+                lines.append(f"[bold yellow]{label}:[/bold yellow] {escape(value)}")
+
+        if detail.timeline:
+            lines.extend(["", "[bold yellow]Timeline:[/bold yellow]"])
+            lines.extend(f"  {escape(when)}  {escape(event)}" for when, event in detail.timeline)
+
+        if detail.description:
+            lines.extend(["", "[bold yellow]Description:[/bold yellow]", escape(detail.description)])
+
+        panel.update("\n".join(lines))
 
     def action_move_down(self) -> None:
         """Move cursor down"""
@@ -345,10 +1129,29 @@ class HITCONVulsTUI(App):
         self.load_page(1)
 
     def action_last_page(self) -> None:
-        """Go to last page (estimate high page number)"""
-        # Since we don't know the exact last page, go to a high number
-        # User can navigate back if needed
-        self.load_page(100)
+        """Go to last page"""
+        self.loading = True
+        status = self.query_one("#status-bar", Static)
+        status.update("[bold yellow]Finding last page...[/bold yellow]")
+        self.find_last_page()
+
+    @work(thread=True, exclusive=True, group="load")
+    def find_last_page(self) -> None:
+        """Discover the page count off the UI thread, then load that page"""
+        page_count = self.crawler.get_page_count()
+
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self.apply_page_count, page_count)
+
+    def apply_page_count(self, page_count: Optional[int]) -> None:
+        """Jump to the discovered last page, or report that it is unknown"""
+        self.page_count = page_count
+        if page_count:
+            self.load_page(page_count)
+        else:
+            self.loading = False
+            self.page_error = "Could not determine last page"
+            self.update_status_bar()
 
     def action_jump_to_page(self) -> None:
         """Show jump to page dialog"""
@@ -358,11 +1161,33 @@ class HITCONVulsTUI(App):
 
         self.push_screen(JumpPageScreen(), handle_page_number)
 
+    def action_search(self) -> None:
+        """Show the title search dialog"""
+        def handle_hit(hit: Optional[SearchHit]) -> None:
+            if hit is not None:
+                self.open_in_browser(SITE_URL + hit.url)
+
+        self.push_screen(SearchScreen(self.search_index), handle_hit)
+
+    def action_archive(self) -> None:
+        """Show every vulnerability seen so far in one view"""
+        self.push_screen(ArchiveScreen(self.search_index))
+
+    def action_toggle_stats(self) -> None:
+        """Show or hide the crawler stats panel"""
+        self.query_one("#stats-panel", Static).toggle_class("visible")
+        self.refresh_stats_panel()
+
+    def action_toggle_details(self) -> None:
+        """Show or hide the vulnerability detail panel"""
+        self.query_one("#detail-panel", Static).toggle_class("visible")
+        self.show_detail()
+
     def action_refresh_page(self) -> None:
         """Refresh current page"""
-        # Clear cache for current page and reload
-        if self.current_page in self.crawler._cache:
-            del self.crawler._cache[self.current_page]
+        # Refetch the current page; if new disclosures moved the listing,
+        # the other cached pages are realigned from this one response
+        self.crawler.invalidate_page(self.current_page)
         self.load_page(self.current_page)
 
     def action_show_help(self) -> None:
@@ -386,18 +1211,21 @@ class HITCONVulsTUI(App):
 
         # Check if we have a vulnerability at this index
         if row_idx < len(self.vulnerabilities):
-            vul = self.vulnerabilities[row_idx]
-            try:
-                webbrowser.open(vul.full_url)
-                # Update status bar to show feedback
-                status = self.query_one("#status-bar", Static)
-                status.update(f"[bold green]Opening:[/bold green] {vul.full_url}")
-                # Restore normal status after a moment
-                self.set_timer(2.0, self.update_status_bar)
-            except Exception as e:
-                status = self.query_one("#status-bar", Static)
-                status.update(f"[bold red]Error opening browser:[/bold red] {str(e)}")
-                self.set_timer(3.0, self.update_status_bar)
+            self.open_in_browser(self.vulnerabilities[row_idx].full_url)
+
+    def open_in_browser(self, url: str) -> None:
+        """Open a URL in the browser, with feedback in the status bar"""
+        try:
+            webbrowser.open(url)
+            # Update status bar to show feedback
+            status = self.query_one("#status-bar", Static)
+            status.update(f"[bold green]Opening:[/bold green] {url}")
+            # Restore normal status after a moment
+            self.set_timer(2.0, self.update_status_bar)
+        except Exception as e:
+            status = self.query_one("#status-bar", Static)
+            status.update(f"[bold red]Error opening browser:[/bold red] {str(e)}")
+            self.set_timer(3.0, self.update_status_bar)
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         """Handle row selection - open URL in browser on enter"""
@@ -0,0 +1,52 @@
+"""
+TUI configuration for the benchmark suite
+Keeps every file the app reads or writes in a scratch directory and serves
+pages from the fixtures, so benchmark runs never touch the user's config,
+page cache or search index
+"""
+
+import json
+import os
+
+from config_loader import ConfigLoader
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def use_bench_config(directory: str, cache: bool = False, search: bool = False) -> str:
+    """
+    Write a benchmark user config to `directory` and make ConfigLoader read it
+
+    ConfigLoader's merged-config cache is kept in `directory` as well.
+    Prefetching, the detail panel, the disclosure watcher, the raw-page
+    archive and the metrics textfile are all off.
+
+    Args:
+        directory: Scratch directory for the config, page cache and search index
+        cache: Use the disk page cache at pages.db in `directory`
+        search: Persist the search index at search_index.json in `directory`
+
+    Returns:
+        Path of the config file
+    """
+    config = {
+        "display": {"prefetch_depth": 0, "show_details": False},
+        "cache": {
+            "enabled": cache,
+            "path": os.path.join(directory, "pages.db"),
+            "archive_path": "",
+        },
+        "search": {
+            "enabled": search,
+            "path": os.path.join(directory, "search_index.json"),
+        },
+        "metrics": {"prometheus_textfile": ""},
+        "watch": {"enabled": False},
+        "transport": {"mode": "replay", "replay_path": FIXTURES_DIR, "pages": 0},
+    }
+    path = os.path.join(directory, "config.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+    ConfigLoader.USER_CONFIG_PATH = path
+    ConfigLoader.CACHE_PATH = os.path.join(directory, "config.merged.json")
+    return path
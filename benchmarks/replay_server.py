@@ -0,0 +1,116 @@
+"""
+Local replay server for benchmarks
+Serves recorded zeroday.hitcon.org listing pages with configurable latency
+"""
+
+import http.server
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transport
+from transport import LISTING_PATH_PATTERN, fixture_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixtures(fixtures_dir: str = FIXTURES_DIR) -> List[bytes]:
+    """Load every recorded listing page (*.html) in name order"""
+    return transport.load_fixtures(fixtures_dir)
+
+
+class ReplayServer:
+    """
+    HTTP server that answers /vulnerability/disclosed/page/N from fixtures
+
+    Bodies are built like transport.ReplayTransport builds them from a
+    fixture directory (see transport.fixture_page), but served over real
+    sockets so connection handling is part of the measurement.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        page_count: int = 60,
+        fixtures: Optional[List[bytes]] = None
+    ):
+        """
+        Args:
+            latency: Seconds to wait before answering each request
+            page_count: Number of non-empty pages to serve
+            fixtures: Page bodies (loaded from FIXTURES_DIR if omitted)
+        """
+        self.latency = latency
+        self.page_count = page_count
+        self.fixtures = fixtures if fixtures is not None else load_fixtures()
+        self.requests = 0
+        self._bodies: Dict[int, bytes] = {}
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """Listing URL template to assign to HITCONVulsCrawler.BASE_URL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/vulnerability/disclosed/page/{{page}}"
+
+    def body_for(self, page_num: int) -> bytes:
+        """Return the body served for a page number"""
+        body = self._bodies.get(page_num)
+        if body is None:
+            body = fixture_page(self.fixtures, page_num, self.page_count)
+            self._bodies[page_num] = body
+        return body
+
+    def start(self) -> "ReplayServer":
+        """Start serving on an ephemeral localhost port in a background thread"""
+        replay = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment so Nagle/delayed-ACK
+            # does not add ~40 ms to every keep-alive response
+            wbufsize = 64 * 1024
+
+            def do_GET(self):
+                with replay._lock:
+                    replay.requests += 1
+                if replay.latency:
+                    time.sleep(replay.latency)
+
+                match = LISTING_PATH_PATTERN.search(self.path)
+                if match is None:
+                    self.send_error(404)
+                    return
+
+                body = replay.body_for(int(match.group(1)))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
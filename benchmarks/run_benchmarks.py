@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for HITCON Vuls Crawler
+Measures fetch, parse, export, re-parse and TUI page-load throughput and the
+memory held by a resumed crawl against a local replay server (or the
+in-process replay transport) and compares the results with a stored baseline
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --latency 0.05 --out results.json
+    python benchmarks/run_benchmarks.py --save-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from app_config import use_bench_config
+from crawl_journal import CrawlJournal
+from crawler import HITCONVulsCrawler, Vulnerability, export_vulnerabilities_to_file
+from exporter import VulnerabilityExporter
+from page_cache import DiskPageCache
+from reparse import ParallelReparser
+from replay_server import FIXTURES_DIR, ReplayServer, load_fixtures
+from search_index import SearchIndex
+from transport import ReplayTransport
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+STARTUP_PROBE = os.path.join(BENCH_DIR, "startup_probe.py")
+# Runs per timed benchmark; the median is reported
+REPEAT = 5
+# Metrics that do not depend on how fast the machine is
+MEMORY_UNITS = ("bytes/record",)
+
+Results = Dict[str, Dict[str, object]]
+
+
+def record(results: Results, name: str, value: float, unit: str,
+           higher_is_better: bool = True) -> None:
+    results[name] = {
+        "value": round(value, 3),
+        "unit": unit,
+        "higher_is_better": higher_is_better,
+    }
+    print(f"  {name:<32} {value:>12.1f} {unit}")
+
+
+def median_of(repeat: int, func: Callable[[], None]) -> float:
+    """
+    Run `func` several times and return the median wall time
+
+    The median moves far less between runs than the fastest time, which a
+    single lucky or unlucky scheduling slice can shift by a third.
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def make_records(count: int, first: int = 0) -> List[Vulnerability]:
+    """Build synthetic records shaped like real listing entries, IDs from `first` up"""
+    return [
+        Vulnerability(
+            url=f'/vulnerability/ZD-2024-{i:05d}',
+            title=f'某系統存在 SQL Injection 漏洞 #{i}',
+            date='2024-05-01',
+            vendor='Example Corp',
+            status='已公開'
+        )
+        for i in range(first, first + count)
+    ]
+
+
+def make_crawler(server: ReplayServer) -> HITCONVulsCrawler:
+    """Crawler pointed at the replay server, with caching and rate cap off"""
+    crawler = HITCONVulsCrawler(max_requests_per_second=0)
+    crawler.BASE_URL = server.base_url
+    return crawler
+
+
+def bench_fetch(results: Results, server: ReplayServer, pages: int) -> None:
+    crawler = make_crawler(server)
+    page_nums = range(1, pages + 1)
+
+    def sequential():
+        for page in page_nums:
+            if crawler.fetch_page(page, use_cache=False) is None:
+                raise RuntimeError(f"fetch_page({page}) failed: {crawler.last_error}")
+
+    elapsed = median_of(REPEAT, sequential)
+    record(results, "fetch_page_sequential", pages / elapsed, "pages/s")
+
+    def concurrent():
+        for result in crawler.fetch_pages(page_nums, concurrency=8, use_cache=False):
+            if result.error:
+                raise RuntimeError(f"fetch_pages page {result.page_num} failed: {result.error}")
+
+    elapsed = median_of(REPEAT, concurrent)
+    record(results, "fetch_pages_concurrency_8", pages / elapsed, "pages/s")
+    crawler.session_pool.close()
+
+
+def bench_fetch_transport(results: Results, latency: float, pages: int) -> None:
+    """
+    Fetch through the in-process replay transport: the crawler's full path, no sockets
+
+    Ten times as many pages are fetched as over sockets; 40 in-process pages
+    take a few milliseconds, short enough for one thread hand-off to skew.
+    """
+    pages *= 10
+    transport = ReplayTransport(FIXTURES_DIR, latency=latency, page_count=pages)
+    crawler = HITCONVulsCrawler(max_requests_per_second=0, transport=transport)
+    page_nums = range(1, pages + 1)
+
+    def concurrent():
+        for result in crawler.fetch_pages(page_nums, concurrency=8, use_cache=False):
+            if result.error:
+                raise RuntimeError(f"fetch_pages page {result.page_num} failed: {result.error}")
+
+    elapsed = median_of(REPEAT, concurrent)
+    record(results, "fetch_replay_transport_concurrency_8", pages / elapsed, "pages/s")
+    crawler.session_pool.close()
+
+
+def bench_parse(results: Results, fixtures: List[bytes]) -> None:
+    crawler = HITCONVulsCrawler(use_demo_data=True)
+    pages = [body.decode('utf-8') for body in fixtures]
+    rounds = max(1, 500 // len(pages))
+    size = sum(len(body) for body in fixtures) * rounds
+    count = sum(len(crawler.parse_vulnerabilities(html)) for html in pages) * rounds
+
+    def parse_all():
+        for _ in range(rounds):
+            for html in pages:
+                crawler.parse_vulnerabilities(html)
+
+    elapsed = median_of(REPEAT, parse_all)
+    record(results, "parse_throughput", size / elapsed / (1024 * 1024), "MB/s")
+    record(results, "parse_records", count / elapsed, "records/s")
+
+
+def bench_export(results: Results, count: int) -> None:
+    records = make_records(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        for format in ('text', 'jsonl', 'csv'):
+            path = os.path.join(tmp, f'vulns.{format}')
+
+            def export():
+                if not export_vulnerabilities_to_file(records, path, format=format):
+                    raise RuntimeError(f"export to {path} failed")
+
+            elapsed = median_of(REPEAT, export)
+            record(results, f"export_{format}", count / elapsed, "records/s")
+
+
+def allocated(func: Callable[[], object]) -> int:
+    """Bytes still allocated by `func`'s result when it returns"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = func()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def bench_journal_memory(results: Results, count: int, per_page: int = 20) -> None:
+    """Memory held by the pages a resumed crawl replays from its journal"""
+    records = make_records(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = CrawlJournal(os.path.join(tmp, "vulns.txt.journal"))
+        for start in range(0, count, per_page):
+            journal.record(start // per_page + 1, records[start:start + per_page])
+        journal.close()
+        del records
+
+        held = allocated(journal.load)
+        # The same pages as lists of Vulnerability objects, for comparison
+        as_lists = allocated(lambda: {page: list(vulns) for page, vulns in journal.load().items()})
+
+    record(results, "journal_resume_memory", held / count, "bytes/record",
+           higher_is_better=False)
+    print(f"  ({as_lists / count:.0f} bytes/record as lists of records)")
+
+
+def bench_reparse(results: Results, fixtures: List[bytes], pages: int) -> None:
+    """Re-parse a stored archive into JSONL with one worker and with one per core"""
+    replay = ReplayServer(page_count=pages, fixtures=fixtures)
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "pages.db")
+        cache = DiskPageCache(path=cache_path)
+        for page in range(1, pages + 1):
+            cache.put(HITCONVulsCrawler.BASE_URL.format(page=page), page,
+                      replay.body_for(page).decode('utf-8'))
+        refs = cache.listing_pages(HITCONVulsCrawler.BASE_URL)
+        cache.close()
+
+        rates = {}
+        for count in sorted({1, workers}):
+            def reparse_all():
+                reparser = ParallelReparser(cache_path, workers=count, format='jsonl',
+                                            keep_records=False)
+                with VulnerabilityExporter(os.path.join(tmp, "out.jsonl")) as exporter:
+                    for page in reparser.run(refs):
+                        for zd_id, line in page.lines:
+                            exporter.write_line(zd_id, line)
+
+            rates[count] = pages / median_of(REPEAT, reparse_all)
+
+    record(results, "reparse_1_worker", rates[1], "pages/s")
+    record(results, "reparse_all_workers", rates[workers], "pages/s")
+    print(f"  ({workers} workers, {rates[workers] / rates[1]:.1f}x one worker)")
+
+
+def make_app():
+    """TUI app set up by the benchmark config: no disk cache, index file or watcher, offline"""
+    from app import HITCONVulsTUI
+
+    return HITCONVulsTUI()
+
+
+async def _time_tui_loads(rows: int, loads: int) -> float:
+    """Average seconds from load_page() until a cached page is on screen"""
+    app = make_app()
+
+    # Distinct IDs per page; the cache lines pages up by vulnerability ID
+    for page in range(1, loads + 2):
+        app.crawler._cache.put(page, vulnerabilities=make_records(rows, first=page * rows))
+
+    async with app.run_test(size=(160, 50)) as pilot:
+        while app.loading:
+            await pilot.pause()
+
+        started = time.perf_counter()
+        for page in range(2, loads + 2):
+            app.load_page(page)
+            while app.loading:
+                await pilot.pause()
+        return (time.perf_counter() - started) / loads
+
+
+async def _time_archive_scroll(rows: int, steps: int) -> float:
+    """Average seconds to render a full screen of the archive view after a page down"""
+    from app import VirtualVulnerabilityTable
+
+    app = make_app()
+    app.crawler.use_demo_data = True
+    app.search_index.add_all(make_records(rows))
+
+    async with app.run_test(size=(160, 50)) as pilot:
+        app.action_archive()
+        await pilot.pause()
+        table = app.screen.query_one(VirtualVulnerabilityTable)
+        while table.row_count != rows:
+            await pilot.pause()
+
+        elapsed = 0.0
+        height = table.scrollable_content_region.height
+        for _ in range(steps):
+            table.action_page_down()
+            await pilot.pause()
+            table._strips.clear()
+            started = time.perf_counter()
+            for y in range(height):
+                table.render_line(y)
+            elapsed += time.perf_counter() - started
+        return elapsed / steps
+
+
+def bench_tui(results: Results, row_counts: List[int], loads: int = 20) -> None:
+    try:
+        import textual  # noqa: F401
+    except ImportError:
+        print("  (textual not installed, skipping TUI benchmarks)")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Anything the benchmark does not put in the cache comes from fixtures
+        use_bench_config(tmp)
+        for rows in row_counts:
+            elapsed = statistics.median(
+                asyncio.run(_time_tui_loads(rows, loads)) for _ in range(REPEAT)
+            )
+            record(results, f"tui_load_page_{rows}_rows", elapsed * 1000, "ms",
+                   higher_is_better=False)
+
+        for rows in (1_000, 100_000):
+            elapsed = statistics.median(
+                asyncio.run(_time_archive_scroll(rows, steps=20)) for _ in range(REPEAT)
+            )
+            record(results, f"tui_archive_screen_{rows}_rows", elapsed * 1000, "ms",
+                   higher_is_better=False)
+
+
+def bench_startup(results: Results, fixtures: List[bytes], index_size: int = 50_000,
+                  runs: int = REPEAT) -> Optional[float]:
+    """
+    Time from launching a fresh interpreter to page 1 on screen
+
+    Page 1 comes from the disk cache and the saved search index holds
+    `index_size` titles, as on a machine that has been used for a while.
+    Returns the median time in seconds, or None if the probe could not run.
+    """
+    try:
+        import textual  # noqa: F401
+    except ImportError:
+        print("  (textual not installed, skipping startup benchmark)")
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "pages.db")
+        cache = DiskPageCache(path=cache_path)
+        cache.put(HITCONVulsCrawler.BASE_URL.format(page=1), 1, fixtures[0].decode('utf-8'))
+        cache.close()
+
+        index_path = os.path.join(tmp, "search_index.json")
+        index = SearchIndex(path=index_path)
+        index.add_all(make_records(index_size))
+        index.save()
+
+        reports = []
+        for _ in range(runs):
+            launched_at = time.time()
+            output = subprocess.run(
+                [sys.executable, STARTUP_PROBE, repr(launched_at), tmp],
+                capture_output=True, text=True, timeout=120, check=True
+            ).stdout
+            reports.append(json.loads(output.strip().splitlines()[-1]))
+
+    first_paint = statistics.median(report["first_paint"] for report in reports)
+    record(results, "startup_first_paint", first_paint * 1000, "ms",
+           higher_is_better=False)
+    if any(report["network_stack_loaded"] for report in reports):
+        print("  Warning: the HTTP stack was imported before the first paint")
+    return first_paint
+
+
+def machine_speed(results: Results, baseline: Results) -> float:
+    """
+    How much faster this run was than the baseline overall
+
+    The median speed-up across every timed metric, so a busy or throttled
+    machine, which slows all of them alike, is told apart from a change that
+    slows one of them.
+    """
+    speedups = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or not base["value"] or current["unit"] in MEMORY_UNITS:
+            continue
+        ratio = current["value"] / base["value"]
+        speedups.append(ratio if current["higher_is_better"] else 1 / ratio)
+    return statistics.median(speedups) if speedups else 1.0
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """
+    Return a description of every metric that regressed past `tolerance`
+
+    Timed metrics are compared after scaling out the overall machine speed
+    from machine_speed(); memory metrics are compared as they are.
+    """
+    speed = machine_speed(results, baseline)
+    print(f"  {'machine speed':<32} {speed:>7.2f}x baseline")
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or not base["value"]:
+            continue
+        ratio = current["value"] / base["value"]
+        if current["unit"] not in MEMORY_UNITS:
+            ratio = ratio / speed if current["higher_is_better"] else ratio * speed
+        if current["higher_is_better"]:
+            regressed = ratio < 1 - tolerance
+        else:
+            regressed = ratio > 1 + tolerance
+        marker = "REGRESSION" if regressed else "ok"
+        print(f"  {name:<32} {ratio:>7.2f}x baseline  {marker}")
+        if regressed:
+            regressions.append(f"{name}: {current['value']} vs baseline {base['value']} {current['unit']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the crawler benchmark suite")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated server latency per request in seconds")
+    parser.add_argument("--pages", type=int, default=40,
+                        help="Pages to fetch in the fetch benchmarks")
+    parser.add_argument("--export-records", type=int, default=100_000,
+                        help="Records written in the export benchmarks")
+    parser.add_argument("--reparse-pages", type=int, default=2000,
+                        help="Stored pages re-parsed in the re-parse benchmark")
+    parser.add_argument("--rows", default="20,500",
+                        help="Comma-separated row counts for the TUI benchmark")
+    parser.add_argument("--out", help="Write results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Overwrite the baseline with this run's results")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown before a metric counts as a regression")
+    parser.add_argument("--startup-budget", type=float, default=1.0,
+                        help="Maximum seconds from launch to the first page on screen")
+    args = parser.parse_args(argv)
+
+    results: Results = {}
+    fixtures = load_fixtures()
+
+    print(f"Fetch ({args.pages} pages, {args.latency * 1000:.0f} ms latency)")
+    with ReplayServer(latency=args.latency, page_count=args.pages, fixtures=fixtures) as server:
+        bench_fetch(results, server, args.pages)
+    bench_fetch_transport(results, args.latency, args.pages)
+
+    print("Parse")
+    bench_parse(results, fixtures)
+
+    print(f"Export ({args.export_records} records)")
+    bench_export(results, args.export_records)
+
+    print(f"Resume ({args.export_records} journaled records)")
+    bench_journal_memory(results, args.export_records)
+
+    print(f"Re-parse ({args.reparse_pages} stored pages)")
+    bench_reparse(results, fixtures, args.reparse_pages)
+
+    print("TUI")
+    bench_tui(results, [int(n) for n in args.rows.split(',') if n])
+
+    print("Startup")
+    startup = bench_startup(results, fixtures)
+    over_budget = startup is not None and startup > args.startup_budget
+    if over_budget:
+        print(f"Startup took {startup:.2f} s, over the {args.startup_budget:.2f} s budget")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency": args.latency,
+        "results": results,
+    }
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"Baseline saved to {args.baseline}")
+        return 1 if over_budget else 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (run with --save-baseline)")
+        return 1 if over_budget else 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    if baseline.get("latency") != args.latency:
+        print(f"Warning: baseline was recorded with {baseline.get('latency')} s latency")
+
+    print(f"Compared with {args.baseline}")
+    regressions = compare(results, baseline.get("results", {}), args.tolerance)
+    if regressions:
+        print("Regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Startup probe for the benchmark suite
+Run in a fresh interpreter by run_benchmarks.py: starts HITCONVulsTUI with
+page 1 in the disk cache and reports the time from process launch until
+its rows are on screen
+
+SCRATCH_DIR holds the page cache (pages.db) and search index
+(search_index.json) the app is pointed at; see app_config.py
+
+Usage:
+    python benchmarks/startup_probe.py LAUNCH_TIME SCRATCH_DIR
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+async def probe(launched_at: float, scratch_dir: str) -> dict:
+    from app import HITCONVulsTUI, VulnerabilityTable
+    from app_config import use_bench_config
+
+    use_bench_config(scratch_dir, cache=True, search=True)
+    app = HITCONVulsTUI()
+    async with app.run_test(size=(160, 50)) as pilot:
+        table = app.query_one(VulnerabilityTable)
+        while not table.row_count:
+            await pilot.pause()
+        first_paint = time.time() - launched_at
+        network_loaded = 'cloudscraper' in sys.modules
+        app.search_index.path = None
+
+    return {
+        "first_paint": first_paint,
+        "rows": table.row_count,
+        "network_stack_loaded": network_loaded,
+    }
+
+
+if __name__ == "__main__":
+    report = asyncio.run(probe(float(sys.argv[1]), sys.argv[2]))
+    print(json.dumps(report))
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Headless command line for HITCON Vuls Crawler
+Batch crawls for cron jobs and pipelines, without the TUI
+
+Usage:
+    python -m crawler crawl --pages 1-800 --concurrency 8 --out vulns.jsonl
+    python cli.py crawl --pages all --out vulns.csv.gz
+    python -m crawler watch --interval 300 --webhook http://localhost:8080/hook
+    python -m crawler crawl --pages all --replay pages.hva --out vulns.jsonl
+
+An interrupted crawl keeps a journal next to the output (vulns.jsonl.journal);
+running the same command again skips the pages it already finished.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Callable, Iterator, List, Optional, TextIO, Tuple
+
+from crawl_journal import CrawlJournal, default_journal_path
+from crawler import HITCONVulsCrawler
+from exporter import VulnerabilityExporter, guess_format
+from page_archive import PageArchive
+from page_cache import DiskPageCache, LRUPageCache
+from rate_control import AdaptiveConcurrency
+from reparse import ParallelReparser
+from search_index import SearchIndex
+from session_pool import ScraperSessionPool
+from sync import KnownIdStore
+from transport import LATENCIES_SUFFIX, TRANSPORTS, LiveTransport, Transport, create_transport
+from watch import DisclosureWatcher, new_vulnerability_event, post_webhook
+
+# Exit statuses
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_PARTIAL = 2
+
+# Open-ended crawls with no known page count give up after this many failed pages in a row
+MAX_CONSECUTIVE_FAILURES = 5
+
+
+def parse_page_ranges(spec: str) -> Tuple[List[Tuple[int, Optional[int]]], bool]:
+    """
+    Parse a page selection such as "1-800", "5", "1-10,20-30", "100-" or "all"
+
+    Returns:
+        Tuple of ([(first, last or None for open-ended)], whether any range is open-ended)
+    """
+    ranges = []
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        if part == 'all':
+            first, last = 1, None
+        elif '-' in part:
+            start, end = part.split('-', 1)
+            first, last = int(start or 1), (int(end) if end else None)
+        else:
+            first = last = int(part)
+
+        if first < 1 or (last is not None and last < first):
+            raise ValueError(f"Invalid page range: {part}")
+        ranges.append((first, last))
+
+    if not ranges:
+        raise ValueError("No pages selected")
+    return ranges, any(last is None for _, last in ranges)
+
+
+def expand_pages(ranges: List[Tuple[int, Optional[int]]], page_count: Optional[int]) -> Iterator[int]:
+    """Yield page numbers in order, ending open ranges at `page_count` (if known)"""
+    seen = set()
+    for first, last in ranges:
+        end = last if last is not None else page_count
+        page = first
+        while end is None or page <= end:
+            if page not in seen:
+                seen.add(page)
+                yield page
+            page += 1
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class Progress:
+    """
+    Throughput and ETA reporting on stderr
+
+    On a terminal the status line is redrawn in place; otherwise (cron,
+    CI logs) a plain line is written every `log_interval` seconds.
+    """
+
+    def __init__(self, total: Optional[int], stream: TextIO = sys.stderr,
+                 log_interval: float = 10.0, resumed: int = 0,
+                 extra: Optional[Callable[[], str]] = None):
+        """
+        Args:
+            total: Pages selected, if known
+            stream: Where to report
+            log_interval: Seconds between lines when not on a terminal
+            resumed: Pages finished by an earlier run; counted as done but
+                left out of the throughput
+            extra: Returns more text for the end of the status line
+        """
+        self.total = total
+        self.stream = stream
+        self.interactive = stream.isatty()
+        self.interval = 0.2 if self.interactive else log_interval
+        self.started = time.monotonic()
+        self.resumed = resumed
+        self.extra = extra
+        self.pages = resumed
+        self.records = 0
+        self.errors = 0
+        self._last_report = 0.0
+
+    def update(self, records: int, error: bool) -> None:
+        self.pages += 1
+        self.records += records
+        self.errors += error
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self._report()
+
+    def _line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        rate = (self.pages - self.resumed) / elapsed
+        if self.total:
+            eta = (self.total - self.pages) / rate if rate else None
+            done = f"{self.pages}/{self.total} pages ({self.pages / self.total:.0%})"
+        else:
+            eta = None
+            done = f"{self.pages} pages"
+        if self.resumed:
+            done += f" ({self.resumed} resumed)"
+        line = (
+            f"{done}  {rate:.1f} pages/s  {self.records / elapsed:.0f} records/s  "
+            f"errors {self.errors}  elapsed {_format_duration(elapsed)}  ETA {_format_duration(eta)}"
+        )
+        if self.extra is not None:
+            line += "  " + self.extra()
+        return line
+
+    def _report(self) -> None:
+        if self.interactive:
+            self.stream.write(f"\r\033[K{self._line()}")
+        else:
+            self.stream.write(self._line() + "\n")
+        self.stream.flush()
+
+    def finish(self) -> None:
+        self._report()
+        if self.interactive:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def build_transport(args: argparse.Namespace) -> Transport:
+    """Create the transport selected by --transport and its options"""
+    mode = args.transport or ('replay' if args.replay else 'live')
+    if mode == 'live':
+        # Archived live crawls keep their timing, for replaying later
+        return LiveTransport(record_latencies=bool(getattr(args, 'archive', None)))
+    return create_transport(mode, path=args.replay, latency=args.latency,
+                            jitter=args.jitter, page_count=args.replay_pages)
+
+
+def build_crawler(args: argparse.Namespace, transport: Transport) -> HITCONVulsCrawler:
+    """Create a crawler sized for a batch run"""
+    concurrency = max(1, args.concurrency)
+    return HITCONVulsCrawler(
+        use_demo_data=args.demo,
+        max_requests_per_second=args.rate,
+        disk_cache=DiskPageCache(path=args.cache) if args.cache else None,
+        archive=PageArchive(path=args.archive) if args.archive else None,
+        # Pages are exported as they arrive; keep only parsed records, briefly
+        memory_cache=LRUPageCache(budget_bytes=8 * 1024 * 1024, store_html=False),
+        session_pool=ScraperSessionPool(max_sessions=concurrency,
+                                        scraper_factory=transport.create_session),
+        concurrency=AdaptiveConcurrency(initial=concurrency, maximum=concurrency),
+        transport=transport
+    )
+
+
+def close_crawler(crawler: HITCONVulsCrawler) -> None:
+    """Close the crawler's sessions, sync and close its archive, close its transport"""
+    crawler.session_pool.close()
+    if crawler.archive is not None:
+        if isinstance(crawler.transport, LiveTransport):
+            try:
+                crawler.transport.save_latencies(crawler.archive.path + LATENCIES_SUFFIX)
+            except OSError as e:
+                print(f"Warning: Could not save recorded latencies: {e}", file=sys.stderr)
+        try:
+            crawler.archive.sync()
+        except OSError as e:
+            print(f"Warning: Could not sync page archive: {e}", file=sys.stderr)
+        crawler.archive.close()
+    crawler.transport.close()
+
+
+def crawl(args: argparse.Namespace) -> int:
+    """Crawl the selected pages into the export file"""
+    try:
+        ranges, open_ended = parse_page_ranges(args.pages)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_FAILED
+
+    # Read the journal first, so nothing needs closing if it is unusable
+    journal = None
+    finished = {}
+    if not args.no_journal:
+        journal = CrawlJournal(args.journal or default_journal_path(args.out))
+        try:
+            finished = journal.load()
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read crawl journal: {e}", file=sys.stderr)
+            return EXIT_FAILED
+
+    try:
+        transport = build_transport(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        if journal is not None:
+            journal.close()
+        return EXIT_FAILED
+    crawler = build_crawler(args, transport)
+
+    page_count = None
+    if open_ended:
+        page_count = crawler.get_page_count()
+        if page_count is None:
+            print(f"Warning: Could not determine the page count ({crawler.last_error}); "
+                  f"crawling until an empty page or {MAX_CONSECUTIVE_FAILURES} failed pages in a row",
+                  file=sys.stderr)
+
+    known = page_count or not open_ended
+    pages = list(expand_pages(ranges, page_count)) if known else None
+    resumed = len(finished.keys() & set(pages)) if pages is not None else len(finished)
+    if resumed:
+        print(f"Resuming from {journal.path}: {resumed} pages already crawled", file=sys.stderr)
+
+    progress = Progress(total=len(pages) if pages is not None else None, resumed=resumed)
+    failed: List[Tuple[int, str]] = []
+    consecutive_failures = 0
+    mode = 'a' if args.append else 'w'
+
+    def selected() -> Iterator[int]:
+        return iter(pages) if pages is not None else expand_pages(ranges, None)
+
+    try:
+        with VulnerabilityExporter(args.out, mode=mode, format=args.format,
+                                   dedupe=args.dedupe) as exporter:
+            # Journaled pages are replayed into the output in page order,
+            # between the pages still being fetched
+            results = crawler.get_vulnerabilities_many(
+                (page for page in selected() if page not in finished),
+                concurrency=args.concurrency
+            )
+            try:
+                for page in selected():
+                    if page in finished:
+                        vulns, error = finished[page], None
+                    else:
+                        page_num, vulns, error = next(results)
+                        if error:
+                            failed.append((page_num, error))
+                        progress.update(len(vulns), bool(error))
+
+                    exporter.write_all(vulns)
+                    if journal is not None and page not in finished and not error:
+                        journal.record(page, vulns)
+                    # Without a known page count, the first empty page is the end;
+                    # a run of failures means there is no telling where that is
+                    if pages is None:
+                        consecutive_failures = consecutive_failures + 1 if error else 0
+                        if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                            print(f"\nError: {consecutive_failures} pages failed in a row; stopping",
+                                  file=sys.stderr)
+                            break
+                        if not vulns and not error:
+                            break
+            finally:
+                results.close()
+            written, skipped = exporter.written, exporter.skipped
+    except (OSError, ValueError) as e:
+        print(f"\nError: Could not write {args.out}: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except KeyboardInterrupt:
+        progress.finish()
+        if journal is not None:
+            print(f"Interrupted; run the same command again to resume from {journal.path}",
+                  file=sys.stderr)
+        else:
+            print("Interrupted", file=sys.stderr)
+        return EXIT_FAILED
+    finally:
+        close_crawler(crawler)
+        if journal is not None:
+            journal.close()
+
+    progress.finish()
+    for page_num, error in failed:
+        print(f"Page {page_num} failed: {error}", file=sys.stderr)
+    print(f"Wrote {written} vulnerabilities to {args.out}"
+          + (f" ({skipped} duplicates skipped)" if skipped else ""), file=sys.stderr)
+
+    if not failed:
+        # Nothing left to resume
+        if journal is not None:
+            journal.remove()
+        return EXIT_OK
+    if journal is not None:
+        print(f"Run the same command again to retry the failed pages ({journal.path})",
+              file=sys.stderr)
+    return EXIT_FAILED if len(failed) == progress.pages - progress.resumed else EXIT_PARTIAL
+
+
+def reparse(args: argparse.Namespace) -> int:
+    """Re-parse every stored listing page into the export file"""
+    source_path = os.path.expanduser(args.archive or args.cache)
+    if not os.path.exists(source_path):
+        print(f"Error: No page {'archive' if args.archive else 'cache'} at {source_path}",
+              file=sys.stderr)
+        return EXIT_FAILED
+
+    if args.archive:
+        with PageArchive(path=source_path, readonly=True) as archive:
+            pages = archive.listing_pages(HITCONVulsCrawler.BASE_URL)
+    else:
+        disk_cache = DiskPageCache(path=source_path)
+        pages = disk_cache.listing_pages(HITCONVulsCrawler.BASE_URL)
+        disk_cache.close()
+    if not pages:
+        print(f"Error: {source_path} holds no listing pages", file=sys.stderr)
+        return EXIT_FAILED
+
+    reparser = ParallelReparser(
+        source_path,
+        workers=args.workers,
+        chunk_pages=args.chunk_pages,
+        format=args.format or guess_format(args.out),
+        keep_records=args.update_index,
+        from_archive=bool(args.archive)
+    )
+    progress = Progress(
+        total=len(pages),
+        extra=lambda: "workers " + " ".join(
+            f"{s.pages}" for s in sorted(reparser.stats.values(), key=lambda s: s.pid)
+        )
+    )
+    index = SearchIndex() if args.update_index else None
+    print(f"Re-parsing {len(pages)} pages with {reparser.workers} workers", file=sys.stderr)
+
+    started = time.perf_counter()
+    try:
+        with VulnerabilityExporter(args.out, format=args.format, dedupe=args.dedupe) as exporter:
+            results = reparser.run(pages)
+            try:
+                for page in results:
+                    for zd_id, line in page.lines:
+                        exporter.write_line(zd_id, line)
+                    if index is not None:
+                        index.add_all(page.records)
+                    progress.update(len(page.lines), False)
+            finally:
+                results.close()
+            written, skipped = exporter.written, exporter.skipped
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"\nError: Re-parse failed: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except KeyboardInterrupt:
+        progress.finish()
+        print("Interrupted", file=sys.stderr)
+        return EXIT_FAILED
+    elapsed = time.perf_counter() - started
+    progress.finish()
+
+    if index is not None:
+        index.save()
+
+    busy = sum(s.busy_seconds for s in reparser.stats.values())
+    print(f"{'worker':>8} {'pages':>7} {'MB':>8} {'busy s':>8} {'MB/s':>7}", file=sys.stderr)
+    for stats in sorted(reparser.stats.values(), key=lambda s: s.pid):
+        print(f"{stats.pid:>8} {stats.pages:>7} {stats.bytes / (1024 * 1024):>8.1f} "
+              f"{stats.busy_seconds:>8.2f} {stats.mb_per_second:>7.1f}", file=sys.stderr)
+    print(f"Wall time {elapsed:.2f}s, parallel speedup {busy / elapsed if elapsed else 0:.1f}x",
+          file=sys.stderr)
+    print(f"Wrote {written} vulnerabilities to {args.out}"
+          + (f" ({skipped} duplicates skipped)" if skipped else ""), file=sys.stderr)
+    return EXIT_OK
+
+
+def watch(args: argparse.Namespace) -> int:
+    """Poll for new disclosures, emitting each one as a JSON line and/or to a webhook"""
+    try:
+        transport = build_transport(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    crawler = HITCONVulsCrawler(
+        use_demo_data=args.demo,
+        # Keeps page 1's validators so each poll is a conditional request
+        disk_cache=DiskPageCache(path=args.cache or ":memory:"),
+        session_pool=ScraperSessionPool(max_sessions=1, scraper_factory=transport.create_session),
+        transport=transport
+    )
+    watcher = DisclosureWatcher(
+        crawler,
+        known=KnownIdStore(args.known) if args.known else None,
+        max_pages=args.max_pages
+    )
+    # Webhook events not delivered yet, retried on the next poll
+    pending: List[dict] = []
+    status = EXIT_OK
+
+    try:
+        while True:
+            new_vulns, error = watcher.poll()
+            if error:
+                print(f"Warning: Poll failed: {error}", file=sys.stderr)
+            status = EXIT_FAILED if error else EXIT_OK
+
+            events = [new_vulnerability_event(vul) for vul in new_vulns]
+            if not args.no_stdout and events:
+                sys.stdout.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+                sys.stdout.flush()
+
+            if args.webhook:
+                pending.extend(events)
+                if pending:
+                    webhook_error = post_webhook(args.webhook, pending)
+                    if webhook_error:
+                        print(f"Warning: Webhook failed ({webhook_error}); "
+                              f"{len(pending)} events will be retried", file=sys.stderr)
+                        status = EXIT_FAILED
+                    else:
+                        pending = []
+
+            if args.once:
+                return status
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        close_crawler(crawler)
+
+
+def add_transport_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options choosing where pages come from"""
+    group = parser.add_argument_group("transport")
+    group.add_argument('--transport', choices=TRANSPORTS,
+                       help="Where pages come from (default: live, or replay with --replay)")
+    group.add_argument('--replay', metavar='PATH',
+                       help="Replay pages from a page archive or a directory of HTML fixtures")
+    group.add_argument('--latency', type=float, default=0.0, metavar='SECONDS',
+                       help="Offline response delay in seconds, where none was recorded (default: 0)")
+    group.add_argument('--jitter', type=float, default=0.0, metavar='FRACTION',
+                       help="Spread of --latency as a fraction, e.g. 0.5 for +/-50%% (default: 0)")
+    group.add_argument('--replay-pages', type=int, metavar='N',
+                       help="Listing pages to serve from fixtures or the synthetic generator")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m crawler",
+        description="Headless HITCON ZeroDay crawler"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    crawl_parser = commands.add_parser(
+        "crawl",
+        help="Crawl listing pages into an export file",
+        description="Crawl listing pages into an export file. Exit status is 0 on "
+                    "success, 1 on failure and 2 if only some pages failed."
+    )
+    crawl_parser.add_argument('--pages', default='1',
+                              help='Pages to crawl, e.g. "1-800", "1-10,20", "100-" or "all" (default: 1)')
+    crawl_parser.add_argument('--concurrency', type=int, default=HITCONVulsCrawler.DEFAULT_CONCURRENCY,
+                              help="Maximum requests in flight (default: %(default)s)")
+    crawl_parser.add_argument('--rate', type=float, default=HITCONVulsCrawler.MAX_REQUESTS_PER_SECOND,
+                              help="Maximum requests per second, 0 for no cap (default: %(default)s)")
+    crawl_parser.add_argument('--out', default='vulns.jsonl',
+                              help="Output file; format from the extension, .gz compresses (default: vulns.jsonl)")
+    crawl_parser.add_argument('--format', choices=('text', 'jsonl', 'csv', 'tsv'),
+                              help="Output format (overrides the extension)")
+    crawl_parser.add_argument('--append', action='store_true',
+                              help="Append to the output instead of overwriting it")
+    crawl_parser.add_argument('--dedupe', action='store_true',
+                              help="Skip records whose ZD ID was already written, "
+                                   "including IDs already in the output with --append")
+    crawl_parser.add_argument('--journal', metavar='PATH',
+                              help="Crawl journal used to resume an interrupted run (default: OUT.journal)")
+    crawl_parser.add_argument('--no-journal', action='store_true',
+                              help="Do not keep a crawl journal")
+    crawl_parser.add_argument('--cache', metavar='PATH',
+                              help="Use a persistent page cache at PATH")
+    crawl_parser.add_argument('--archive', metavar='PATH',
+                              help="Append every fetched page to a raw-page archive at PATH")
+    crawl_parser.add_argument('--demo', action='store_true',
+                              help="Use demo data instead of the website")
+    add_transport_arguments(crawl_parser)
+    crawl_parser.set_defaults(func=crawl)
+
+    reparse_parser = commands.add_parser(
+        "reparse",
+        help="Re-parse the stored listing pages into an export file",
+        description="Re-run the listing parser over every page in the page cache on a "
+                    "process pool, without going to the network."
+    )
+    reparse_parser.add_argument('--cache', default=DiskPageCache.DEFAULT_PATH, metavar='PATH',
+                                help="Page cache to read (default: %(default)s)")
+    reparse_parser.add_argument('--archive', metavar='PATH',
+                                help="Read the newest version of each page from a raw-page archive instead")
+    reparse_parser.add_argument('--out', default='vulns.jsonl',
+                                help="Output file; format from the extension, .gz compresses (default: vulns.jsonl)")
+    reparse_parser.add_argument('--format', choices=('text', 'jsonl', 'csv', 'tsv'),
+                                help="Output format (overrides the extension)")
+    reparse_parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                                help="Worker processes (default: %(default)s)")
+    reparse_parser.add_argument('--chunk-pages', type=int, default=ParallelReparser.DEFAULT_CHUNK_PAGES,
+                                help="Pages handed to a worker at a time (default: %(default)s)")
+    reparse_parser.add_argument('--dedupe', action='store_true',
+                                help="Skip records whose ZD ID was already written")
+    reparse_parser.add_argument('--update-index', action='store_true',
+                                help="Also re-index the titles in the local search index")
+    reparse_parser.set_defaults(func=reparse)
+
+    watch_parser = commands.add_parser(
+        "watch",
+        help="Poll for new disclosures and emit them as events",
+        description="Poll page 1 with conditional requests and emit every newly disclosed "
+                    "vulnerability as a JSON line on stdout and/or to a webhook."
+    )
+    watch_parser.add_argument('--interval', type=float, default=DisclosureWatcher.DEFAULT_INTERVAL,
+                              help="Seconds between polls (default: %(default)s)")
+    watch_parser.add_argument('--webhook', metavar='URL',
+                              help='POST new vulnerabilities to URL as {"events": [...]}')
+    watch_parser.add_argument('--no-stdout', action='store_true',
+                              help="Do not write events to stdout")
+    watch_parser.add_argument('--known', metavar='PATH',
+                              help="Persist seen IDs in PATH, so a restart reports what it missed")
+    watch_parser.add_argument('--max-pages', type=int, default=DisclosureWatcher.DEFAULT_MAX_PAGES,
+                              help="Pages to walk when page 1 is entirely new (default: %(default)s)")
+    watch_parser.add_argument('--cache', metavar='PATH',
+                              help="Keep page validators in a persistent page cache at PATH")
+    watch_parser.add_argument('--once', action='store_true',
+                              help="Poll once and exit (for cron)")
+    watch_parser.add_argument('--demo', action='store_true',
+                              help="Use demo data instead of the website")
+    add_transport_arguments(watch_parser)
+    watch_parser.set_defaults(func=watch)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
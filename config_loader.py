@@ -5,20 +5,82 @@ Handles loading and managing user-configurable keybindings and settings
 
 import json
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 class ConfigLoader:
     """Loads and manages configuration for the TUI application"""
 
     DEFAULT_CONFIG_PATH = "config.json"
     USER_CONFIG_PATH = os.path.expanduser("~/.hitcon-vuls-crawler-config.json")
+    # Merged config from the last start, with the versions of the files it came from
+    CACHE_PATH = os.path.expanduser("~/.cache/hitcon-vuls-crawler/config.merged.json")
 
     def __init__(self):
         self.config: Dict[str, Any] = {}
         self.load_config()
 
     def load_config(self) -> None:
-        """Load configuration from default and user config files"""
+        """Load configuration, reusing the cached merge while neither file has changed"""
+        sources = self._source_versions()
+        cached = self._read_cache(sources)
+        if cached is not None:
+            self.config = cached
+            return
+
+        if self._read_config_files():
+            self._write_cache(sources)
+
+    def _source_versions(self) -> List[List[Any]]:
+        """Path, mtime and size of both config files (None for a missing file)"""
+        versions = []
+        for path in (self.DEFAULT_CONFIG_PATH, self.USER_CONFIG_PATH):
+            path = os.path.abspath(path)
+            try:
+                st = os.stat(path)
+                versions.append([path, st.st_mtime_ns, st.st_size])
+            except OSError:
+                versions.append([path, None, None])
+        return versions
+
+    def _read_cache(self, sources: List[List[Any]]) -> Optional[Dict[str, Any]]:
+        """Return the cached merged config if it was built from `sources`"""
+        try:
+            with open(self.CACHE_PATH, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("sources") != sources:
+            return None
+        return cached.get("config")
+
+    def _write_cache(self, sources: List[List[Any]]) -> None:
+        """Store the merged config for the next start; failures only cost speed"""
+        tmp_path = f"{self.CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.CACHE_PATH), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"sources": sources, "config": self.config}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.CACHE_PATH)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def invalidate_cache(self) -> None:
+        """Forget the cached merge so the next load reads both files"""
+        try:
+            os.remove(self.CACHE_PATH)
+        except OSError:
+            pass
+
+    def _read_config_files(self) -> bool:
+        """
+        Load configuration from default and user config files
+
+        Returns:
+            False if the user config could not be read (so the result is not cached)
+        """
         # Load default config
         if os.path.exists(self.DEFAULT_CONFIG_PATH):
             with open(self.DEFAULT_CONFIG_PATH, 'r', encoding='utf-8') as f:
@@ -34,6 +96,8 @@ class ConfigLoader:
                     self._merge_config(user_config)
             except Exception as e:
                 print(f"Warning: Could not load user config: {e}")
+                return False
+        return True
 
     def _merge_config(self, user_config: Dict[str, Any]) -> None:
         """Merge user configuration with default configuration"""
@@ -55,6 +119,10 @@ class ConfigLoader:
                     "first_page": ["g,g"],
                     "last_page": ["G"],
                     "jump_to_page": ["/", "colon"],
+                    "search": ["s"],
+                    "archive": ["a"],
+                    "toggle_stats": ["i"],
+                    "toggle_details": ["d"],
                     "refresh": ["r"],
                     "help": ["question", "f1"],
                     "quit": ["q", "escape"],
@@ -71,7 +139,40 @@ class ConfigLoader:
             "display": {
                 "items_per_page": 20,
                 "show_page_numbers": True,
-                "show_help_bar": True
+                "show_help_bar": True,
+                "prefetch_depth": 1,
+                "prefetch_concurrency": 2,
+                "show_details": True,
+                "detail_prefetch_rows": 2,
+                "detail_concurrency": 3
+            },
+            "cache": {
+                "enabled": True,
+                "path": "~/.cache/hitcon-vuls-crawler/pages.db",
+                "ttl_seconds": 3600,
+                "memory_budget_mb": 32,
+                "memory_store_html": True,
+                "archive_path": ""
+            },
+            "search": {
+                "enabled": True,
+                "path": "~/.cache/hitcon-vuls-crawler/search_index.json"
+            },
+            "metrics": {
+                "prometheus_textfile": "",
+                "write_interval_seconds": 15
+            },
+            "watch": {
+                "enabled": True,
+                "interval_seconds": 300,
+                "max_pages": 5
+            },
+            "transport": {
+                "mode": "live",
+                "replay_path": "",
+                "latency_seconds": 0.0,
+                "jitter": 0.0,
+                "pages": 0
             }
         }
 
@@ -90,8 +191,29 @@ class ConfigLoader:
         """Get display settings"""
         return self.config.get("display", {})
 
+    def get_cache_settings(self) -> Dict[str, Any]:
+        """Get persistent cache settings"""
+        return self.config.get("cache", {})
+
+    def get_search_settings(self) -> Dict[str, Any]:
+        """Get search index settings"""
+        return self.config.get("search", {})
+
+    def get_metrics_settings(self) -> Dict[str, Any]:
+        """Get metrics export settings"""
+        return self.config.get("metrics", {})
+
+    def get_watch_settings(self) -> Dict[str, Any]:
+        """Get new-disclosure watch settings"""
+        return self.config.get("watch", {})
+
+    def get_transport_settings(self) -> Dict[str, Any]:
+        """Get page source settings (live site, replay or synthetic)"""
+        return self.config.get("transport", {})
+
     def save_user_config(self, config: Dict[str, Any]) -> None:
         """Save user configuration to user config file"""
+        self.invalidate_cache()
         try:
             with open(self.USER_CONFIG_PATH, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,173 @@
+"""
+Crash-safe crawl journal for HITCON Vuls Crawler
+Append-only log of completed pages so an interrupted crawl can resume
+"""
+
+import json
+import os
+import time
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple
+
+from crawler import Vulnerability, VulnerabilityColumns
+
+JOURNAL_HEADER = {"journal": "hitcon-vuls-crawler", "version": 1}
+
+
+class JournalPages(Mapping):
+    """
+    Records of the pages replayed from a journal, keyed by page number
+
+    Every record is held once in a VulnerabilityColumns store, so resuming
+    a long crawl does not keep a Vulnerability object per record alive
+    until it is written; a page's records are built when it is looked up.
+    """
+
+    def __init__(self):
+        self.records = VulnerabilityColumns()
+        self._ranges: Dict[int, Tuple[int, int]] = {}
+
+    def add(self, page_num: int, vulnerabilities: List[Vulnerability]) -> None:
+        """Store a page's records, replacing any earlier copy of the page"""
+        start = len(self.records)
+        self.records.extend(vulnerabilities)
+        self._ranges[page_num] = (start, len(self.records))
+
+    def __getitem__(self, page_num: int) -> List[Vulnerability]:
+        start, stop = self._ranges[page_num]
+        return self.records[start:stop]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ranges)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+
+class CrawlJournal:
+    """
+    Append-only JSON Lines log of completed pages and their records
+
+    Each line holds one finished page. Lines are flushed as they are
+    written and fsynced in batches, so a crash loses at most the last
+    unsynced batch. A torn final line is dropped on replay, and those pages
+    are crawled again.
+    """
+
+    def __init__(self, path: str, batch_pages: int = 20, batch_seconds: float = 5.0):
+        """
+        Args:
+            path: Journal file (created on first use)
+            batch_pages: fsync after this many pages...
+            batch_seconds: ...or when this long has passed since the last fsync
+        """
+        self.path = path
+        self.batch_pages = max(1, batch_pages)
+        self.batch_seconds = batch_seconds
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def load(self) -> JournalPages:
+        """
+        Replay the journal
+
+        Anything after the last complete, valid line is cut off so new
+        entries are appended to a clean file.
+
+        Returns:
+            Records of every completed page, keyed by page number
+        """
+        pages = JournalPages()
+        if not os.path.exists(self.path):
+            return pages
+
+        header = (json.dumps(JOURNAL_HEADER) + '\n').encode('utf-8')
+        with open(self.path, 'rb') as f:
+            first = f.readline()
+            # A header cut short can only come from a crash right after creation
+            if first != header and not header.startswith(first):
+                raise ValueError(f"{self.path} is not a crawl journal")
+
+            good_end = len(first) if first == header else 0
+            for line in f if first == header else ():
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                    pages.add(entry["page"], [Vulnerability(*fields) for fields in entry["records"]])
+                except (ValueError, KeyError, TypeError):
+                    break
+                good_end += len(line)
+
+        if good_end < os.path.getsize(self.path):
+            print(f"Warning: Dropping incomplete tail of crawl journal {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_end)
+        return pages
+
+    def _open(self) -> None:
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if new:
+            self._file.write(json.dumps(JOURNAL_HEADER) + '\n')
+            self.sync()
+
+    def record(self, page_num: int, vulnerabilities: List[Vulnerability]) -> None:
+        """Append a completed page; fsyncs once a batch is full"""
+        if self._file is None:
+            self._open()
+
+        entry = {
+            "page": page_num,
+            "records": [
+                [vul.url, vul.title, vul.date, vul.vendor, vul.status]
+                for vul in vulnerabilities
+            ],
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self._unsynced += 1
+
+        if (self._unsynced >= self.batch_pages
+                or time.monotonic() - self._last_sync >= self.batch_seconds):
+            self.sync()
+
+    def sync(self) -> None:
+        """Force journaled pages to disk"""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal file"""
+        if self._file is None:
+            return
+        try:
+            self.sync()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal once the crawl has fully succeeded"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'CrawlJournal':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def default_journal_path(output_path: str) -> str:
+    """Journal file used for an export when none is given"""
+    return output_path + '.journal'
+
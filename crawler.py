@@ -3,44 +3,559 @@ HITCON Vulnerability Database Crawler
 Handles fetching and parsing vulnerability data from zeroday.hitcon.org
 """
 
+import codecs
 import re
-import cloudscraper
-from typing import List, Tuple, Optional
-from dataclasses import dataclass
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional, Union
+from dataclasses import dataclass, field
+from html import unescape
+from urllib.parse import urlparse
+
+from metrics import CrawlerMetrics
+from page_archive import PageArchive
+from page_cache import CacheEntry, CacheStats, DiskPageCache, LRUPageCache
+from rate_control import (
+    RETRYABLE_STATUSES,
+    THROTTLE_STATUSES,
+    AdaptiveConcurrency,
+    RetryPolicy,
+    parse_retry_after,
+)
+from search_index import SearchIndex
+from session_pool import ScraperSessionPool, SessionStats, is_blocked_status, is_challenge_page
+from transport import LiveTransport, Transport
+
+SITE_URL = 'https://zeroday.hitcon.org'
+ZD_ID_PATTERN = re.compile(r'ZD-\d+-\d+')
 
 
-@dataclass
 class Vulnerability:
     """Represents a vulnerability entry"""
-    url: str
-    title: str
-    full_url: str
 
-    def __init__(self, url: str, title: str):
+    # Slotted to keep per-record overhead low when holding a whole archive
+    __slots__ = ('url', 'title', 'date', 'vendor', 'status')
+
+    def __init__(
+        self,
+        url: str,
+        title: str,
+        date: Optional[str] = None,
+        vendor: Optional[str] = None,
+        status: Optional[str] = None
+    ):
         self.url = url
         self.title = title
-        self.full_url = f'https://zeroday.hitcon.org{url}'
+        # Short, highly repetitive columns are interned so copies share storage
+        self.date = sys.intern(date) if date else date
+        self.vendor = sys.intern(vendor) if vendor else vendor
+        self.status = sys.intern(status) if status else status
+
+    @property
+    def full_url(self) -> str:
+        """Absolute URL of the vulnerability page"""
+        return f'{SITE_URL}{self.url}'
+
+    @property
+    def zd_id(self) -> str:
+        """The ZD identifier of this entry, e.g. ZD-2024-00001"""
+        match = ZD_ID_PATTERN.search(self.url)
+        if match:
+            return match.group(0)
+        return self.url.rstrip('/').rsplit('/', 1)[-1]
+
+    def _key(self) -> tuple:
+        return (self.url, self.title, self.date, self.vendor, self.status)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Vulnerability):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return f'Vulnerability(url={self.url!r}, title={self.title!r})'
+
+
+class VulnerabilityColumns:
+    """
+    Compact column-oriented store for large numbers of vulnerabilities
+
+    ZD IDs are kept as two integer arrays (year and serial) instead of URL
+    strings, and the date/vendor/status columns hold interned strings.
+    Rows are materialized as Vulnerability objects only when accessed.
+    """
+
+    URL_TEMPLATE = '/vulnerability/ZD-{year}-{serial:05d}'
+    URL_PATTERN = re.compile(r'^/vulnerability/ZD-(\d{4})-(\d{5})$')
+
+    def __init__(self, vulnerabilities: Iterable[Vulnerability] = ()):
+        self._years = array('H')
+        self._serials = array('I')
+        # URLs that don't follow the canonical pattern, keyed by row index
+        self._odd_urls: Dict[int, str] = {}
+        self._titles: List[str] = []
+        self._dates: List[Optional[str]] = []
+        self._vendors: List[Optional[str]] = []
+        self._statuses: List[Optional[str]] = []
+        self.extend(vulnerabilities)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def append(self, vul: Vulnerability) -> None:
+        """Add one record"""
+        match = self.URL_PATTERN.match(vul.url)
+        if match and int(match.group(2)) <= 0xFFFFFFFF:
+            self._years.append(int(match.group(1)))
+            self._serials.append(int(match.group(2)))
+        else:
+            self._odd_urls[len(self._titles)] = vul.url
+            self._years.append(0)
+            self._serials.append(0)
+
+        self._titles.append(vul.title)
+        self._dates.append(vul.date)
+        self._vendors.append(vul.vendor)
+        self._statuses.append(vul.status)
+
+    def extend(self, vulnerabilities: Iterable[Vulnerability]) -> None:
+        """Add several records"""
+        for vul in vulnerabilities:
+            self.append(vul)
+
+    def url_at(self, index: int) -> str:
+        """Relative URL of the record at `index` without building the record"""
+        if index < 0:
+            index += len(self)
+        odd = self._odd_urls.get(index)
+        if odd is not None:
+            return odd
+        return self.URL_TEMPLATE.format(year=self._years[index], serial=self._serials[index])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Vulnerability, List[Vulnerability]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('VulnerabilityColumns index out of range')
+        return Vulnerability(
+            url=self.url_at(index),
+            title=self._titles[index],
+            date=self._dates[index],
+            vendor=self._vendors[index],
+            status=self._statuses[index]
+        )
+
+    def __iter__(self) -> Iterator[Vulnerability]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+@dataclass
+class PageResult:
+    """Outcome of fetching a single page"""
+    page_num: int
+    html: Optional[str]
+    error: Optional[str] = None
+    vulnerabilities: Optional[List[Vulnerability]] = None
+
+
+class ListingStreamParser:
+    """
+    Incremental parser for disclosed-listing HTML
+
+    Text is fed in arbitrary chunks and records are returned as soon as
+    they are complete. A record is bounded by the element containing its
+    title link (the innermost open <li>, <tr> or <article>), from its
+    start tag to its end tag or the next record's start, so listing
+    columns (date, vendor, status) are found whether they come before
+    or after the title. Without such an element a record runs from its
+    title to the next one. A page is still scanned only once.
+    """
+
+    TITLE_PATTERN = re.compile(r'title tx-overflow-ellipsis"><a href="(.*?)">(.*?)</a>')
+    CONTAINER_TAGS = ('li', 'tr', 'article')
+    CONTAINER_PATTERN = re.compile(r'<(/?)(' + '|'.join(CONTAINER_TAGS) + r')[\s>]')
+    FIELDS = ('date', 'vendor', 'status')
+    # One pass over a record finds every column; the first of each name wins
+    FIELD_PATTERN = re.compile(
+        r'class="[^"]*\b(' + '|'.join(FIELDS) + r')\b[^"]*"[^>]*>\s*([^<]*?)\s*<'
+    )
+    # Longest stretch of markup kept around while waiting for the next record
+    MAX_SEGMENT = 16 * 1024
+
+    def __init__(self):
+        # Unparsed markup; when a record is pending it starts at that record
+        self._buffer = ''
+        # Title link (url, title), container tag and title markup length of
+        # the pending record
+        self._pending: Optional[Tuple[str, str, Optional[str], int]] = None
+        # Offset in the buffer just past the pending record's title
+        self._mark = 0
+        self._decoder = None
+
+    def feed(self, chunk: Union[str, bytes]) -> List[Vulnerability]:
+        """
+        Add the next piece of the document
+
+        Args:
+            chunk: Decoded text, or UTF-8 bytes straight from the response body
+
+        Returns:
+            Records completed by this chunk (possibly empty)
+        """
+        if isinstance(chunk, bytes):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            chunk = self._decoder.decode(chunk)
+
+        buffer = self._buffer + chunk
+        records = []
+        base = 0
+        pos = self._mark
+
+        while True:
+            match = self.TITLE_PATTERN.search(buffer, pos)
+            if match is None:
+                break
+            start, tag = self._container_start(buffer, pos, match.start())
+            if self._pending is not None:
+                end = self._container_end(buffer, self._pending[2], pos, start)
+                records.append(self._build(buffer, base, pos, end))
+            self._pending = (match.group(1), match.group(2), tag, match.end() - match.start())
+            base = start
+            pos = match.end()
+
+        buffer = buffer[base:]
+        pos -= base
+        if self._pending is None:
+            # Keep enough trailing markup for a container and title split across chunks
+            buffer = buffer[-self.MAX_SEGMENT:]
+            pos = 0
+        elif len(buffer) - pos > self.MAX_SEGMENT:
+            # Don't let a long run of non-record markup accumulate
+            records.append(self._build(buffer, 0, pos, pos + self.MAX_SEGMENT))
+            self._pending = None
+            buffer = buffer[-self.MAX_SEGMENT:]
+            pos = 0
+
+        self._buffer = buffer
+        self._mark = pos
+        return records
+
+    def close(self) -> List[Vulnerability]:
+        """Flush the final record once the whole document has been fed"""
+        if self._decoder is not None:
+            self._buffer += self._decoder.decode(b'', final=True)
+
+        records = self.feed('')
+        if self._pending is not None:
+            buffer = self._buffer
+            end = self._container_end(buffer, self._pending[2], self._mark, len(buffer))
+            records.append(self._build(buffer, 0, self._mark, end))
+            self._pending = None
+        self._buffer = ''
+        self._mark = 0
+        return records
+
+    def _container_start(self, buffer: str, pos: int, limit: int) -> Tuple[int, Optional[str]]:
+        """Start and tag of the innermost container still open at `limit` (a title)"""
+        start, tag = -1, None
+        for name in self.CONTAINER_TAGS:
+            found = buffer.rfind('<' + name, pos, limit)
+            if found > start:
+                start, tag = found, name
+        if start < 0:
+            return limit, None
+        # The usual case: the last container opened before the title is still open
+        if buffer[start + len(tag) + 1] in ' \t\r\n>' and buffer.find('</' + tag, start, limit) < 0:
+            return start, tag
+
+        stack: List[Tuple[int, str]] = []
+        for match in self.CONTAINER_PATTERN.finditer(buffer, pos, limit):
+            closing, name = match.groups()
+            if not closing:
+                stack.append((match.start(), name))
+                continue
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i][1] == name:
+                    del stack[i:]
+                    break
+        return stack[-1] if stack else (limit, None)
+
+    def _container_end(self, buffer: str, tag: Optional[str], pos: int, limit: int) -> int:
+        """End of the end tag closing a `tag` container opened before `pos`, or `limit`"""
+        if tag is None:
+            return limit
+        close = buffer.find('</' + tag, pos, limit)
+        if close < 0:
+            return limit
+        if buffer.find('<' + tag, pos, close) < 0:
+            # Nothing of the same kind nested inside
+            end = buffer.find('>', close, limit)
+            return end + 1 if end >= 0 else limit
+
+        depth = 1
+        for match in self.CONTAINER_PATTERN.finditer(buffer, pos, limit):
+            if match.group(2) != tag:
+                continue
+            depth += -1 if match.group(1) else 1
+            if depth == 0:
+                end = buffer.find('>', match.start(), limit)
+                return end + 1 if end >= 0 else limit
+        return limit
+
+    def _build(self, buffer: str, start: int, title_end: int, end: int) -> Vulnerability:
+        """Turn the pending title link and the rest of its record's markup into a record"""
+        url, title, _, title_size = self._pending
+        # The title element holds no columns and is the longest part to scan
+        title_start = buffer.rfind('<', start, title_end - title_size)
+        if title_start < 0:
+            title_start = title_end - title_size
+        markup = buffer[start:title_start] + buffer[title_end:end]
+        fields = {}
+        for name, value in self.FIELD_PATTERN.findall(markup):
+            if value and name not in fields:
+                fields[name] = value
+        return Vulnerability(url=url, title=title, **fields)
+
+
+@dataclass
+class VulnerabilityDetail:
+    """Triage fields from a vulnerability's own page"""
+    zd_id: str
+    url: str
+    title: Optional[str] = None
+    vendor: Optional[str] = None
+    severity: Optional[str] = None
+    status: Optional[str] = None
+    description: Optional[str] = None
+    timeline: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class DetailPageParser:
+    """
+    Extract a VulnerabilityDetail from a vulnerability page
+
+    The page is flattened to one line of text per block element, then
+    fields are found by their label (Chinese or English), either on the
+    same line ("廠商：Example") or on the line after it. Status history is
+    every line that starts with a date. Missing fields stay None.
+    """
+
+    DROP_PATTERN = re.compile(r'<(script|style|head)\b.*?</\1\s*>', re.S | re.I)
+    BLOCK_PATTERN = re.compile(
+        r'<(?:br|/?(?:p|div|li|tr|td|th|dt|dd|h\d|ul|ol|table|section|article))\b[^>]*>',
+        re.I
+    )
+    TAG_PATTERN = re.compile(r'<[^>]+>')
+    HEADING_PATTERN = re.compile(r'<h[1-3][^>]*>(.*?)</h[1-3]\s*>', re.S | re.I)
+    DATE_LINE_PATTERN = re.compile(
+        r'^(\d{4}[/-]\d{1,2}[/-]\d{1,2}(?:\s+\d{1,2}:\d{2}(?::\d{2})?)?)\s*[:：-]?\s*(.*)$'
+    )
+    LABELS = {
+        'vendor': ('廠商', 'vendor'),
+        'severity': ('風險', '嚴重程度', 'risk', 'severity'),
+        'status': ('處理狀態', '狀態', 'status'),
+        'description': ('漏洞說明', '說明', '描述', 'description'),
+    }
+    LABEL_PATTERN = re.compile(
+        r'^(' + '|'.join(
+            re.escape(label) for labels in LABELS.values() for label in labels
+        ) + r')(?:\s*[:：]\s*(.*)|\s*)$',
+        re.I
+    )
+
+    def _lines(self, html: str) -> List[str]:
+        """Flatten markup to non-empty text lines"""
+        html = self.DROP_PATTERN.sub('', html)
+        html = self.BLOCK_PATTERN.sub('\n', html)
+        text = unescape(self.TAG_PATTERN.sub('', html))
+        return [line for line in (' '.join(raw.split()) for raw in text.split('\n')) if line]
+
+    def _value_after(self, lines: List[str], i: int) -> str:
+        """Return the line after a bare label, unless it is another label"""
+        if i + 1 < len(lines) and not self.LABEL_PATTERN.match(lines[i + 1]):
+            return lines[i + 1]
+        return ''
+
+    def _field_for(self, label: str) -> str:
+        label = label.lower()
+        for name, labels in self.LABELS.items():
+            if label in (l.lower() for l in labels):
+                return name
+        raise KeyError(label)
+
+    def parse(self, html: str, vul: Vulnerability) -> VulnerabilityDetail:
+        """
+        Parse a detail page
+
+        Args:
+            html: HTML of the page at vul.full_url
+            vul: The listing record the page belongs to
+
+        Returns:
+            VulnerabilityDetail (title, vendor and status fall back to the
+            listing values when the page does not show them)
+        """
+        detail = VulnerabilityDetail(zd_id=vul.zd_id, url=vul.url)
+
+        heading = self.HEADING_PATTERN.search(html)
+        if heading:
+            detail.title = ' '.join(unescape(self.TAG_PATTERN.sub('', heading.group(1))).split()) or None
+
+        lines = self._lines(html)
+        current = None
+        for i, line in enumerate(lines):
+            label = self.LABEL_PATTERN.match(line)
+            if label and len(line) <= 200:
+                current = self._field_for(label.group(1))
+                value = label.group(2) or self._value_after(lines, i)
+                if current == 'description':
+                    detail.description = label.group(2) or None
+                elif getattr(detail, current) is None and value:
+                    setattr(detail, current, value)
+                    current = None
+                continue
+
+            date = self.DATE_LINE_PATTERN.match(line)
+            if date:
+                event = date.group(2) or self._value_after(lines, i)
+                detail.timeline.append((date.group(1), event))
+                current = None
+            elif current == 'description':
+                detail.description = f'{detail.description}\n{line}' if detail.description else line
+
+        detail.title = detail.title or vul.title
+        detail.vendor = detail.vendor or vul.vendor
+        detail.status = detail.status or vul.status
+        return detail
+
+
+@dataclass
+class _RequestOutcome:
+    """How a single request attempt ended, for the retry loop"""
+    retryable: bool = False
+    throttled: bool = False
+    retry_after: Optional[float] = None
+    aborted: bool = False
+    label: str = 'error'
+    nbytes: int = 0
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces requests to at most `rate` per second"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        """Block until the caller is allowed to issue the next request"""
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
 
 
 class HITCONVulsCrawler:
     """Crawler for HITCON vulnerability database"""
 
-    BASE_URL = 'https://zeroday.hitcon.org/vulnerability/disclosed/page/{page}'
-    TITLE_PATTERN = re.compile(r'title tx-overflow-ellipsis"><a href="(.*?)">(.*?)</a>')
+    BASE_URL = SITE_URL + '/vulnerability/disclosed/page/{page}'
+    TITLE_PATTERN = ListingStreamParser.TITLE_PATTERN
+    PAGINATION_PATTERN = re.compile(r'/vulnerability/disclosed/page/(\d+)')
+    PAGE_COUNT_TTL = 600.0
+    STREAM_CHUNK_SIZE = 16 * 1024
+    DEFAULT_CONCURRENCY = 4
+    MAX_CONCURRENCY = 16
+    MAX_REQUESTS_PER_SECOND = 4.0
+    DETAIL_CACHE_SIZE = 512
+    # Demo listing length; pages past it are empty, like past the end of the real one
+    DEMO_PAGE_COUNT = 50
 
-    def __init__(self, use_demo_data: bool = False):
-        """Initialize the crawler with cloudscraper
+    def __init__(self, use_demo_data: bool = False,
+                 max_requests_per_second: float = MAX_REQUESTS_PER_SECOND,
+                 disk_cache: Optional[DiskPageCache] = None,
+                 memory_cache: Optional[LRUPageCache] = None,
+                 session_pool: Optional[ScraperSessionPool] = None,
+                 search_index: Optional[SearchIndex] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 archive: Optional[PageArchive] = None,
+                 transport: Optional[Transport] = None):
+        """Initialize the crawler with cloudscraper, or an offline transport
 
         Args:
             use_demo_data: If True, use demo data instead of fetching from website
+            max_requests_per_second: Per-host request rate cap (0 disables it)
+            disk_cache: Optional persistent cache consulted after the memory cache
+            memory_cache: Bounded in-memory cache (a default-sized one if omitted)
+            session_pool: Pool of reusable scraper sessions
+            search_index: Optional index updated with every freshly parsed page
+            retry_policy: Retry/backoff settings for transient failures
+            concurrency: AIMD controller shared by every request this crawler makes
+            archive: Optional raw-page archive every fetched page is appended to
+            transport: Where responses come from (the live site if omitted);
+                used to create sessions when no session_pool is given
         """
-        self._cache = {}
+        self._cache = memory_cache if memory_cache is not None else LRUPageCache()
+        self.disk_cache = disk_cache
+        self.archive = archive
+        self.search_index = search_index
+        self.metrics = CrawlerMetrics()
+        self.transport = transport or LiveTransport()
+        self.session_pool = session_pool or ScraperSessionPool(
+            max_sessions=self.MAX_CONCURRENCY,
+            scraper_factory=self.transport.create_session
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.concurrency = concurrency or AdaptiveConcurrency(
+            initial=self.DEFAULT_CONCURRENCY,
+            maximum=self.MAX_CONCURRENCY
+        )
         self.use_demo_data = use_demo_data
         self.last_error = None
+        self.max_requests_per_second = max_requests_per_second
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._rate_limiters_lock = threading.Lock()
+        self._page_count: Optional[Tuple[int, float]] = None
+        # Positions the listing moved by at the last detected shift
+        self.last_shift = 0
+        self._detail_parser = DetailPageParser()
+        self._details: "OrderedDict[str, VulnerabilityDetail]" = OrderedDict()
+        self._details_lock = threading.Lock()
+
+    def _get_rate_limiter(self, url: str) -> RateLimiter:
+        """Return the shared rate limiter for the host of `url`"""
+        host = urlparse(url).netloc
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(host)
+            if limiter is None:
+                limiter = RateLimiter(self.max_requests_per_second)
+                self._rate_limiters[host] = limiter
+            return limiter
 
     def _generate_demo_data(self, page_num: int) -> List[Vulnerability]:
         """Generate demo data for testing when website is inaccessible"""
         demo_vulns = []
+        if page_num > self.DEMO_PAGE_COUNT:
+            return demo_vulns
         start_id = (page_num - 1) * 20 + 1
 
         for i in range(20):
@@ -62,33 +577,275 @@ class HITCONVulsCrawler:
         Returns:
             HTML content of the page or None if request failed
         """
-        if use_cache and page_num in self._cache:
-            return self._cache[page_num]
+        html, error = self._fetch_page(page_num, use_cache)
+        self.last_error = error
+        return html
+
+    def _fetch_page(self, page_num: int, use_cache: bool = True) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Fetch a page without touching shared error state
+
+        Safe to call from worker threads; the error is returned to the
+        caller instead of being stored on `last_error`.
+
+        Returns:
+            Tuple of (HTML content or None, error message or None)
+        """
+        result = PageResult(page_num=page_num, html=None)
+        for _ in self._stream_page(result, use_cache):
+            pass
+        return result.html, result.error
+
+    def _stream_page(self, result: PageResult, use_cache: bool = True,
+                     stream: bool = False) -> Iterator[str]:
+        """
+        Yield the text of a page as it is read, filling in `result`
+
+        Cached pages are yielded as a single chunk. With `stream=True` the
+        body is read incrementally instead of being buffered by requests.
+        When the generator is exhausted, `result.html` holds the complete
+        page, or `result.error` says why it could not be fetched.
+        """
+        page_num = result.page_num
+        if use_cache:
+            html = self._cache.get_html(page_num)
+            if html is not None:
+                result.html = html
+                yield html
+                return
 
         url = self.BASE_URL.format(page=page_num)
+        yield from self._stream_url(result, url, use_cache, stream)
+        if use_cache and result.html is not None:
+            self._cache.put(page_num, html=result.html)
 
-        # Create a new scraper for each request (like main.py)
-        # This prevents session reuse issues that cause 403 on subsequent requests
-        try:
-            scraper = cloudscraper.create_scraper(
-                delay=300,
-                browser={'custom': 'ScraperBot/1.0'}
-            )
-            response = scraper.get(url, timeout=15)
-
-            if response.status_code == 200:
-                html = response.text
-                if use_cache:
-                    self._cache[page_num] = html
-                self.last_error = None
-                return html
+    def _stream_url(self, result: PageResult, url: str, use_cache: bool = True,
+                    stream: bool = False, revalidate: bool = False) -> Iterator[str]:
+        """
+        Yield the text at `url` through the disk cache, retries and rate cap
+
+        Shared by listing and detail pages; `result.page_num` is stored
+        with disk cache entries (0 for pages that are not listing pages).
+        With `revalidate=True` even a fresh entry is checked with the server.
+        """
+        # Fall back to the disk cache; stale entries are revalidated below
+        entry = None
+        if use_cache and self.disk_cache is not None:
+            entry = self.disk_cache.get(url)
+            if entry is None:
+                self.metrics.count_cache('disk', 'miss')
+            elif entry.is_fresh() and not revalidate:
+                self.metrics.count_cache('disk', 'hit')
+                result.html = entry.body
+                yield entry.body
+                return
             else:
-                self.last_error = f"HTTP {response.status_code}"
-                return None
+                self.metrics.count_cache('disk', 'stale')
+
+        # Retry transient failures with backoff, as long as nothing has been
+        # handed to the consumer yet
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            self.concurrency.acquire()
+            self._get_rate_limiter(url).acquire()
+            self.metrics.observe('wait', time.perf_counter() - started)
+
+            outcome = _RequestOutcome()
+            try:
+                yield from self._request_page(result, url, entry, use_cache, stream, outcome)
+            finally:
+                # The pause holds up every worker; don't let one header stall the crawl
+                retry_after = outcome.retry_after
+                if retry_after is not None:
+                    retry_after = min(retry_after, self.retry_policy.max_retry_after)
+                self.concurrency.release(
+                    success=result.html is not None or outcome.aborted,
+                    throttled=outcome.throttled,
+                    retry_after=retry_after
+                )
+                self.metrics.count_request(
+                    'aborted' if outcome.aborted else outcome.label, outcome.nbytes
+                )
+
+            if not outcome.retryable or attempt >= self.retry_policy.max_retries:
+                return
+
+            self.metrics.count_retry()
+            time.sleep(self.retry_policy.delay(attempt, outcome.retry_after))
+            attempt += 1
+            result.error = None
+
+    def _request_page(self, result: PageResult, url: str, entry: Optional[CacheEntry],
+                      use_cache: bool, stream: bool, outcome: '_RequestOutcome') -> Iterator[str]:
+        """Make one request attempt for `_stream_url`, classifying any failure"""
+
+        # Sessions are reused, but any session that sees a 403 or challenge
+        # is retired so the next request starts from a clean one
+        started = time.perf_counter()
+        try:
+            session = self.session_pool.acquire()
+        except Exception as e:
+            result.error = f"Network error: {str(e)}"
+            outcome.retryable = True
+            return
+        self.metrics.observe('session', time.perf_counter() - started)
+
+        healthy = False
+        retire = False
+        response = None
+        parts: List[str] = []
+        try:
+            headers = entry.conditional_headers() if entry is not None else {}
+            started = time.perf_counter()
+            response = session.get(url, timeout=15, headers=headers, stream=stream)
+            headers_at = time.perf_counter()
+            self.metrics.observe('ttfb', headers_at - started)
 
+            if response.status_code == 304 and entry is not None:
+                healthy = True
+                outcome.label = 'not_modified'
+                self.metrics.count_cache('disk', 'revalidated')
+                self.disk_cache.touch(
+                    url,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+                result.html = entry.body
+                yield entry.body
+                return
+
+            if response.status_code != 200:
+                retire = is_blocked_status(response.status_code)
+                result.error = f"HTTP {response.status_code}"
+                outcome.label = f"http_{response.status_code}"
+                outcome.retryable = response.status_code in RETRYABLE_STATUSES
+                outcome.throttled = response.status_code in THROTTLE_STATUSES
+                outcome.retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                return
+
+            for text in self._iter_response_text(response, stream, outcome):
+                if not parts and is_challenge_page(text):
+                    retire = True
+                    result.error = "Blocked by challenge page"
+                    outcome.label = 'challenge'
+                    outcome.retryable = outcome.throttled = True
+                    return
+                parts.append(text)
+                yield text
+
+            # When streaming, this includes time the consumer spent between chunks
+            self.metrics.observe('download', time.perf_counter() - headers_at)
+            healthy = True
+            outcome.label = 'ok'
+            html = ''.join(parts)
+            if self.disk_cache is not None:
+                self.disk_cache.put(
+                    url,
+                    result.page_num,
+                    html,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+            if self.archive is not None:
+                # Only new bodies; a 304 adds nothing worth keeping
+                try:
+                    self.archive.append(url, result.page_num, html)
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Could not archive {url}: {e}")
+            result.html = html
+
+        except GeneratorExit:
+            # The consumer stopped early; that says nothing about session health
+            healthy = True
+            outcome.aborted = True
+            raise
         except Exception as e:
-            self.last_error = f"Network error: {str(e)}"
-            return None
+            retire = True
+            result.error = f"Network error: {str(e)}"
+            # Only safe to retry if the consumer has not seen any of the body
+            outcome.retryable = not parts
+        finally:
+            if response is not None:
+                response.close()
+            self.session_pool.release(session, success=healthy, retire=retire)
+
+    def _iter_response_text(self, response, stream: bool,
+                            outcome: _RequestOutcome) -> Iterator[str]:
+        """Yield decoded response text, chunk by chunk when streaming"""
+        if not stream:
+            outcome.nbytes += len(response.content)
+            yield response.text
+            return
+
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        for chunk in response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE):
+            outcome.nbytes += len(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
+
+    def fetch_pages(
+        self,
+        pages: Iterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        use_cache: bool = True
+    ) -> Iterator[PageResult]:
+        """
+        Fetch several pages concurrently with a bounded worker pool
+
+        Results are yielded in the order of `pages` as soon as each one
+        (and every page before it) has completed. Requests to the same
+        host share the crawler's rate cap.
+
+        Args:
+            pages: Page numbers to fetch, e.g. range(1, 101)
+            concurrency: Maximum number of worker threads; the adaptive
+                controller may allow fewer requests in flight
+            use_cache: Whether to use cached results
+
+        Returns:
+            Iterator of PageResult objects, each carrying its own error
+        """
+        for page_num, (html, error) in self._map_ordered(
+            lambda page_num: self._fetch_page(page_num, use_cache), pages, concurrency
+        ):
+            yield PageResult(page_num=page_num, html=html, error=error)
+
+    def _map_ordered(self, func, items: Iterable, concurrency: int) -> Iterator[Tuple[Any, Any]]:
+        """
+        Run `func` over `items` on a bounded thread pool
+
+        Yields (item, func(item)) in the order of `items`, each as soon as
+        it and every item before it has completed.
+        """
+        concurrency = max(1, concurrency)
+        item_iter = iter(items)
+        pool = ThreadPoolExecutor(max_workers=concurrency)
+        pending = deque()
+
+        def submit_next() -> bool:
+            for item in item_iter:
+                pending.append((item, pool.submit(func, item)))
+                return True
+            return False
+
+        try:
+            # Keep a small backlog queued so workers never sit idle
+            for _ in range(concurrency * 2):
+                if not submit_next():
+                    break
+
+            while pending:
+                item, future = pending.popleft()
+                value = future.result()
+                submit_next()
+                yield item, value
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
     def parse_vulnerabilities(self, html: str) -> List[Vulnerability]:
         """
@@ -100,15 +857,19 @@ class HITCONVulsCrawler:
         Returns:
             List of Vulnerability objects
         """
-        matches = self.TITLE_PATTERN.findall(html)
-        return [Vulnerability(url=url, title=title) for url, title in matches]
+        started = time.perf_counter()
+        parser = ListingStreamParser()
+        vulns = parser.feed(html) + parser.close()
+        self.metrics.observe('parse', time.perf_counter() - started)
+        return vulns
 
-    def get_vulnerabilities(self, page_num: int) -> List[Vulnerability]:
+    def get_vulnerabilities(self, page_num: int, use_cache: bool = True) -> List[Vulnerability]:
         """
         Get vulnerabilities for a specific page
 
         Args:
             page_num: The page number to fetch
+            use_cache: Whether to use cached results
 
         Returns:
             List of Vulnerability objects
@@ -117,55 +878,516 @@ class HITCONVulsCrawler:
         if self.use_demo_data:
             return self._generate_demo_data(page_num)
 
+        vulns, self.last_error = self.get_vulnerabilities_with_error(page_num, use_cache)
+        return vulns
+
+    def get_vulnerabilities_with_error(
+        self,
+        page_num: int,
+        use_cache: bool = True
+    ) -> Tuple[List[Vulnerability], Optional[str]]:
+        """
+        Get vulnerabilities for a page without touching shared error state
+
+        Safe to call from worker threads, like `_fetch_page`.
+
+        Returns:
+            Tuple of (vulnerabilities, error message or None)
+        """
+        if self.use_demo_data:
+            return self._generate_demo_data(page_num), None
+
+        # Parsed pages are served straight from memory without re-parsing
+        if use_cache:
+            vulns = self._cache.get_vulnerabilities(page_num)
+            if vulns is not None:
+                return vulns, None
+
         # Try to fetch real data
-        html = self.fetch_page(page_num)
+        html, error = self._fetch_page(page_num, use_cache=use_cache)
 
         # If fetch failed, return empty list (don't auto-switch to demo mode)
         if html is None:
-            return []
+            return [], error
 
         # Parse and return real data
         vulns = self.parse_vulnerabilities(html)
-        return vulns
+        self._store_parsed(page_num, vulns, use_cache)
+        return vulns, None
+
+    def _store_parsed(self, page_num: int, vulns: List[Vulnerability], use_cache: bool = True) -> None:
+        """Record a freshly parsed page in the memory cache and search index"""
+        if use_cache:
+            offset = self._cache.put(page_num, vulnerabilities=vulns)
+            if offset:
+                self._listing_shifted(page_num, offset)
+        if self.search_index is not None:
+            self.search_index.add_all(vulns)
+
+    def _listing_shifted(self, page_num: int, offset: int) -> None:
+        """
+        React to records having moved `offset` positions down the listing
+
+        The memory cache has already rebased its pages. Stored HTML of other
+        pages still has the old layout, so it is revalidated before use.
+        """
+        self.last_shift = offset
+        self._page_count = None
+        if self.disk_cache is not None:
+            self.disk_cache.expire_listing(keep_url=self.BASE_URL.format(page=page_num))
+
+    def poll_page(
+        self,
+        page_num: int = 1,
+        if_changed: bool = True
+    ) -> Tuple[Optional[List[Vulnerability]], Optional[str]]:
+        """
+        Check a page with the server, bypassing every cache
+
+        When the disk cache holds the page's validators the request is
+        conditional, so an unchanged page costs one small 304 response.
+
+        Args:
+            page_num: The page number to check
+            if_changed: Return None instead of records when the page is
+                identical to the stored copy
+
+        Returns:
+            Tuple of (records or None, error message or None)
+        """
+        if self.use_demo_data:
+            return (None if if_changed else self._generate_demo_data(page_num)), None
+
+        url = self.BASE_URL.format(page=page_num)
+        previous = self.disk_cache.get(url) if self.disk_cache is not None else None
+        result = PageResult(page_num=page_num, html=None)
+        for _ in self._stream_url(result, url, revalidate=True):
+            pass
+
+        if result.html is None:
+            return None, result.error
+        if if_changed and previous is not None and result.html == previous.body:
+            return None, None
+
+        self._cache.put(page_num, html=result.html)
+        vulns = self.parse_vulnerabilities(result.html)
+        self._store_parsed(page_num, vulns)
+        return vulns, None
+
+    def peek_vulnerabilities(self, page_num: int) -> Tuple[Optional[List[Vulnerability]], bool]:
+        """
+        Return a page's records from the memory or disk cache, without network I/O
+
+        Meant for showing something immediately while a real fetch runs.
+        Stale disk entries are returned too, but are not promoted to the
+        memory cache so the next fetch still revalidates them.
+
+        Returns:
+            Tuple of (records or None, whether they are fresh)
+        """
+        if self.use_demo_data:
+            return self._generate_demo_data(page_num), True
+
+        vulns = self._cache.get_vulnerabilities(page_num)
+        if vulns is not None:
+            return vulns, True
+
+        if self.disk_cache is None:
+            return None, False
+        entry = self.disk_cache.get(self.BASE_URL.format(page=page_num))
+        if entry is None:
+            return None, False
+
+        vulns = self.parse_vulnerabilities(entry.body)
+        if not entry.is_fresh():
+            return vulns, False
+        self._cache.put(page_num, html=entry.body)
+        self._store_parsed(page_num, vulns)
+        return vulns, True
+
+    def stream_vulnerabilities(
+        self,
+        page_num: int,
+        use_cache: bool = True,
+        result: Optional[PageResult] = None
+    ) -> Iterator[List[Vulnerability]]:
+        """
+        Yield batches of a page's vulnerabilities as the response arrives
+
+        Lets a caller show the first rows before the download finishes.
+        Cached pages arrive as a single batch.
+
+        Args:
+            page_num: The page number to fetch
+            use_cache: Whether to use cached results
+            result: Optional PageResult that receives the full record list
+                and any error once the generator is exhausted
+
+        Returns:
+            Iterator of non-empty lists of Vulnerability objects
+        """
+        if result is None:
+            result = PageResult(page_num=page_num, html=None)
+
+        if self.use_demo_data:
+            result.vulnerabilities = self._generate_demo_data(page_num)
+            yield result.vulnerabilities
+            return
+
+        if use_cache:
+            vulns = self._cache.get_vulnerabilities(page_num)
+            if vulns is not None:
+                result.vulnerabilities = vulns
+                yield vulns
+                return
+
+        parser = ListingStreamParser()
+        vulns = []
+        parse_time = 0.0
+        for text in self._stream_page(result, use_cache, stream=True):
+            started = time.perf_counter()
+            batch = parser.feed(text)
+            parse_time += time.perf_counter() - started
+            if batch:
+                vulns.extend(batch)
+                yield batch
+
+        if result.html is None:
+            result.vulnerabilities = vulns
+            return
+
+        started = time.perf_counter()
+        batch = parser.close()
+        self.metrics.observe('parse', parse_time + time.perf_counter() - started)
+        if batch:
+            vulns.extend(batch)
+            yield batch
+
+        result.vulnerabilities = vulns
+        self._store_parsed(page_num, vulns, use_cache)
+
+    def get_vulnerabilities_many(
+        self,
+        pages: Iterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY
+    ) -> Iterator[Tuple[int, List[Vulnerability], Optional[str]]]:
+        """
+        Get vulnerabilities for several pages concurrently
+
+        Args:
+            pages: Page numbers to fetch
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            Iterator of (page number, vulnerabilities, error) tuples in page order
+        """
+        if self.use_demo_data:
+            for page_num in pages:
+                yield page_num, self._generate_demo_data(page_num), None
+            return
+
+        for result in self.fetch_pages(pages, concurrency=concurrency):
+            if result.html is None:
+                yield result.page_num, [], result.error
+                continue
+
+            vulns = self._cache.get_vulnerabilities(result.page_num)
+            if vulns is None:
+                vulns = self.parse_vulnerabilities(result.html)
+                self._store_parsed(result.page_num, vulns)
+            yield result.page_num, vulns, None
+
+    def get_cached_detail(self, vul: Vulnerability) -> Optional[VulnerabilityDetail]:
+        """Return an already-fetched detail without any I/O, or None"""
+        with self._details_lock:
+            detail = self._details.get(vul.zd_id)
+            if detail is not None:
+                self._details.move_to_end(vul.zd_id)
+            return detail
+
+    def _remember_detail(self, detail: VulnerabilityDetail) -> None:
+        with self._details_lock:
+            self._details[detail.zd_id] = detail
+            self._details.move_to_end(detail.zd_id)
+            while len(self._details) > self.DETAIL_CACHE_SIZE:
+                self._details.popitem(last=False)
+
+    def _generate_demo_detail(self, vul: Vulnerability) -> VulnerabilityDetail:
+        """Generate a detail record for demo mode"""
+        return VulnerabilityDetail(
+            zd_id=vul.zd_id,
+            url=vul.url,
+            title=vul.title,
+            vendor="示例廠商",
+            severity="中",
+            status="已公開",
+            description="這是測試數據 (網站無法訪問時的演示)",
+            timeline=[("2024/01/01", "通報"), ("2024/02/01", "公開")]
+        )
+
+    def fetch_detail(
+        self,
+        vul: Vulnerability,
+        use_cache: bool = True
+    ) -> Tuple[Optional[VulnerabilityDetail], Optional[str]]:
+        """
+        Fetch and parse the detail page of one vulnerability
+
+        Uses the same disk cache, retries and rate cap as listing pages, so
+        it is safe to call from worker threads.
+
+        Args:
+            vul: Listing record whose full_url is fetched
+            use_cache: Whether to use cached results
+
+        Returns:
+            Tuple of (VulnerabilityDetail or None, error message or None)
+        """
+        if use_cache:
+            detail = self.get_cached_detail(vul)
+            if detail is not None:
+                return detail, None
+
+        if self.use_demo_data:
+            detail = self._generate_demo_detail(vul)
+        else:
+            result = PageResult(page_num=0, html=None)
+            for _ in self._stream_url(result, vul.full_url, use_cache):
+                pass
+            if result.html is None:
+                return None, result.error
+
+            started = time.perf_counter()
+            detail = self._detail_parser.parse(result.html, vul)
+            self.metrics.observe('parse', time.perf_counter() - started)
+
+        self._remember_detail(detail)
+        return detail, None
+
+    def fetch_details(
+        self,
+        vulnerabilities: Iterable[Vulnerability],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        use_cache: bool = True
+    ) -> Iterator[Tuple[Vulnerability, Optional[VulnerabilityDetail], Optional[str]]]:
+        """
+        Fetch several detail pages concurrently
+
+        Args:
+            vulnerabilities: Records to fetch details for
+            concurrency: Maximum number of worker threads
+            use_cache: Whether to use cached results
+
+        Returns:
+            Iterator of (vulnerability, detail, error) tuples in input order
+        """
+        for vul, (detail, error) in self._map_ordered(
+            lambda vul: self.fetch_detail(vul, use_cache), vulnerabilities, concurrency
+        ):
+            yield vul, detail, error
 
     def clear_cache(self) -> None:
-        """Clear the page cache"""
+        """Clear the page and detail caches"""
         self._cache.clear()
+        with self._details_lock:
+            self._details.clear()
+
+    def is_page_cached(self, page_num: int) -> bool:
+        """Return True if a page is held in the in-memory cache"""
+        return page_num in self._cache
+
+    def invalidate_page(self, page_num: int) -> None:
+        """
+        Make the next request for a page go to the network
+
+        The memory cache keeps the page's records so the refetched copy can
+        reveal whether the listing has shifted since.
+        """
+        self._cache.pop(page_num)
+        if self.disk_cache is not None:
+            self.disk_cache.delete(self.BASE_URL.format(page=page_num))
+
+    def cache_stats(self) -> CacheStats:
+        """Return hit/miss/eviction counters for the in-memory cache"""
+        return self._cache.stats()
 
-    def get_page_count(self) -> Optional[int]:
+    def stats(self) -> Dict[str, Any]:
         """
-        Attempt to determine the total number of pages
-        (This is a placeholder - actual implementation would need to parse the pagination)
+        Return a snapshot of request timings, traffic and cache behaviour
+
+        Latency is broken down by phase (wait, session, ttfb, download,
+        parse) so slowness can be attributed to throttling, the challenge
+        solver, the network or parsing.
+        """
+        snapshot = self.metrics.snapshot()
+        memory = self._cache.stats()
+        snapshot['memory_cache'] = {
+            'hits': memory.hits,
+            'misses': memory.misses,
+            'evictions': memory.evictions,
+            'rebases': memory.rebases,
+            'entries': memory.entries,
+            'size_bytes': memory.size_bytes,
+            'budget_bytes': memory.budget_bytes,
+        }
+        concurrency = self.concurrency.stats()
+        snapshot['concurrency_limit'] = concurrency.limit
+        snapshot['in_flight'] = concurrency.in_flight
+        snapshot['error_rate'] = concurrency.error_rate
+        snapshot['concurrency_decreases'] = concurrency.decreases
+        snapshot['paused_for'] = concurrency.paused_for
+        sessions = self._active_sessions()
+        snapshot['sessions'] = len(sessions)
+        snapshot['session_success_min'] = min((s.success_rate for s in sessions), default=1.0)
+        return snapshot
+
+    def prometheus_text(self) -> str:
+        """Render stats() in the Prometheus text format"""
+        memory = self._cache.stats()
+        concurrency = self.concurrency.stats()
+        sessions = self._active_sessions()
+        return self.metrics.to_prometheus(gauges={
+            'memory_cache_hits': memory.hits,
+            'memory_cache_misses': memory.misses,
+            'memory_cache_evictions': memory.evictions,
+            'memory_cache_rebases': memory.rebases,
+            'memory_cache_entries': memory.entries,
+            'memory_cache_bytes': memory.size_bytes,
+            'concurrency_limit': concurrency.limit,
+            'requests_in_flight': concurrency.in_flight,
+            'request_error_rate': concurrency.error_rate,
+            'concurrency_decreases': concurrency.decreases,
+            'rate_limit_pause_seconds': concurrency.paused_for,
+            'sessions_active': len(sessions),
+            'session_success_ratio_min': min((s.success_rate for s in sessions), default=1.0),
+        })
+
+    def _active_sessions(self) -> List[SessionStats]:
+        """Counters of the sessions the pool has not retired"""
+        return [s for s in self.session_pool.stats() if not s.retired]
+
+    def get_page_count(self, use_cache: bool = True) -> Optional[int]:
+        """
+        Determine the total number of pages
+
+        The highest page linked from page 1's pagination is checked to have
+        entries, taken as a lower bound and confirmed by probing the page
+        after it; if it is empty, the last page is binary-searched below it.
+        Without pagination markup, the last non-empty page is found by
+        galloping then binary search, i.e. O(log n) page fetches. Probed
+        pages land in the page cache, so jumping to the last page afterwards
+        costs nothing extra. Demo data has DEMO_PAGE_COUNT pages.
+
+        Args:
+            use_cache: Reuse a page count discovered within PAGE_COUNT_TTL
 
         Returns:
-            Estimated page count or None if unknown
+            Page count or None if it could not be determined (the reason
+            is left in `last_error`)
         """
-        # This would require parsing the pagination elements from the page
-        # For now, return None to indicate unknown
-        return None
+        if self.use_demo_data:
+            return self.DEMO_PAGE_COUNT
+
+        if use_cache and self._page_count is not None:
+            count, found_at = self._page_count
+            if time.monotonic() - found_at < self.PAGE_COUNT_TTL:
+                return count
+
+        count, self.last_error = self._discover_page_count()
+        if count is not None:
+            self._page_count = (count, time.monotonic())
+        return count
+
+    def _page_has_entries(self, page_num: int) -> Tuple[Optional[bool], Optional[str]]:
+        """Return whether a page lists any vulnerabilities (None on error) and the error"""
+        vulns, error = self.get_vulnerabilities_with_error(page_num)
+        if error is not None:
+            return None, f"Page {page_num}: {error}"
+        return bool(vulns), None
+
+    def _discover_page_count(self) -> Tuple[Optional[int], Optional[str]]:
+        """Find the last non-empty page from pagination links and probing"""
+        html, error = self._fetch_page(1)
+        if html is None:
+            return None, error
+        if not self.parse_vulnerabilities(html):
+            return 0, None
+
+        linked = [int(n) for n in self.PAGINATION_PATTERN.findall(html)]
+        last_known = max(linked, default=1)
+        if last_known > 1:
+            # Pagination can link past the end of the listing; check before trusting it
+            has_entries, error = self._page_has_entries(last_known)
+            if has_entries is None:
+                return None, error
+            if not has_entries:
+                return self._last_page_between(1, last_known)
+
+        # Gallop upwards from the last page known to exist
+        step = 1
+        while True:
+            probe = last_known + step
+            has_entries, error = self._page_has_entries(probe)
+            if has_entries is None:
+                return None, error
+            if not has_entries:
+                break
+            last_known = probe
+            step *= 2
+        return self._last_page_between(last_known, probe)
+
+    def _last_page_between(self, low: int, high: int) -> Tuple[Optional[int], Optional[str]]:
+        """Binary-search the last non-empty page, given page `low` has entries and `high` has none"""
+        while high - low > 1:
+            mid = (low + high) // 2
+            has_entries, error = self._page_has_entries(mid)
+            if has_entries is None:
+                return None, error
+            if has_entries:
+                low = mid
+            else:
+                high = mid
+        return low, None
 
 
 def export_vulnerabilities_to_file(
-    vulnerabilities: List[Vulnerability],
+    vulnerabilities: Iterable[Vulnerability],
     filename: str,
-    mode: str = 'w'
+    mode: str = 'w',
+    format: Optional[str] = None,
+    dedupe: bool = False
 ) -> bool:
     """
-    Export vulnerabilities to a text file
+    Export vulnerabilities to a file
+
+    Records are streamed through a VulnerabilityExporter, so a generator
+    (e.g. a multi-page crawl) is written without building a list first.
 
     Args:
-        vulnerabilities: List of vulnerabilities to export
-        filename: Output filename
+        vulnerabilities: Vulnerabilities to export (a list, VulnerabilityColumns
+            or any other iterable)
+        filename: Output filename; a .gz suffix enables gzip compression
         mode: File mode ('w' for write, 'a' for append)
+        format: 'text', 'jsonl', 'csv' or 'tsv' (guessed from filename if omitted)
+        dedupe: Skip records whose ZD ID was already written
 
     Returns:
         True if successful, False otherwise
     """
+    # Imported here because exporter depends on this module
+    from exporter import VulnerabilityExporter
+
     try:
-        with open(filename, mode, encoding='utf-8') as f:
-            for vul in vulnerabilities:
-                f.write(f'{vul.full_url} {vul.title}\n')
+        with VulnerabilityExporter(filename, mode=mode, format=format, dedupe=dedupe) as exporter:
+            exporter.write_all(vulnerabilities)
         return True
     except Exception as e:
         print(f"Error exporting to file: {e}")
         return False
+
+
+if __name__ == "__main__":
+    # `python -m crawler crawl ...`; the commands live in cli.py
+    from cli import main
+
+    sys.exit(main())
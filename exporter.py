@@ -0,0 +1,210 @@
+"""
+Vulnerability exporter for HITCON Vuls Crawler
+Streams records to plain text, JSONL, CSV or TSV through a large write buffer
+"""
+
+import csv
+import gzip
+import json
+import os
+from typing import IO, Iterable, List, Optional, Set
+
+from crawler import ZD_ID_PATTERN, Vulnerability
+
+FORMATS = ('text', 'jsonl', 'csv', 'tsv')
+COLUMNS = ('zd_id', 'url', 'title', 'date', 'vendor', 'status')
+
+
+def guess_format(filename: str) -> str:
+    """Pick an export format from a file name such as vulns.jsonl.gz"""
+    name = filename[:-3] if filename.endswith('.gz') else filename
+    ext = os.path.splitext(name)[1].lstrip('.').lower()
+    if ext in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if ext in ('csv', 'tsv'):
+        return ext
+    return 'text'
+
+
+def vulnerability_record(vul: Vulnerability) -> dict:
+    """Return the exported fields of a record as a JSON-ready dict"""
+    return {
+        'zd_id': vul.zd_id,
+        'url': vul.full_url,
+        'title': vul.title,
+        'date': vul.date,
+        'vendor': vul.vendor,
+        'status': vul.status,
+    }
+
+
+def _csv_row(vul: Vulnerability) -> list:
+    return [
+        vul.zd_id, vul.full_url, vul.title,
+        vul.date or '', vul.vendor or '', vul.status or ''
+    ]
+
+
+class _Echo:
+    """File-like object whose write() returns the text; writerow() then returns the line"""
+
+    write = staticmethod(str)
+
+
+_CSV_WRITERS = {
+    'csv': csv.writer(_Echo(), delimiter=',', lineterminator='\n'),
+    'tsv': csv.writer(_Echo(), delimiter='\t', lineterminator='\n'),
+}
+
+
+def format_record(vul: Vulnerability, format: str) -> str:
+    """
+    Render one record as it appears in an export of `format`
+
+    Lets records be rendered away from the exporter (e.g. in worker
+    processes) and written with VulnerabilityExporter.write_line().
+    """
+    if format == 'text':
+        return f'{vul.full_url} {vul.title}\n'
+    if format == 'jsonl':
+        return json.dumps(vulnerability_record(vul), ensure_ascii=False) + '\n'
+    return _CSV_WRITERS[format].writerow(_csv_row(vul))
+
+
+class _WriteBuffer:
+    """Collects small writes and hands them to the file in large blocks"""
+
+    def __init__(self, stream: IO[str], size: int):
+        self.stream = stream
+        self.size = size
+        self._parts: List[str] = []
+        self._pending = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self.size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self.stream.write(''.join(self._parts))
+            self._parts = []
+            self._pending = 0
+
+
+class VulnerabilityExporter:
+    """
+    Streaming exporter that writes records as they are produced
+
+    Use as a context manager and feed it from any iterator, for example
+    straight from a multi-page crawl. With `dedupe`, records whose ZD ID
+    was already written (in this run, or earlier in the file when
+    appending) are skipped; every record is written otherwise.
+    """
+
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        filename: str,
+        mode: str = 'w',
+        format: Optional[str] = None,
+        compress: Optional[bool] = None,
+        dedupe: bool = False
+    ):
+        """
+        Args:
+            filename: Output file
+            mode: 'w' to overwrite or 'a' to append
+            format: One of FORMATS (guessed from the file name if omitted)
+            compress: Gzip the output (defaults to True for *.gz names)
+            dedupe: Skip records whose ZD ID has already been written
+        """
+        self.filename = filename
+        self.mode = mode
+        self.format = format or guess_format(filename)
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown export format: {self.format}")
+        self.compress = filename.endswith('.gz') if compress is None else compress
+        self.dedupe = dedupe
+        self.written = 0
+        self.skipped = 0
+        self._seen: Set[str] = set()
+        self._stream: Optional[IO[str]] = None
+        self._buffer: Optional[_WriteBuffer] = None
+
+    def __enter__(self) -> 'VulnerabilityExporter':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Open the output file, loading existing IDs when appending"""
+        appending = self.mode == 'a' and os.path.exists(self.filename)
+        if appending and self.dedupe:
+            self._seen = self._read_existing_ids()
+
+        has_content = appending and os.path.getsize(self.filename) > 0
+        if self.compress:
+            self._stream = gzip.open(self.filename, self.mode + 't', encoding='utf-8', newline='')
+        else:
+            self._stream = open(self.filename, self.mode, encoding='utf-8', newline='')
+        self._buffer = _WriteBuffer(self._stream, self.BUFFER_SIZE)
+
+        if self.format in ('csv', 'tsv') and not has_content:
+            self._buffer.write(_CSV_WRITERS[self.format].writerow(COLUMNS))
+
+    def _read_existing_ids(self) -> Set[str]:
+        """Collect ZD IDs already present in the output file"""
+        opener = gzip.open if self.compress else open
+        ids = set()
+        with opener(self.filename, 'rt', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                match = ZD_ID_PATTERN.search(line)
+                if match:
+                    ids.add(match.group(0))
+        return ids
+
+    def _is_duplicate(self, zd_id: str) -> bool:
+        """Check (and remember) an ID; caller has checked `dedupe`"""
+        if zd_id in self._seen:
+            self.skipped += 1
+            return True
+        self._seen.add(zd_id)
+        return False
+
+    def write(self, vul: Vulnerability) -> bool:
+        """Write one record; returns False if it was skipped as a duplicate"""
+        if self.dedupe and self._is_duplicate(vul.zd_id):
+            return False
+        self._buffer.write(format_record(vul, self.format))
+        self.written += 1
+        return True
+
+    def write_line(self, zd_id: str, line: str) -> bool:
+        """Write a record already rendered by format_record() for this format"""
+        if self.dedupe and self._is_duplicate(zd_id):
+            return False
+        self._buffer.write(line)
+        self.written += 1
+        return True
+
+    def write_all(self, vulnerabilities: Iterable[Vulnerability]) -> int:
+        """Write every record from an iterable; returns how many were written"""
+        before = self.written
+        for vul in vulnerabilities:
+            self.write(vul)
+        return self.written - before
+
+    def close(self) -> None:
+        """Flush the buffer and close the file"""
+        if self._stream is None:
+            return
+        try:
+            self._buffer.flush()
+        finally:
+            self._stream.close()
+            self._stream = None
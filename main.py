@@ -46,10 +46,8 @@ def vulsDataShow(vuls):
 
 def writeInVuls(vuls):
     SaveFile = os.getcwd() + '/vuls.txt'
-    for vul in vuls:
-        link = 'https://zeroday.hitcon.org' + vul[0] 
-        with open(SaveFile,'a',encoding='u8') as f:
-            f.writelines(f'{link} {vul[1]}\n')
+    with open(SaveFile,'a',encoding='u8') as f:
+        f.write(''.join(f'https://zeroday.hitcon.org{vul[0]} {vul[1]}\n' for vul in vuls))
 
 def writeClear():
     SaveFile = os.getcwd() + '/vuls.txt'
@@ -0,0 +1,157 @@
+"""
+Request instrumentation for HITCON Vuls Crawler
+Per-phase latency histograms, counters, and Prometheus text export
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Phases of a page fetch, in the order they happen
+#   wait:     rate cap, concurrency slot and Retry-After pauses
+#   session:  checking out a scraper session (creating one includes challenge setup)
+#   ttfb:     request sent until headers received (includes TCP/TLS connect on a
+#             new connection; requests does not expose connect time separately)
+#   download: headers received until the body is complete
+#   parse:    turning listing HTML into records
+PHASES = ('wait', 'session', 'ttfb', 'download', 'parse')
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket containing it"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Return (le, cumulative count) pairs including +Inf"""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((repr(bound), total))
+        pairs.append(('+Inf', self.count))
+        return pairs
+
+
+class CrawlerMetrics:
+    """Thread-safe counters and latency histograms for one crawler"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Histogram] = {phase: Histogram() for phase in PHASES}
+        self.requests: Dict[str, int] = {}
+        self.cache: Dict[Tuple[str, str], int] = {}
+        self.bytes_received = 0
+        self.retries = 0
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Record the duration of one request phase"""
+        with self._lock:
+            self.histograms[phase].observe(seconds)
+
+    def count_request(self, outcome: str, nbytes: int = 0) -> None:
+        """Record a finished request attempt (ok, not_modified, http_429, error, ...)"""
+        with self._lock:
+            self.requests[outcome] = self.requests.get(outcome, 0) + 1
+            self.bytes_received += nbytes
+
+    def count_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def count_cache(self, layer: str, result: str) -> None:
+        """Record a cache lookup, e.g. ('disk', 'hit') or ('disk', 'revalidated')"""
+        with self._lock:
+            key = (layer, result)
+            self.cache[key] = self.cache.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a plain-dict copy of every metric"""
+        with self._lock:
+            return {
+                'requests': dict(self.requests),
+                'bytes_received': self.bytes_received,
+                'retries': self.retries,
+                'cache': {f'{layer}_{result}': n for (layer, result), n in self.cache.items()},
+                'latency': {
+                    phase: {
+                        'count': h.count,
+                        'sum': h.sum,
+                        'p50': h.quantile(0.5),
+                        'p95': h.quantile(0.95),
+                    }
+                    for phase, h in self.histograms.items()
+                },
+            }
+
+    def to_prometheus(self, gauges: Optional[Dict[str, float]] = None,
+                      prefix: str = 'hitcon_crawler') -> str:
+        """
+        Render metrics in the Prometheus text exposition format
+
+        Args:
+            gauges: Extra point-in-time values (e.g. memory cache size) to include
+            prefix: Metric name prefix
+        """
+        lines = []
+        with self._lock:
+            lines.append(f'# TYPE {prefix}_requests_total counter')
+            for outcome, n in sorted(self.requests.items()):
+                lines.append(f'{prefix}_requests_total{{outcome="{outcome}"}} {n}')
+
+            lines.append(f'# TYPE {prefix}_received_bytes_total counter')
+            lines.append(f'{prefix}_received_bytes_total {self.bytes_received}')
+            lines.append(f'# TYPE {prefix}_retries_total counter')
+            lines.append(f'{prefix}_retries_total {self.retries}')
+
+            lines.append(f'# TYPE {prefix}_cache_lookups_total counter')
+            for (layer, result), n in sorted(self.cache.items()):
+                lines.append(f'{prefix}_cache_lookups_total{{layer="{layer}",result="{result}"}} {n}')
+
+            name = f'{prefix}_phase_duration_seconds'
+            lines.append(f'# TYPE {name} histogram')
+            for phase, h in self.histograms.items():
+                for le, count in h.cumulative():
+                    lines.append(f'{name}_bucket{{phase="{phase}",le="{le}"}} {count}')
+                lines.append(f'{name}_sum{{phase="{phase}"}} {h.sum}')
+                lines.append(f'{name}_count{{phase="{phase}"}} {h.count}')
+
+        for key, value in sorted((gauges or {}).items()):
+            lines.append(f'# TYPE {prefix}_{key} gauge')
+            lines.append(f'{prefix}_{key} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def write_prometheus_textfile(path: str, text: str) -> None:
+    """Atomically replace a node-exporter textfile collector file"""
+    path = os.path.expanduser(path)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
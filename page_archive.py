@@ -0,0 +1,249 @@
+"""
+Raw page archive for HITCON Vuls Crawler
+Append-only store of every fetched page: compressed frames in one data file
+plus a fixed-size index, read through mmap
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Frame: magic, codec, compressed length, raw length, fetched_at, page_num,
+# URL length; then the URL and the compressed body
+FRAME_HEADER = struct.Struct('<4sBIIdIH')
+FRAME_MAGIC = b'HVA1'
+CODEC_ZLIB = 1
+
+# Index record: URL hash, fetched_at, frame offset, frame length, page_num
+INDEX_RECORD = struct.Struct('<8sdQII')
+
+
+def url_key(url: str) -> bytes:
+    """8-byte hash a URL is indexed under"""
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+
+
+@dataclass
+class ArchivedPage:
+    """One stored version of a page"""
+    url: str
+    page_num: int
+    fetched_at: float
+    body: str
+
+
+class PageArchive:
+    """
+    Append-only archive of raw listing and detail pages
+
+    Every fetch adds a zlib-compressed frame to `path`; `path + ".idx"`
+    holds one fixed-size record per frame (URL hash, fetch time, offset),
+    loaded into a dict on open. Looking a page up is a dict lookup, a
+    slice of the memory-mapped data file and one decompression, no matter
+    how large the archive grows. Frames carry their own URL and length,
+    so a torn write at the end is detected and cut off on the next open.
+    """
+
+    DEFAULT_PATH = os.path.expanduser("~/.cache/hitcon-vuls-crawler/pages.hva")
+    INDEX_SUFFIX = ".idx"
+
+    def __init__(self, path: str = DEFAULT_PATH, level: int = 6, readonly: bool = False):
+        """
+        Open (or create) an archive
+
+        Args:
+            path: Data file; the index is stored next to it
+            level: zlib compression level for new frames
+            readonly: Open an existing archive for reading only; it is
+                never repaired, so other processes can read while one writes
+        """
+        self.path = os.path.expanduser(path)
+        self.index_path = self.path + self.INDEX_SUFFIX
+        self.level = level
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        # URL hash -> [(fetched_at, offset, length, page_num)] in append order
+        self._index: Dict[bytes, List[Tuple[float, int, int, int]]] = {}
+        self._count = 0
+        self._map: Optional[mmap.mmap] = None
+
+        if readonly:
+            self._data = open(self.path, 'rb')
+            self._idx = open(self.index_path, 'rb')
+        else:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._data = open(self.path, 'a+b')
+            self._idx = open(self.index_path, 'a+b')
+        self._recover()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    def _add_to_index(self, key: bytes, fetched_at: float, offset: int,
+                      length: int, page_num: int) -> None:
+        self._index.setdefault(key, []).append((fetched_at, offset, length, page_num))
+        self._count += 1
+
+    def _recover(self) -> None:
+        """Load the index, dropping torn records and indexing unindexed frames"""
+        data_size = os.path.getsize(self.path)
+        self._idx.seek(0)
+        raw = self._idx.read()
+
+        indexed_end = 0
+        valid = 0
+        for pos in range(0, len(raw) - INDEX_RECORD.size + 1, INDEX_RECORD.size):
+            key, fetched_at, offset, length, page_num = INDEX_RECORD.unpack_from(raw, pos)
+            if offset + length > data_size:
+                break
+            self._add_to_index(key, fetched_at, offset, length, page_num)
+            indexed_end = max(indexed_end, offset + length)
+            valid = pos + INDEX_RECORD.size
+        if valid < len(raw) and not self.readonly:
+            self._idx.truncate(valid)
+
+        # Frames written after the last index record (crash between the two writes)
+        self._data.seek(indexed_end)
+        offset = indexed_end
+        while offset < data_size:
+            header = self._data.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                break
+            magic, _, comp_len, _, fetched_at, page_num, url_len = FRAME_HEADER.unpack(header)
+            length = FRAME_HEADER.size + url_len + comp_len
+            if magic != FRAME_MAGIC or offset + length > data_size:
+                break
+            url = self._data.read(url_len).decode('utf-8', errors='replace')
+            self._data.seek(comp_len, os.SEEK_CUR)
+            if self.readonly:
+                self._add_to_index(url_key(url), fetched_at, offset, length, page_num)
+            else:
+                self._write_index(url_key(url), fetched_at, offset, length, page_num)
+            offset += length
+
+        if offset < data_size and not self.readonly:
+            print(f"Warning: Dropping incomplete tail of page archive {self.path}")
+            self._data.truncate(offset)
+
+    def _write_index(self, key: bytes, fetched_at: float, offset: int,
+                     length: int, page_num: int) -> None:
+        """Append an index record and add it to the dict; caller holds the lock"""
+        self._idx.write(INDEX_RECORD.pack(key, fetched_at, offset, length, page_num))
+        self._idx.flush()
+        self._add_to_index(key, fetched_at, offset, length, page_num)
+
+    def append(self, url: str, page_num: int, body: str, fetched_at: Optional[float] = None) -> None:
+        """
+        Store a new version of a page
+
+        Args:
+            url: Page URL
+            page_num: Listing page number (0 for other pages)
+            body: Page HTML
+            fetched_at: When it was fetched (now if omitted)
+        """
+        if self.readonly:
+            raise ValueError("Page archive was opened read-only")
+        if fetched_at is None:
+            fetched_at = time.time()
+        raw = body.encode('utf-8')
+        payload = zlib.compress(raw, self.level)
+        url_bytes = url.encode('utf-8')
+        frame = FRAME_HEADER.pack(
+            FRAME_MAGIC, CODEC_ZLIB, len(payload), len(raw), fetched_at, page_num, len(url_bytes)
+        ) + url_bytes + payload
+
+        with self._lock:
+            self._data.seek(0, os.SEEK_END)
+            offset = self._data.tell()
+            self._data.write(frame)
+            self._data.flush()
+            # The frame is complete on disk before the index points at it
+            self._write_index(url_key(url), fetched_at, offset, len(frame), page_num)
+
+    def _read_frame(self, url: str, offset: int, length: int) -> Optional[ArchivedPage]:
+        """Decode the frame at `offset`; caller holds the lock"""
+        if self._map is None or offset + length > len(self._map):
+            # Remap to cover frames appended since the last read
+            if self._map is not None:
+                self._map.close()
+            if not self.readonly:
+                self._data.flush()
+            self._map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, codec, comp_len, _, fetched_at, page_num, url_len = FRAME_HEADER.unpack_from(self._map, offset)
+        start = offset + FRAME_HEADER.size
+        if self._map[start:start + url_len].decode('utf-8', errors='replace') != url:
+            # Another URL with the same 8-byte hash
+            return None
+        if codec != CODEC_ZLIB:
+            raise ValueError(f"Unknown page archive codec {codec}")
+        payload = self._map[start + url_len:start + url_len + comp_len]
+        return ArchivedPage(url, page_num, fetched_at, zlib.decompress(payload).decode('utf-8'))
+
+    def get(self, url: str, at: Optional[float] = None) -> Optional[ArchivedPage]:
+        """
+        Return the newest stored version of `url`, or None
+
+        Args:
+            url: Page URL
+            at: Only consider versions fetched at or before this time
+        """
+        with self._lock:
+            for fetched_at, offset, length, _ in reversed(self._index.get(url_key(url), ())):
+                if at is not None and fetched_at > at:
+                    continue
+                page = self._read_frame(url, offset, length)
+                if page is not None:
+                    return page
+        return None
+
+    def listing_pages(self, url_template: str) -> List[Tuple[int, str]]:
+        """
+        Return (page_num, url) for every archived listing page, in page order
+
+        Args:
+            url_template: Listing URL with a {page} placeholder
+        """
+        with self._lock:
+            page_nums = {
+                page_num
+                for entries in self._index.values()
+                for _, _, _, page_num in entries if page_num > 0
+            }
+            pages = []
+            for page_num in sorted(page_nums):
+                url = url_template.format(page=page_num)
+                if url_key(url) in self._index:
+                    pages.append((page_num, url))
+        return pages
+
+    def sync(self) -> None:
+        """Force appended frames and index records to disk"""
+        if self.readonly:
+            return
+        with self._lock:
+            os.fsync(self._data.fileno())
+            os.fsync(self._idx.fileno())
+
+    def close(self) -> None:
+        """Close the archive files"""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._data.close()
+            self._idx.close()
+
+    def __enter__(self) -> 'PageArchive':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
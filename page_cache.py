@@ -0,0 +1,493 @@
+"""
+Page caches for HITCON Vuls Crawler
+A bounded in-memory LRU of parsed records keyed by vulnerability ID, and a
+persistent on-disk store of fetched listing pages so they survive between runs
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+@dataclass
+class CacheEntry:
+    """A cached page body together with its validators"""
+    url: str
+    page_num: int
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    ttl: float
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Return True if the entry can be served without revalidation"""
+        if now is None:
+            now = time.time()
+        return now - self.fetched_at < self.ttl
+
+    def conditional_headers(self) -> dict:
+        """Build If-None-Match / If-Modified-Since headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class DiskPageCache:
+    """SQLite-backed page store keyed by URL, with a per-entry TTL"""
+
+    DEFAULT_PATH = os.path.expanduser("~/.cache/hitcon-vuls-crawler/pages.db")
+    DEFAULT_TTL = 3600.0
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = DEFAULT_TTL):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: SQLite database file, or ":memory:"
+            ttl: Seconds an entry stays fresh before it must be revalidated
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    page_num INTEGER NOT NULL,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    ttl REAL NOT NULL
+                )
+                """
+            )
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the cached entry for `url`, fresh or stale, or None"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT url, page_num, body, etag, last_modified, fetched_at, ttl "
+                    "FROM pages WHERE url = ?",
+                    (url,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        return CacheEntry(*row) if row else None
+
+    def put(
+        self,
+        url: str,
+        page_num: int,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        ttl: Optional[float] = None
+    ) -> None:
+        """Store or replace the entry for `url`"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages "
+                    "(url, page_num, body, etag, last_modified, fetched_at, ttl) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, page_num, body, etag, last_modified, time.time(),
+                     self.ttl if ttl is None else ttl)
+                )
+        except sqlite3.Error:
+            pass
+
+    def touch(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Mark an entry fresh again after a 304 Not Modified response"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE pages SET fetched_at = ?, "
+                    "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) "
+                    "WHERE url = ?",
+                    (time.time(), etag, last_modified, url)
+                )
+        except sqlite3.Error:
+            pass
+
+    def delete(self, url: str) -> None:
+        """Remove the entry for `url` if present"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+        except sqlite3.Error:
+            pass
+
+    def listing_pages(self, url_template: str) -> List[Tuple[int, str]]:
+        """
+        Return (page_num, url) for every stored listing page, in page order
+
+        Args:
+            url_template: Listing URL with a {page} placeholder; entries
+                stored under other URLs (another host, detail pages) are skipped
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT page_num, url FROM pages WHERE page_num > 0 ORDER BY page_num"
+                ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [(page_num, url) for page_num, url in rows
+                if url == url_template.format(page=page_num)]
+
+    def expire_listing(self, keep_url: Optional[str] = None) -> None:
+        """
+        Mark every listing page stale so it is revalidated before use
+
+        Entries stored with page_num 0 (not listing pages) are left alone.
+
+        Args:
+            keep_url: A page that is known to be current
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE pages SET fetched_at = 0 WHERE page_num > 0 AND url != ?",
+                    (keep_url or "",)
+                )
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        """Remove every cached page"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM pages")
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class CacheStats:
+    """Counters describing in-memory cache behaviour"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+    budget_bytes: int = 0
+    rebases: int = 0
+
+
+@dataclass
+class _Slot:
+    """One cached record and where it sat in the listing"""
+    record: Any
+    anchor: int
+    size: int
+
+
+def _estimate_record_size(record: Any) -> int:
+    """Approximate the memory held by one parsed record and its fields"""
+    size = sys.getsizeof(record)
+    if hasattr(record, '__dict__'):
+        values = vars(record).values()
+    else:
+        values = (getattr(record, name, None) for name in getattr(record, '__slots__', ()))
+    for value in values:
+        size += sys.getsizeof(value)
+    return size
+
+
+class LRUPageCache:
+    """
+    Thread-safe LRU of parsed listing records bounded by an approximate byte budget
+
+    Records are stored once, keyed by vulnerability ID, at their position in
+    the listing; a page is a view over `page_size` consecutive positions.
+    New disclosures push every record further down the listing, so when a
+    page arrives with known records at a different position, the offset is
+    applied to the whole cache in O(1) instead of refetching every page.
+    Raw HTML cannot be rebased and is dropped when that happens, as is
+    everything when the listing can no longer be lined up at all.
+    """
+
+    DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES, store_html: bool = True):
+        """
+        Args:
+            budget_bytes: Approximate upper bound on memory held by cached pages
+            store_html: Also keep zlib-compressed raw HTML for fetch_page hits
+        """
+        self.budget_bytes = budget_bytes
+        self.store_html = store_html
+        self._records: "OrderedDict[str, _Slot]" = OrderedDict()
+        # anchor -> record ID; a record's listing position is anchor + _shift
+        self._positions: Dict[int, str] = {}
+        self._shift = 0
+        self._page_size: Optional[int] = None
+        # Anchor just past the last record, once a short or empty page was seen
+        self._end: Optional[int] = None
+        # Records of pages dropped by pop(), kept only to line the refetch up
+        self._stale: Set[str] = set()
+        self._html: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._rebases = 0
+
+    def __contains__(self, page_num: int) -> bool:
+        with self._lock:
+            return page_num in self._html or self._view(page_num) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def _view(self, page_num: int) -> Optional[List[str]]:
+        """Return the record IDs making up a page, or None if any are missing; caller holds the lock"""
+        if self._page_size is None:
+            return None
+        start = (page_num - 1) * self._page_size - self._shift
+        stop = start + self._page_size
+        if self._end is not None:
+            stop = min(stop, self._end)
+
+        ids = []
+        for anchor in range(start, stop):
+            zd_id = self._positions.get(anchor)
+            if zd_id is None or zd_id in self._stale:
+                return None
+            ids.append(zd_id)
+        return ids
+
+    def get_vulnerabilities(self, page_num: int) -> Optional[List[Any]]:
+        """Return the parsed records for a page without re-parsing, or None"""
+        with self._lock:
+            ids = self._view(page_num)
+            if ids is None:
+                self._misses += 1
+                return None
+            for zd_id in ids:
+                self._records.move_to_end(zd_id)
+            self._hits += 1
+            return [self._records[zd_id].record for zd_id in ids]
+
+    def get_html(self, page_num: int) -> Optional[str]:
+        """Return the raw HTML for a page if it was kept, or None"""
+        with self._lock:
+            html_z = self._html.get(page_num)
+            if html_z is None:
+                self._misses += 1
+                return None
+            self._html.move_to_end(page_num)
+            self._hits += 1
+        return zlib.decompress(html_z).decode('utf-8')
+
+    def _detect_offset(self, start: int, ids: List[str]) -> Optional[int]:
+        """
+        Compare a fetched page with the cached positions of its records
+
+        Returns:
+            How far the cached records have to move (0 if they are in
+            place), or None if the cache cannot be reconciled with the page
+        """
+        offsets = {
+            start + i - (self._records[zd_id].anchor + self._shift)
+            for i, zd_id in enumerate(ids) if zd_id in self._records
+        }
+        if len(offsets) > 1:
+            # Records were removed or reordered, not just pushed down
+            return None
+        if offsets:
+            return offsets.pop()
+
+        # Nothing in common: fine, unless other records hold these positions
+        for position in range(start, start + len(ids)):
+            if position - self._shift in self._positions:
+                return None
+        return 0
+
+    def _remove_record(self, zd_id: str) -> None:
+        """Drop one record and its position; caller holds the lock"""
+        slot = self._records.pop(zd_id)
+        self._stale.discard(zd_id)
+        if self._positions.get(slot.anchor) == zd_id:
+            del self._positions[slot.anchor]
+        self._size -= slot.size
+
+    def _reset_positions(self) -> None:
+        """Forget every record when the listing can no longer be lined up; caller holds the lock"""
+        self._records.clear()
+        self._positions.clear()
+        self._shift = 0
+        self._end = None
+        self._stale.clear()
+        # Pages no longer line up with what was cached under their numbers
+        self._html.clear()
+        self._size = 0
+
+    def _put_records(self, page_num: int, vulnerabilities: List[Any], key: Callable[[Any], str]) -> int:
+        """Place a page's records, rebasing the cache if they moved; caller holds the lock"""
+        count = len(vulnerabilities)
+        if self._page_size is None or count > self._page_size:
+            if not count:
+                return 0
+            if self._page_size is not None:
+                self._reset_positions()
+            self._page_size = count
+
+        start = (page_num - 1) * self._page_size
+        ids = [key(vul) for vul in vulnerabilities]
+        # Storing a record drops its stale mark; other popped pages stay
+        # stale until they are fetched themselves
+        offset = self._detect_offset(start, ids)
+        if offset is None:
+            self._reset_positions()
+            offset = 0
+        elif offset:
+            # Every cached record moved together; page views follow the shift
+            self._shift += offset
+            self._rebases += 1
+            self._html.clear()
+            self._size = sum(slot.size for slot in self._records.values())
+
+        for i, (zd_id, vul) in enumerate(zip(ids, vulnerabilities)):
+            if zd_id in self._records:
+                self._remove_record(zd_id)
+            anchor = start + i - self._shift
+            displaced = self._positions.get(anchor)
+            if displaced is not None:
+                self._remove_record(displaced)
+
+            slot = _Slot(vul, anchor, _estimate_record_size(vul))
+            self._records[zd_id] = slot
+            self._positions[anchor] = zd_id
+            self._size += slot.size
+
+        end = start + count - self._shift
+        if count < self._page_size:
+            # A short page is the end of the listing; nothing lies past it
+            self._end = end
+            for zd_id in [z for z, slot in self._records.items() if slot.anchor >= end]:
+                self._remove_record(zd_id)
+        elif self._end is not None and end > self._end:
+            self._end = None
+        return offset
+
+    def put(
+        self,
+        page_num: int,
+        vulnerabilities: Optional[List[Any]] = None,
+        html: Optional[str] = None,
+        key: Callable[[Any], str] = attrgetter('zd_id')
+    ) -> int:
+        """
+        Store parsed records and/or HTML for a page, evicting as needed
+
+        Args:
+            page_num: Listing page the records were read from
+            vulnerabilities: Records on the page, in listing order
+            html: Raw page HTML
+            key: Returns a record's vulnerability ID
+
+        Returns:
+            Positions the cached records were moved by (0 if none)
+        """
+        html_z = None
+        if html is not None and self.store_html:
+            html_z = zlib.compress(html.encode('utf-8'), 1)
+
+        with self._lock:
+            offset = 0
+            kept = set()
+            if vulnerabilities is not None:
+                offset = self._put_records(page_num, vulnerabilities, key)
+                kept = {key(vul) for vul in vulnerabilities}
+
+            if html_z is not None:
+                previous = self._html.pop(page_num, None)
+                if previous is not None:
+                    self._size -= sys.getsizeof(previous)
+                self._html[page_num] = html_z
+                self._size += sys.getsizeof(html_z)
+
+            # HTML is cheaper to lose than parsed records; the page just
+            # stored is always kept, even if it alone exceeds the budget
+            while self._size > self.budget_bytes:
+                if self._html and next(iter(self._html)) != page_num:
+                    _, evicted = self._html.popitem(last=False)
+                    self._size -= sys.getsizeof(evicted)
+                elif self._records and next(iter(self._records)) not in kept:
+                    self._remove_record(next(iter(self._records)))
+                else:
+                    break
+                self._evictions += 1
+            return offset
+
+    def pop(self, page_num: int) -> None:
+        """
+        Stop serving a page so it is fetched again
+
+        Its records stay in place (until evicted) so the refetched page can
+        still be lined up with them.
+        """
+        with self._lock:
+            html_z = self._html.pop(page_num, None)
+            if html_z is not None:
+                self._size -= sys.getsizeof(html_z)
+            if self._page_size is None:
+                return
+            start = (page_num - 1) * self._page_size - self._shift
+            for anchor in range(start, start + self._page_size):
+                zd_id = self._positions.get(anchor)
+                if zd_id is not None:
+                    self._stale.add(zd_id)
+
+    def clear(self) -> None:
+        """Remove every cached page"""
+        with self._lock:
+            self._html.clear()
+            self._reset_positions()
+            self._page_size = None
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters"""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._records),
+                size_bytes=self._size,
+                budget_bytes=self.budget_bytes,
+                rebases=self._rebases
+            )
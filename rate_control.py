@@ -0,0 +1,154 @@
+"""
+Adaptive request scheduling for HITCON Vuls Crawler
+Retry with jittered exponential backoff, and AIMD concurrency control
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Statuses that mean "try again later" rather than "this page is broken".
+# 403 is not one of them: it means blocked, and the session is retired instead
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convert a Retry-After header (seconds or HTTP date) to seconds from now"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to wait before retrying a failed request"""
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    max_retry_after: float = 300.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before retry number `attempt` (0-based)
+
+        Uses "full jitter" exponential backoff, but never less than the
+        server's Retry-After (capped at max_retry_after).
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.max_retry_after))
+        return backoff
+
+
+@dataclass
+class ConcurrencyStats:
+    """Snapshot of the adaptive concurrency controller"""
+    limit: float
+    in_flight: int
+    error_rate: float
+    decreases: int
+    paused_for: float
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on requests in flight
+
+    Each success raises the limit by 1/limit (about +1 per round of
+    requests); a throttling response, or an error rate above the
+    threshold, halves it. A Retry-After pauses every worker, not just
+    the one that received it.
+    """
+
+    WINDOW = 20
+    ERROR_RATE_THRESHOLD = 0.2
+    DECREASE_FACTOR = 0.5
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self._in_flight = 0
+        self._outcomes: deque = deque(maxlen=self.WINDOW)
+        self._decreases = 0
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a request slot is free and no pause is in effect"""
+        with self._condition:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                if self._in_flight < int(self.limit):
+                    self._in_flight += 1
+                    return
+                self._condition.wait()
+
+    def release(self, success: bool, throttled: bool = False,
+                retry_after: Optional[float] = None) -> None:
+        """
+        Give back a slot and feed the request outcome into the controller
+
+        Args:
+            success: The request produced usable content
+            throttled: The server signalled overload (429/503, challenge)
+            retry_after: Seconds the server asked everyone to wait
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._outcomes.append(success)
+
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+            if throttled or self._error_rate() > self.ERROR_RATE_THRESHOLD:
+                self._decrease()
+            elif success:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+            self._condition.notify_all()
+
+    def _decrease(self) -> None:
+        """Multiplicative decrease, at most once per second"""
+        now = time.monotonic()
+        # Many in-flight requests often fail together; count that as one signal
+        if now - self._last_decrease < 1.0:
+            return
+        self.limit = max(self.minimum, self.limit * self.DECREASE_FACTOR)
+        self._last_decrease = now
+        self._decreases += 1
+        self._outcomes.clear()
+
+    def _error_rate(self) -> float:
+        if len(self._outcomes) < self.WINDOW // 2:
+            return 0.0
+        return 1.0 - sum(self._outcomes) / len(self._outcomes)
+
+    def stats(self) -> ConcurrencyStats:
+        """Return a snapshot of the controller state"""
+        with self._condition:
+            return ConcurrencyStats(
+                limit=self.limit,
+                in_flight=self._in_flight,
+                error_rate=self._error_rate(),
+                decreases=self._decreases,
+                paused_for=max(0.0, self._paused_until - time.monotonic())
+            )
@@ -0,0 +1,186 @@
+"""
+Parallel re-parse for HITCON Vuls Crawler
+Runs the listing parser over every page stored in the disk cache (or the
+raw-page archive) on a process pool, so markup or parser changes can be
+applied without refetching
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from crawler import ListingStreamParser, Vulnerability
+from exporter import format_record
+from page_archive import PageArchive
+
+# (page_num, url) of a stored listing page
+PageRef = Tuple[int, str]
+
+
+@dataclass
+class WorkerStats:
+    """What one worker process has parsed so far"""
+    pid: int
+    pages: int = 0
+    bytes: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / self.busy_seconds / (1024 * 1024) if self.busy_seconds else 0.0
+
+
+@dataclass
+class ReparsedPage:
+    """Output of re-parsing one stored page"""
+    page_num: int
+    # Parsed records, if the reparser keeps them
+    records: List[Vulnerability] = field(default_factory=list)
+    # (zd_id, rendered export line) per record, if an export format was given
+    lines: List[Tuple[str, str]] = field(default_factory=list)
+
+
+# Per-process worker state, set up by _open_worker
+_worker_conn: Optional[sqlite3.Connection] = None
+_worker_archive: Optional[PageArchive] = None
+_worker_format: Optional[str] = None
+_worker_keep_records = True
+
+
+def _open_worker(path: str, format: Optional[str], keep_records: bool, from_archive: bool) -> None:
+    """Pool initializer: open the page cache or archive read-only in this process"""
+    global _worker_conn, _worker_archive, _worker_format, _worker_keep_records
+    if from_archive:
+        _worker_archive = PageArchive(path=path, readonly=True)
+    else:
+        _worker_conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    _worker_format = format
+    _worker_keep_records = keep_records
+
+
+def _close_worker() -> None:
+    global _worker_conn, _worker_archive
+    if _worker_conn is not None:
+        _worker_conn.close()
+        _worker_conn = None
+    if _worker_archive is not None:
+        _worker_archive.close()
+        _worker_archive = None
+
+
+def _read_page(url: str) -> Optional[str]:
+    """Stored body of `url` in this worker's source, or None"""
+    if _worker_archive is not None:
+        page = _worker_archive.get(url)
+        return page.body if page is not None else None
+    row = _worker_conn.execute("SELECT body FROM pages WHERE url = ?", (url,)).fetchone()
+    return row[0] if row is not None else None
+
+
+def _parse_chunk(chunk: List[PageRef]) -> Tuple[int, int, float, list]:
+    """
+    Read, parse and render a run of pages inside a worker
+
+    Records travel back as plain tuples and export lines as strings, so
+    the parent only has to write them out in order; that keeps it from
+    becoming the bottleneck as workers are added.
+
+    Returns:
+        Tuple of (pid, bytes parsed, busy seconds, [(page_num, record fields, lines)])
+    """
+    started = time.perf_counter()
+    nbytes = 0
+    pages = []
+    for page_num, url in chunk:
+        body = _read_page(url)
+        if body is None:
+            # Deleted since the page list was read
+            continue
+        nbytes += len(body)
+        parser = ListingStreamParser()
+        records = parser.feed(body) + parser.close()
+
+        fields = []
+        if _worker_keep_records:
+            fields = [(v.url, v.title, v.date, v.vendor, v.status) for v in records]
+        lines = []
+        if _worker_format is not None:
+            lines = [(v.zd_id, format_record(v, _worker_format)) for v in records]
+        pages.append((page_num, fields, lines))
+    return os.getpid(), nbytes, time.perf_counter() - started, pages
+
+
+class ParallelReparser:
+    """
+    Re-parses stored listing pages across a process pool
+
+    Pages are handed out in fixed-size chunks; each worker reads its own
+    pages from the SQLite cache or the memory-mapped archive, so only page
+    numbers and results cross process boundaries. Results come back in
+    page order.
+    """
+
+    DEFAULT_CHUNK_PAGES = 32
+
+    def __init__(
+        self,
+        db_path: str,
+        workers: Optional[int] = None,
+        chunk_pages: int = DEFAULT_CHUNK_PAGES,
+        format: Optional[str] = None,
+        keep_records: bool = True,
+        from_archive: bool = False
+    ):
+        """
+        Args:
+            db_path: DiskPageCache database file, or PageArchive data file
+                if from_archive is set
+            workers: Processes to use (default: one per CPU); 1 parses in
+                this process without a pool
+            chunk_pages: Pages per task handed to a worker
+            format: Export format to render lines in (see exporter.FORMATS)
+            keep_records: Return Vulnerability objects as well
+            from_archive: Read the newest archived version of each page
+        """
+        self.db_path = os.path.expanduser(db_path)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_pages = max(1, chunk_pages)
+        self.format = format
+        self.keep_records = keep_records
+        self.from_archive = from_archive
+        self.stats: Dict[int, WorkerStats] = {}
+
+    def run(self, pages: List[PageRef]) -> Iterator[ReparsedPage]:
+        """
+        Re-parse `pages`, yielding results in the order given
+
+        `stats` is updated as each chunk completes.
+        """
+        chunks = [pages[i:i + self.chunk_pages] for i in range(0, len(pages), self.chunk_pages)]
+        worker_args = (self.db_path, self.format, self.keep_records, self.from_archive)
+
+        if self.workers == 1:
+            _open_worker(*worker_args)
+            results = map(_parse_chunk, chunks)
+            pool = None
+        else:
+            pool = multiprocessing.Pool(self.workers, initializer=_open_worker, initargs=worker_args)
+            results = pool.imap(_parse_chunk, chunks)
+
+        try:
+            for pid, nbytes, busy, parsed in results:
+                stats = self.stats.setdefault(pid, WorkerStats(pid))
+                stats.pages += len(parsed)
+                stats.bytes += nbytes
+                stats.busy_seconds += busy
+                for page_num, fields, lines in parsed:
+                    yield ReparsedPage(page_num, [Vulnerability(*f) for f in fields], lines)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            else:
+                _close_worker()
@@ -0,0 +1,218 @@
+"""
+Local full-text search for HITCON Vuls Crawler
+Inverted index over crawled titles with CJK bigram and unigram tokenization
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Latin words/numbers, or runs of CJK ideographs, kana and hangul
+TOKEN_PATTERN = re.compile(
+    r'[0-9a-z]+(?:[._-][0-9a-z]+)*'
+    r'|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+'
+)
+
+
+def tokenize(text: str, unigrams: bool = False) -> List[str]:
+    """
+    Split text into index terms
+
+    Latin text becomes lowercase words; CJK runs become overlapping
+    bigrams (a lone character is kept as a unigram), so a query for
+    "注入" matches "SQL注入漏洞" without a dictionary.
+
+    Args:
+        text: Title or query
+        unigrams: Also emit every character of longer CJK runs. Titles
+            are indexed this way so a one-character query such as "洞"
+            finds them; longer queries still match on bigrams only.
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        term = match.group(0)
+        if term[0] < '\u3040':
+            tokens.append(term)
+        elif len(term) == 1:
+            tokens.append(term)
+        else:
+            tokens.extend(term[i:i + 2] for i in range(len(term) - 1))
+            if unigrams:
+                tokens.extend(term)
+    return tokens
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result"""
+    zd_id: str
+    url: str
+    title: str
+    score: float
+
+
+class SearchIndex:
+    """Incrementally maintained, persisted inverted index of vulnerability titles"""
+
+    DEFAULT_PATH = os.path.expanduser("~/.cache/hitcon-vuls-crawler/search_index.json")
+    # BM25 parameters
+    K1 = 1.2
+    B = 0.75
+
+    # Documents indexed per lock acquisition while loading, so searches and
+    # crawler updates are not blocked for the whole load
+    LOAD_BATCH = 2000
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH, load: bool = True):
+        """
+        Args:
+            path: JSON file the index is loaded from and saved to (None keeps
+                the index in memory only)
+            load: Read the saved index now; pass False to call load() later,
+                e.g. from a background thread after startup
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._docs: Dict[str, Tuple[str, str]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._dirty = False
+        self._loaded = not self.path
+        if self.path and load:
+            self.load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._docs)
+
+    def _index_doc(self, zd_id: str, url: str, title: str) -> None:
+        """Add one document; caller holds the lock"""
+        if zd_id in self._docs:
+            if self._docs[zd_id] == (url, title):
+                return
+            self._unindex_doc(zd_id)
+
+        terms = Counter(tokenize(title, unigrams=True))
+        self._docs[zd_id] = (url, title)
+        self._lengths[zd_id] = sum(terms.values())
+        self._total_length += self._lengths[zd_id]
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[zd_id] = tf
+        self._dirty = True
+
+    def _unindex_doc(self, zd_id: str) -> None:
+        """Remove one document; caller holds the lock"""
+        _, title = self._docs.pop(zd_id)
+        self._total_length -= self._lengths.pop(zd_id)
+        for term in set(tokenize(title, unigrams=True)):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(zd_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def add_all(self, vulnerabilities: Iterable) -> None:
+        """Index (or re-index) Vulnerability records by their ZD ID"""
+        with self._lock:
+            for vul in vulnerabilities:
+                self._index_doc(vul.zd_id, vul.url, vul.title)
+
+    def search(self, query: str, limit: int = 50) -> List[SearchHit]:
+        """
+        Return the best-matching documents for `query`
+
+        Documents matching more query terms always rank first; ties are
+        broken by BM25 score.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            doc_count = len(self._docs)
+            if not doc_count:
+                return []
+            avg_length = self._total_length / doc_count
+
+            matched: Counter = Counter()
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for zd_id, tf in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self._lengths[zd_id] / avg_length)
+                    scores[zd_id] = scores.get(zd_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+                    matched[zd_id] += 1
+
+            ranked = sorted(scores, key=lambda d: (matched[d], scores[d]), reverse=True)
+            return [
+                SearchHit(zd_id=d, url=self._docs[d][0], title=self._docs[d][1], score=scores[d])
+                for d in ranked[:limit]
+            ]
+
+    def documents(self) -> List[Tuple[str, str, str]]:
+        """Return (zd_id, url, title) for every indexed document, newest ZD ID first"""
+        with self._lock:
+            docs = [(zd_id, url, title) for zd_id, (url, title) in self._docs.items()]
+        docs.sort(key=lambda doc: [int(n) for n in re.findall(r'\d+', doc[0])], reverse=True)
+        return docs
+
+    def load(self) -> None:
+        """
+        Load saved documents and merge them into the index
+
+        Documents indexed before the load finished take precedence over
+        their saved copies. Only the first call does any work.
+        """
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not os.path.exists(self.path):
+                return
+
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    docs = list(json.load(f).get("documents", {}).items())
+            except Exception as e:
+                print(f"Warning: Could not load search index: {e}")
+                return
+
+            for start in range(0, len(docs), self.LOAD_BATCH):
+                with self._lock:
+                    was_dirty = self._dirty
+                    for zd_id, (url, title) in docs[start:start + self.LOAD_BATCH]:
+                        if zd_id not in self._docs:
+                            self._index_doc(zd_id, url, title)
+                    self._dirty = was_dirty
+
+    def save(self) -> None:
+        """Write the documents to disk if anything changed since the last save"""
+        if not self.path:
+            return
+        # Never overwrite the file with a partially loaded index
+        self.load()
+
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"documents": {zd_id: list(doc) for zd_id, doc in self._docs.items()}}
+            self._dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving search index: {e}")
@@ -0,0 +1,176 @@
+"""
+Scraper session pool for HITCON Vuls Crawler
+Reuses cloudscraper sessions across requests and recycles unhealthy ones
+"""
+
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, List
+
+
+# Markers of a Cloudflare interstitial served instead of the real page
+CHALLENGE_MARKERS = ('cf-chl', 'challenge-platform', 'Just a moment...', 'cf_chl_opt')
+
+
+def create_default_scraper() -> Any:
+    """Create a cloudscraper session configured like main.py"""
+    # Imported here: cloudscraper pulls in requests and the TLS stack, which
+    # startup (demo mode, cached pages) never needs
+    import cloudscraper
+
+    return cloudscraper.create_scraper(
+        delay=300,
+        browser={'custom': 'ScraperBot/1.0'}
+    )
+
+
+def is_blocked_status(status_code: int) -> bool:
+    """Return True if a status code means the session was blocked or throttled"""
+    return status_code in (403, 429, 503)
+
+
+def is_challenge_page(head: str) -> bool:
+    """Return True if the start of a 200 response body is a challenge page"""
+    head = head[:4096]
+    return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+@dataclass
+class SessionStats:
+    """Request outcome counters for one pooled session"""
+    session_id: int
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    retired: bool = False
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of requests that succeeded (1.0 before any request)"""
+        return self.successes / self.requests if self.requests else 1.0
+
+
+class PooledSession:
+    """A scraper session checked out from a ScraperSessionPool"""
+
+    def __init__(self, session_id: int, scraper: Any):
+        self.scraper = scraper
+        self.stats = SessionStats(session_id=session_id)
+
+    def get(self, url: str, **kwargs) -> Any:
+        """Issue a GET request through the underlying scraper"""
+        return self.scraper.get(url, **kwargs)
+
+
+class ScraperSessionPool:
+    """
+    Bounded pool of reusable cloudscraper sessions
+
+    Sessions keep their connections and solved challenge cookies between
+    requests. A session that receives a 403 or challenge page, raises a
+    network error, or falls below the success-rate floor is closed and
+    replaced by a fresh one on the next checkout.
+    """
+
+    DEFAULT_MAX_SESSIONS = 4
+    MIN_REQUESTS_FOR_HEALTH = 5
+    MIN_SUCCESS_RATE = 0.5
+    RETIRED_HISTORY = 50
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        scraper_factory: Callable[[], Any] = create_default_scraper
+    ):
+        """
+        Args:
+            max_sessions: Maximum number of sessions alive at once
+            scraper_factory: Callable returning a new requests-compatible session
+        """
+        self.max_sessions = max(1, max_sessions)
+        self.scraper_factory = scraper_factory
+        self._ids = itertools.count(1)
+        self._idle: deque = deque()
+        self._active: List[PooledSession] = []
+        self._retired: deque = deque(maxlen=self.RETIRED_HISTORY)
+        self._condition = threading.Condition()
+
+    def acquire(self) -> PooledSession:
+        """Check out an idle session, creating one if the pool has room"""
+        with self._condition:
+            while True:
+                if self._idle:
+                    return self._idle.popleft()
+                if len(self._active) < self.max_sessions:
+                    session = PooledSession(next(self._ids), None)
+                    self._active.append(session)
+                    break
+                self._condition.wait()
+
+        # Build the scraper outside the lock; it can be slow
+        try:
+            session.scraper = self.scraper_factory()
+        except Exception:
+            with self._condition:
+                self._active.remove(session)
+                self._condition.notify()
+            raise
+        return session
+
+    def release(self, session: PooledSession, success: bool, retire: bool = False) -> None:
+        """
+        Return a session to the pool, recording the outcome of its request
+
+        Args:
+            session: Session previously returned by acquire()
+            success: Whether the request produced usable content
+            retire: Close the session instead of reusing it (e.g. after a 403)
+        """
+        stats = session.stats
+        stats.requests += 1
+        if success:
+            stats.successes += 1
+        else:
+            stats.failures += 1
+
+        unhealthy = (
+            stats.requests >= self.MIN_REQUESTS_FOR_HEALTH
+            and stats.success_rate < self.MIN_SUCCESS_RATE
+        )
+
+        with self._condition:
+            if retire or unhealthy:
+                stats.retired = True
+                self._active.remove(session)
+                self._retired.append(stats)
+            else:
+                self._idle.append(session)
+            self._condition.notify()
+
+        if stats.retired:
+            self._close_scraper(session)
+
+    def _close_scraper(self, session: PooledSession) -> None:
+        """Close a scraper's connections, ignoring errors"""
+        try:
+            session.scraper.close()
+        except Exception:
+            pass
+
+    def stats(self) -> List[SessionStats]:
+        """Return per-session counters for live and recently retired sessions"""
+        with self._condition:
+            return [s.stats for s in self._active] + list(self._retired)
+
+    def close(self) -> None:
+        """Close and drop every idle session"""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            for session in idle:
+                self._active.remove(session)
+
+        for session in idle:
+            self._close_scraper(session)
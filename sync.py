@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Incremental sync for HITCON Vuls Crawler
+Fetches only the vulnerabilities disclosed since the previous run
+"""
+
+import argparse
+import os
+import sys
+from typing import Iterable, List, Optional, Set, Tuple
+
+from crawler import HITCONVulsCrawler, Vulnerability, export_vulnerabilities_to_file
+
+
+class KnownIdStore:
+    """Persisted set of ZD IDs that have already been exported"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.ids: Set[str] = set()
+        self.load()
+
+    def load(self) -> None:
+        """Load known IDs from disk (one ID per line)"""
+        self.ids = set()
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    self.ids.add(line)
+
+    def __contains__(self, zd_id: str) -> bool:
+        return zd_id in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add_all(self, zd_ids: Iterable[str]) -> None:
+        """Record new IDs, appending them to the store file"""
+        new_ids = [zd_id for zd_id in zd_ids if zd_id not in self.ids]
+        if not new_ids:
+            return
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(f'{zd_id}\n' for zd_id in new_ids))
+        self.ids.update(new_ids)
+
+
+def find_new_vulnerabilities(
+    crawler: HITCONVulsCrawler,
+    known: KnownIdStore,
+    max_pages: Optional[int] = None
+) -> Tuple[Optional[List[Vulnerability]], Optional[str]]:
+    """
+    Walk listing pages from page 1 until an already-known ID is reached
+
+    Args:
+        crawler: Crawler used to fetch listing pages
+        known: IDs that have been seen before
+        max_pages: Upper bound on pages to walk (None for no limit)
+
+    Returns:
+        Tuple of (new vulnerabilities in listing order, newest first, or
+        None if the walk stopped short of the known boundary; error message)
+    """
+    new_vulns: List[Vulnerability] = []
+    seen: Set[str] = set()
+    page_num = 1
+
+    while True:
+        if max_pages is not None and page_num > max_pages:
+            # Records past this point would be skipped by every later sync
+            return None, (f"No known ID within the first {max_pages} pages; "
+                          f"raise --max-pages to cover every new disclosure")
+
+        # Always hit the network: cached copies of page 1 are what we are diffing against
+        vulns, error = crawler.get_vulnerabilities_with_error(page_num, use_cache=False)
+        if error is not None:
+            return None, f"Page {page_num}: {error}"
+        if not vulns:
+            break
+
+        reached_known = False
+        for vul in vulns:
+            zd_id = vul.zd_id
+            if zd_id in known:
+                reached_known = True
+            elif zd_id not in seen:
+                # Entries can repeat across pages when new disclosures shift the listing
+                seen.add(zd_id)
+                new_vulns.append(vul)
+
+        if reached_known:
+            break
+        page_num += 1
+
+    return new_vulns, None
+
+
+def sync(
+    crawler: HITCONVulsCrawler,
+    known_ids_path: str,
+    output_path: str,
+    max_pages: Optional[int] = None
+) -> Tuple[Optional[List[Vulnerability]], Optional[str]]:
+    """
+    Append newly disclosed vulnerabilities to `output_path`
+
+    Nothing is written unless the walk reaches known territory (or the end
+    of the listing), so a failed run, or one cut short by `max_pages`,
+    never leaves a gap behind the known set.
+
+    Returns:
+        Tuple of (the vulnerabilities that were appended, or None on
+        failure; error message)
+    """
+    known = KnownIdStore(known_ids_path)
+    new_vulns, error = find_new_vulnerabilities(crawler, known, max_pages=max_pages)
+    if new_vulns is None:
+        return None, error
+
+    if new_vulns:
+        if not export_vulnerabilities_to_file(new_vulns, output_path, mode='a'):
+            return None, f"Could not write {output_path}"
+        known.add_all(vul.zd_id for vul in new_vulns)
+
+    return new_vulns, None
+
+
+def main() -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Append vulnerabilities disclosed since the last sync"
+    )
+    parser.add_argument('--known', default='known_ids.txt',
+                        help="File holding already-synced ZD IDs (default: known_ids.txt)")
+    parser.add_argument('--out', default='vuls.txt',
+                        help="Export file to append new entries to (default: vuls.txt)")
+    parser.add_argument('--max-pages', type=int, default=None,
+                        help="Give up (writing nothing) if no known ID is found within this many pages")
+    args = parser.parse_args()
+
+    crawler = HITCONVulsCrawler()
+    new_vulns, error = sync(crawler, args.known, args.out, max_pages=args.max_pages)
+
+    if new_vulns is None:
+        print(f"Sync failed: {error}", file=sys.stderr)
+        return 1
+
+    print(f"Synced {len(new_vulns)} new vulnerabilities")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for config loading and the merged-config cache
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_loader import ConfigLoader
+
+
+class ConfigLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+        class Loader(ConfigLoader):
+            DEFAULT_CONFIG_PATH = os.path.join(self.tmp.name, 'config.json')
+            USER_CONFIG_PATH = os.path.join(self.tmp.name, 'user.json')
+            CACHE_PATH = os.path.join(self.tmp.name, 'cache', 'config.merged.json')
+
+        self.Loader = Loader
+        self.write(Loader.DEFAULT_CONFIG_PATH, {'display': {'prefetch_depth': 1, 'show_details': True}})
+        self.write(Loader.USER_CONFIG_PATH, {'display': {'prefetch_depth': 3}})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, config):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+    def test_user_config_is_merged_and_cached(self):
+        config = self.Loader().get_display_settings()
+        self.assertEqual(config, {'prefetch_depth': 3, 'show_details': True})
+        self.assertTrue(os.path.exists(self.Loader.CACHE_PATH))
+        self.assertEqual(self.Loader().get_display_settings(), config)
+
+    def test_cache_is_used_while_files_are_unchanged(self):
+        self.Loader()
+        with open(self.Loader.CACHE_PATH, encoding='utf-8') as f:
+            cached = json.load(f)
+        cached['config']['display']['prefetch_depth'] = 7
+        self.write(self.Loader.CACHE_PATH, cached)
+        self.assertEqual(self.Loader().get_display_settings()['prefetch_depth'], 7)
+
+    def test_changed_file_invalidates_cache(self):
+        self.Loader()
+        self.write(self.Loader.USER_CONFIG_PATH, {'display': {'prefetch_depth': 12}})
+        self.assertEqual(self.Loader().get_display_settings()['prefetch_depth'], 12)
+
+    def test_save_invalidates_cache(self):
+        loader = self.Loader()
+        loader.save_user_config({'display': {'prefetch_depth': 0}})
+        self.assertFalse(os.path.exists(self.Loader.CACHE_PATH))
+        self.assertEqual(self.Loader().get_display_settings()['prefetch_depth'], 0)
+
+    def test_unreadable_user_config_is_not_cached(self):
+        with open(self.Loader.USER_CONFIG_PATH, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+        self.assertEqual(self.Loader().get_display_settings()['prefetch_depth'], 1)
+        self.assertFalse(os.path.exists(self.Loader.CACHE_PATH))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the crash-safe crawl journal
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cli import EXIT_OK, main
+from crawl_journal import CrawlJournal, default_journal_path
+from crawler import Vulnerability
+
+
+def page(page_num, count=2, title='journaled'):
+    return [
+        Vulnerability(url=f'/vulnerability/ZD-2024-{page_num:03d}{i:02d}', title=f'{title} {page_num}.{i}',
+                      date='2024/01/01')
+        for i in range(count)
+    ]
+
+
+class CrawlJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, 'vulns.jsonl')
+        self.path = default_journal_path(self.out)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_journal(self, pages, torn=''):
+        with CrawlJournal(self.path) as journal:
+            for page_num in pages:
+                journal.record(page_num, page(page_num))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(torn)
+
+    def test_load_round_trip(self):
+        self.write_journal([1, 2])
+        pages = CrawlJournal(self.path).load()
+        self.assertEqual(sorted(pages), [1, 2])
+        self.assertEqual([(v.url, v.title, v.date) for v in pages[2]],
+                         [(v.url, v.title, v.date) for v in page(2)])
+
+    def test_torn_last_line_is_dropped(self):
+        self.write_journal([1, 2], torn='{"page": 3, "records": [["/vulnerability/ZD-20')
+        size = os.path.getsize(self.path)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            pages = CrawlJournal(self.path).load()
+        self.assertEqual(sorted(pages), [1, 2])
+        self.assertLess(os.path.getsize(self.path), size)
+
+        # New entries start on a clean line
+        with CrawlJournal(self.path) as journal:
+            journal.record(3, page(3))
+        self.assertEqual(sorted(CrawlJournal(self.path).load()), [1, 2, 3])
+
+    def test_complete_but_invalid_last_line_is_dropped(self):
+        self.write_journal([1], torn='{"page": 2}\n')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(list(CrawlJournal(self.path).load()), [1])
+
+    def test_torn_header_starts_a_new_journal(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"journal": "hitcon-')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(len(CrawlJournal(self.path).load()), 0)
+        with CrawlJournal(self.path) as journal:
+            journal.record(1, page(1))
+        self.assertEqual(list(CrawlJournal(self.path).load()), [1])
+
+    def test_other_file_is_rejected(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('not a journal\n')
+        with self.assertRaises(ValueError):
+            CrawlJournal(self.path).load()
+
+    def test_crawl_resumes_after_torn_line(self):
+        # Page 1 finished; the crash tore the entry for page 2
+        self.write_journal([1], torn='{"page": 2, "rec')
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), contextlib.redirect_stdout(io.StringIO()):
+            status = main(['crawl', '--pages', '1-3', '--out', self.out, '--rate', '0',
+                           '--transport', 'synthetic', '--replay-pages', '3'])
+        self.assertEqual(status, EXIT_OK)
+        self.assertIn('1 pages already crawled', stderr.getvalue())
+
+        with open(self.out, encoding='utf-8') as f:
+            titles = [json.loads(line)['title'] for line in f]
+        # Page 1 comes from the journal, pages 2 and 3 are fetched again
+        self.assertEqual(titles[:2], ['journaled 1.0', 'journaled 1.1'])
+        self.assertGreater(len(titles), 2)
+        self.assertFalse(any(title.startswith('journaled') for title in titles[2:]))
+        # A complete crawl leaves nothing to resume
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming exporter
+"""
+
+import csv
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import Vulnerability, export_vulnerabilities_to_file
+from exporter import VulnerabilityExporter
+
+RECORDS = [
+    Vulnerability(url='/vulnerability/ZD-2024-00002', title='某系統, "SQL" Injection 漏洞',
+                  date='2024/05/02', vendor='某公司', status='已公開'),
+    Vulnerability(url='/vulnerability/ZD-2024-00001', title='Stored XSS'),
+]
+URL = 'https://zeroday.hitcon.org/vulnerability/ZD-2024-{:05d}'
+
+
+class ExporterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def export(self, name, records=RECORDS, **kwargs):
+        path = os.path.join(self.tmp.name, name)
+        self.assertTrue(export_vulnerabilities_to_file(records, path, **kwargs))
+        return path
+
+    def read(self, path):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def test_text(self):
+        path = self.export('vulns.txt')
+        self.assertEqual(self.read(path), (
+            f'{URL.format(2)} 某系統, "SQL" Injection 漏洞\n'
+            f'{URL.format(1)} Stored XSS\n'
+        ))
+
+    def test_jsonl(self):
+        path = self.export('vulns.jsonl')
+        rows = [json.loads(line) for line in self.read(path).splitlines()]
+        self.assertEqual(rows[0], {
+            'zd_id': 'ZD-2024-00002', 'url': URL.format(2), 'title': '某系統, "SQL" Injection 漏洞',
+            'date': '2024/05/02', 'vendor': '某公司', 'status': '已公開',
+        })
+        self.assertEqual((rows[1]['zd_id'], rows[1]['date'], rows[1]['vendor']), ('ZD-2024-00001', None, None))
+
+    def test_csv_and_tsv(self):
+        for format, delimiter in (('csv', ','), ('tsv', '\t')):
+            path = self.export(f'vulns.{format}')
+            rows = list(csv.reader(self.read(path).splitlines(), delimiter=delimiter))
+            self.assertEqual(rows, [
+                ['zd_id', 'url', 'title', 'date', 'vendor', 'status'],
+                ['ZD-2024-00002', URL.format(2), '某系統, "SQL" Injection 漏洞', '2024/05/02', '某公司', '已公開'],
+                ['ZD-2024-00001', URL.format(1), 'Stored XSS', '', '', ''],
+            ])
+
+    def test_format_overrides_extension(self):
+        path = self.export('vulns.txt', format='jsonl')
+        self.assertEqual(json.loads(self.read(path).splitlines()[0])['zd_id'], 'ZD-2024-00002')
+
+    def test_gzip_append(self):
+        path = self.export('vulns.csv.gz', RECORDS[:1])
+        self.export('vulns.csv.gz', RECORDS[1:], mode='a')
+        lines = self.read(path).splitlines()
+        # One header, then both records
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('zd_id,'))
+        self.assertTrue(lines[2].startswith('ZD-2024-00001,'))
+
+    def test_duplicates_kept_by_default(self):
+        path = self.export('vulns.jsonl', RECORDS + RECORDS[:1])
+        self.assertEqual(len(self.read(path).splitlines()), 3)
+
+    def test_dedupe(self):
+        path = os.path.join(self.tmp.name, 'vulns.jsonl')
+        with VulnerabilityExporter(path, dedupe=True) as exporter:
+            exporter.write_all(RECORDS + RECORDS[:1])
+        self.assertEqual((exporter.written, exporter.skipped), (2, 1))
+
+    def test_dedupe_on_append_reads_existing_ids(self):
+        path = self.export('vulns.txt.gz', RECORDS[:1])
+        with VulnerabilityExporter(path, mode='a', dedupe=True) as exporter:
+            exporter.write_all(RECORDS)
+        self.assertEqual((exporter.written, exporter.skipped), (1, 1))
+        self.assertEqual(len(self.read(path).splitlines()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
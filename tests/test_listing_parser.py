@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming disclosed-listing parser
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import ListingStreamParser
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'benchmarks' / 'fixtures' / 'listing_page.html'
+
+TITLE = '<h4 class="title tx-overflow-ellipsis"><a href="/vulnerability/{id}">{title}</a></h4>'
+
+CARD = (
+    '<li class="strip">' + TITLE + '<div class="info">'
+    '<span class="date">{date}</span><span class="vendor">{vendor}</span>'
+    '<span class="status">已公開</span></div></li>\n'
+)
+
+# Card listing laid out like the disclosed pages
+CARD_PAGE = '<ul class="vulnerability-list">\n' + ''.join(
+    CARD.format(id=f'ZD-2024-{i:05d}', title=f'某系統 SQL Injection 漏洞 #{i}',
+                date=f'2024/03/{i:02d}', vendor=f'廠商{i}')
+    for i in range(1, 13)
+) + '</ul>\n<ul class="pagination"><li><a href="/page/2">2</a></li></ul>'
+
+# Listing laid out as a table with the date column in front of the title
+TABLE_PAGE = (
+    '<table><tbody>'
+    '<tr><td class="date">2024/01/01</td><td>' + TITLE.format(id='ZD-1', title='A') + '</td>'
+    '<td class="vendor">V1</td></tr>'
+    '<tr><td class="date">2024/02/02</td><td>' + TITLE.format(id='ZD-2', title='B') + '</td>'
+    '<td class="vendor">V2</td></tr>'
+    '</tbody></table>'
+)
+
+
+def parse(html, chunk_size=None):
+    """Run the parser over `html`, fed whole or in `chunk_size` pieces"""
+    parser = ListingStreamParser()
+    records = []
+    if chunk_size is None:
+        records.extend(parser.feed(html))
+    else:
+        for i in range(0, len(html), chunk_size):
+            records.extend(parser.feed(html[i:i + chunk_size]))
+    records.extend(parser.close())
+    return [(r.title, r.date, r.vendor, r.status) for r in records]
+
+
+class ListingStreamParserTest(unittest.TestCase):
+    def test_card_listing(self):
+        records = parse(CARD_PAGE)
+        self.assertEqual(len(records), 12)
+        self.assertEqual(records[0], ('某系統 SQL Injection 漏洞 #1', '2024/03/01', '廠商1', '已公開'))
+        self.assertEqual(records[-1], ('某系統 SQL Injection 漏洞 #12', '2024/03/12', '廠商12', '已公開'))
+
+    def test_fixture_listing(self):
+        records = parse(FIXTURE.read_text(encoding='utf-8'))
+        self.assertEqual(len(records), 20)
+        self.assertEqual(records[0], ('某科技公司 Stored XSS 漏洞', '2024/07/21', '某科技公司', '已公開'))
+        self.assertTrue(all(r[1] and r[2] and r[3] for r in records))
+
+    def test_fields_before_title(self):
+        expected = [('A', '2024/01/01', 'V1', None), ('B', '2024/02/02', 'V2', None)]
+        self.assertEqual(parse(TABLE_PAGE), expected)
+
+    def test_chunked_feed_matches_whole(self):
+        for html in (CARD_PAGE, TABLE_PAGE, FIXTURE.read_text(encoding='utf-8')):
+            whole = parse(html)
+            for chunk_size in (1, 7, 64, 1000):
+                self.assertEqual(parse(html, chunk_size), whole)
+
+    def test_records_without_container(self):
+        html = (
+            TITLE.format(id='ZD-1', title='A') + '<span class="date">2024/01/01</span>'
+            + TITLE.format(id='ZD-2', title='B') + '<span class="vendor">V2</span>'
+        )
+        self.assertEqual(parse(html), [('A', '2024/01/01', None, None), ('B', None, 'V2', None)])
+
+    def test_nested_container_stays_in_record(self):
+        html = (
+            '<ul>'
+            '<li>' + TITLE.format(id='ZD-1', title='A')
+            + '<ul><li class="vendor">V1</li></ul><span class="date">2024/01/01</span></li>'
+            '<li><span class="date">2024/02/02</span>' + TITLE.format(id='ZD-2', title='B') + '</li>'
+            '</ul>'
+        )
+        self.assertEqual(parse(html), [('A', '2024/01/01', 'V1', None), ('B', '2024/02/02', None, None)])
+
+    def test_bytes_split_inside_character(self):
+        data = CARD_PAGE.encode('utf-8')
+        parser = ListingStreamParser()
+        records = []
+        for i in range(0, len(data), 5):
+            records.extend(parser.feed(data[i:i + 5]))
+        records.extend(parser.close())
+        self.assertEqual([(r.title, r.date, r.vendor, r.status) for r in records], parse(CARD_PAGE))
+
+
+if __name__ == '__main__':
+    unittest.main()
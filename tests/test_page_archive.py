@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the raw-page archive
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from page_archive import INDEX_RECORD, PageArchive
+
+URL = 'https://zeroday.hitcon.org/vulnerability/disclosed/page/{page}'
+
+
+class PageArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'pages.hva')
+        with PageArchive(self.path) as archive:
+            for page in (1, 2, 3):
+                archive.append(URL.format(page=page), page, f'<html>page {page} 漏洞</html>',
+                               fetched_at=1000.0 + page)
+            archive.sync()
+        self.data_size = os.path.getsize(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def truncate_last_frame(self):
+        # Cut the last frame short, as a crash partway through its write would
+        with open(self.path, 'r+b') as f:
+            f.truncate(self.data_size - 5)
+
+    def test_read_back(self):
+        with PageArchive(self.path, readonly=True) as archive:
+            self.assertEqual(len(archive), 3)
+            page = archive.get(URL.format(page=2))
+            self.assertEqual((page.page_num, page.fetched_at, page.body), (2, 1002.0, '<html>page 2 漏洞</html>'))
+            self.assertEqual(archive.listing_pages(URL), [(p, URL.format(page=p)) for p in (1, 2, 3)])
+
+    def test_truncated_last_frame_read_only(self):
+        self.truncate_last_frame()
+        with PageArchive(self.path, readonly=True) as archive:
+            self.assertEqual(len(archive), 2)
+            self.assertEqual(archive.get(URL.format(page=2)).body, '<html>page 2 漏洞</html>')
+            self.assertIsNone(archive.get(URL.format(page=3)))
+        # Read-only opens never repair the files
+        self.assertEqual(os.path.getsize(self.path), self.data_size - 5)
+
+    def test_truncated_last_frame_is_cut_off_and_appended_after(self):
+        self.truncate_last_frame()
+        with PageArchive(self.path) as archive:
+            self.assertEqual(len(archive), 2)
+            archive.append(URL.format(page=3), 3, '<html>page 3 again</html>', fetched_at=2000.0)
+
+        with PageArchive(self.path, readonly=True) as archive:
+            self.assertEqual(len(archive), 3)
+            self.assertEqual(archive.get(URL.format(page=1)).body, '<html>page 1 漏洞</html>')
+            self.assertEqual(archive.get(URL.format(page=3)).body, '<html>page 3 again</html>')
+
+    def test_frame_without_index_record_is_indexed(self):
+        # Crash after the frame was written but before its index record
+        index_path = self.path + PageArchive.INDEX_SUFFIX
+        with open(index_path, 'r+b') as f:
+            f.truncate(2 * INDEX_RECORD.size)
+
+        with PageArchive(self.path) as archive:
+            self.assertEqual(archive.get(URL.format(page=3)).body, '<html>page 3 漏洞</html>')
+        self.assertEqual(os.path.getsize(index_path), 3 * INDEX_RECORD.size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory listing page cache
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import Vulnerability
+from page_cache import LRUPageCache
+
+
+def page(*ids):
+    """Records for a listing page holding the given vulnerability IDs"""
+    return [Vulnerability(url=f'/vulnerability/{zd_id}', title=zd_id) for zd_id in ids]
+
+
+class LRUPageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUPageCache()
+        self.cache.put(1, page('ZD-4', 'ZD-3'), html='<html>page 1</html>')
+        self.cache.put(2, page('ZD-2', 'ZD-1'), html='<html>page 2</html>')
+
+    def test_shift_moves_records_and_drops_html(self):
+        self.assertEqual(self.cache.put(1, page('ZD-5', 'ZD-4')), 1)
+        self.assertEqual([v.zd_id for v in self.cache.get_vulnerabilities(2)], ['ZD-3', 'ZD-2'])
+        self.assertIsNone(self.cache.get_html(2))
+
+    def test_reset_drops_html(self):
+        # Reordered records cannot be lined up with the cache, which starts over
+        self.cache.put(1, page('ZD-3', 'ZD-4'))
+        self.assertIsNone(self.cache.get_vulnerabilities(2))
+        self.assertIsNone(self.cache.get_html(2))
+        self.assertNotIn(2, self.cache)
+
+    def test_page_size_change_drops_html(self):
+        self.cache.put(1, page('ZD-6', 'ZD-5', 'ZD-4'))
+        self.assertIsNone(self.cache.get_html(2))
+        self.assertNotIn(2, self.cache)
+
+    def test_refetch_after_shift_keeps_other_popped_pages_stale(self):
+        cache = LRUPageCache()
+        for page_num, ids in enumerate((('ZD-6', 'ZD-5'), ('ZD-4', 'ZD-3'), ('ZD-2', 'ZD-1')), 1):
+            cache.put(page_num, page(*ids))
+        cache.pop(2)
+        cache.pop(3)
+        # One new record pushed everything down; only page 2 is fetched again
+        self.assertEqual(cache.put(2, page('ZD-5', 'ZD-4')), 1)
+        self.assertEqual([v.zd_id for v in cache.get_vulnerabilities(2)], ['ZD-5', 'ZD-4'])
+        # Page 3 (now ZD-3, ZD-2) was popped and has not been refetched yet
+        self.assertIsNone(cache.get_vulnerabilities(3))
+
+        cache.put(3, page('ZD-3', 'ZD-2'))
+        self.assertEqual([v.zd_id for v in cache.get_vulnerabilities(3)], ['ZD-3', 'ZD-2'])
+
+if __name__ == '__main__':
+    unittest.main()
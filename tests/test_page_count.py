@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for page count discovery
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import HITCONVulsCrawler
+from transport import ReplayTransport, SyntheticTransport
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / 'benchmarks' / 'fixtures'
+
+
+def page_count(transport):
+    crawler = HITCONVulsCrawler(transport=transport, max_requests_per_second=0)
+    try:
+        return crawler.get_page_count(), crawler.last_error
+    finally:
+        crawler.session_pool.close()
+
+
+class PageCountTest(unittest.TestCase):
+    def test_pagination_links_past_the_end(self):
+        # The fixture's pagination links up to page 60
+        for served in (1, 3, 53, 59):
+            self.assertEqual(page_count(ReplayTransport(str(FIXTURES_DIR), page_count=served)),
+                             (served, None))
+
+    def test_pages_past_the_last_link(self):
+        for served in (60, 61, 100):
+            self.assertEqual(page_count(ReplayTransport(str(FIXTURES_DIR), page_count=served)),
+                             (served, None))
+
+    def test_synthetic_listing(self):
+        for served in (1, 7, 100):
+            self.assertEqual(page_count(SyntheticTransport(page_count=served)), (served, None))
+
+    def test_demo_data(self):
+        crawler = HITCONVulsCrawler(use_demo_data=True)
+        self.assertEqual(crawler.get_page_count(), HITCONVulsCrawler.DEMO_PAGE_COUNT)
+        self.assertTrue(crawler.get_vulnerabilities(HITCONVulsCrawler.DEMO_PAGE_COUNT))
+        self.assertEqual(crawler.get_vulnerabilities(HITCONVulsCrawler.DEMO_PAGE_COUNT + 1), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for retries and the adaptive concurrency controller
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import HITCONVulsCrawler
+from rate_control import RetryPolicy
+from session_pool import ScraperSessionPool
+from transport import TransportResponse
+
+
+class StatusSession:
+    """Session answering every request with the same status and headers"""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        return TransportResponse(self.status_code, headers=self.headers)
+
+    def close(self):
+        pass
+
+
+def crawler_for(session, max_retries=0):
+    return HITCONVulsCrawler(
+        max_requests_per_second=0,
+        session_pool=ScraperSessionPool(max_sessions=1, scraper_factory=lambda: session),
+        retry_policy=RetryPolicy(max_retries=max_retries, base_delay=0.0)
+    )
+
+
+class RateControlTest(unittest.TestCase):
+    def test_retry_after_pause_is_capped(self):
+        crawler = crawler_for(StatusSession(429, {'Retry-After': '3600'}))
+        self.assertIsNone(crawler.fetch_page(1, use_cache=False))
+        self.assertEqual(crawler.last_error, 'HTTP 429')
+        paused_for = crawler.concurrency.stats().paused_for
+        self.assertGreater(paused_for, 0)
+        self.assertLessEqual(paused_for, crawler.retry_policy.max_retry_after)
+
+    def test_stats_report_the_pause(self):
+        crawler = crawler_for(StatusSession(429, {'Retry-After': '60'}))
+        crawler.fetch_page(1, use_cache=False)
+        stats = crawler.stats()
+        self.assertGreater(stats['paused_for'], 0)
+        self.assertEqual(stats['concurrency_decreases'], 1)
+        self.assertIn('hitcon_crawler_rate_limit_pause_seconds', crawler.prometheus_text())
+
+    def test_far_future_retry_after_date_is_capped(self):
+        crawler = crawler_for(StatusSession(503, {'Retry-After': 'Fri, 31 Dec 2100 23:59:59 GMT'}))
+        crawler.fetch_page(1, use_cache=False)
+        self.assertLessEqual(crawler.concurrency.stats().paused_for,
+                             crawler.retry_policy.max_retry_after)
+
+    def test_forbidden_is_not_retried(self):
+        session = StatusSession(403)
+        crawler = crawler_for(session, max_retries=3)
+        self.assertIsNone(crawler.fetch_page(1, use_cache=False))
+        self.assertEqual(crawler.last_error, 'HTTP 403')
+        self.assertEqual(session.requests, 1)
+
+    def test_server_error_is_retried(self):
+        session = StatusSession(502)
+        crawler = crawler_for(session, max_retries=2)
+        crawler.fetch_page(1, use_cache=False)
+        self.assertEqual(session.requests, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
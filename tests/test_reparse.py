@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel re-parse
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import HITCONVulsCrawler
+from page_archive import PageArchive
+from page_cache import DiskPageCache
+from reparse import ParallelReparser
+from transport import SyntheticTransport
+
+PAGES = 25
+PER_PAGE = 4
+
+
+class ParallelReparserTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        transport = SyntheticTransport(page_count=PAGES, per_page=PER_PAGE)
+        cls.cache_path = os.path.join(cls.tmp.name, 'pages.db')
+        cls.archive_path = os.path.join(cls.tmp.name, 'pages.hva')
+        cache = DiskPageCache(path=cls.cache_path)
+        with PageArchive(cls.archive_path) as archive:
+            # Stored out of order, as concurrent crawls leave them
+            for page in sorted(range(1, PAGES + 1), key=lambda p: (p * 7) % PAGES):
+                url = HITCONVulsCrawler.BASE_URL.format(page=page)
+                body = transport.body_for(url).decode('utf-8')
+                cache.put(url, page, body)
+                archive.append(url, page, body)
+        cls.refs = cache.listing_pages(HITCONVulsCrawler.BASE_URL)
+        cache.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def reparse(self, workers, **kwargs):
+        reparser = ParallelReparser(self.cache_path, workers=workers, chunk_pages=3, **kwargs)
+        return list(reparser.run(self.refs)), reparser
+
+    def test_pages_come_back_in_page_order(self):
+        pages, reparser = self.reparse(workers=4)
+        self.assertEqual([page.page_num for page in pages], list(range(1, PAGES + 1)))
+        # Record IDs count down across the whole listing
+        serials = [int(v.zd_id.rsplit('-', 1)[1]) for page in pages for v in page.records]
+        self.assertEqual(serials, list(range(PAGES * PER_PAGE, 0, -1)))
+        self.assertEqual(sum(stats.pages for stats in reparser.stats.values()), PAGES)
+
+    def test_workers_match_single_process(self):
+        single, _ = self.reparse(workers=1, format='jsonl')
+        parallel, _ = self.reparse(workers=3, format='jsonl')
+        self.assertEqual([page.lines for page in parallel], [page.lines for page in single])
+        self.assertEqual(len(single[0].lines), PER_PAGE)
+
+    def test_archive_in_page_order(self):
+        reparser = ParallelReparser(self.archive_path, workers=2, chunk_pages=4, from_archive=True,
+                                    keep_records=False, format='text')
+        with PageArchive(self.archive_path, readonly=True) as archive:
+            refs = archive.listing_pages(HITCONVulsCrawler.BASE_URL)
+        pages = list(reparser.run(refs))
+        self.assertEqual([page.page_num for page in pages], list(range(1, PAGES + 1)))
+        self.assertEqual(pages[0].records, [])
+
+    def test_missing_page_is_skipped(self):
+        refs = self.refs[:2] + [(PAGES + 1, HITCONVulsCrawler.BASE_URL.format(page=PAGES + 1))] + self.refs[2:4]
+        reparser = ParallelReparser(self.cache_path, workers=2, chunk_pages=2)
+        self.assertEqual([page.page_num for page in reparser.run(refs)], [1, 2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the local title search index
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import Vulnerability
+from search_index import SearchIndex, tokenize
+
+
+def vul(serial, title):
+    return Vulnerability(url=f'/vulnerability/ZD-2024-{serial:05d}', title=title)
+
+
+class TokenizeTest(unittest.TestCase):
+    def test_latin_words(self):
+        self.assertEqual(tokenize('Stored XSS in WordPress-Plugin v1.2.3'),
+                         ['stored', 'xss', 'in', 'wordpress-plugin', 'v1.2.3'])
+
+    def test_cjk_bigrams(self):
+        self.assertEqual(tokenize('SQL注入漏洞'), ['sql', '注入', '入漏', '漏洞'])
+
+    def test_lone_cjk_character(self):
+        self.assertEqual(tokenize('洞'), ['洞'])
+
+    def test_unigrams(self):
+        self.assertEqual(tokenize('某系統 注入', unigrams=True),
+                         ['某系', '系統', '某', '系', '統', '注入', '注', '入'])
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex(path=None)
+        self.index.add_all([
+            vul(1, '某大學 SQL注入漏洞'),
+            vul(2, '某公司 Stored XSS 漏洞'),
+            vul(3, '某銀行 SQL注入'),
+            vul(4, '某公司網站存在嚴重的 SQL 盲注攻擊可取得完整資料庫內容'),
+        ])
+
+    def ids(self, query):
+        return [hit.zd_id for hit in self.index.search(query)]
+
+    def test_single_character_query(self):
+        self.assertEqual(sorted(self.ids('洞')), ['ZD-2024-00001', 'ZD-2024-00002'])
+        self.assertEqual(self.ids('銀'), ['ZD-2024-00003'])
+
+    def test_bigram_query_does_not_match_scattered_characters(self):
+        # ZD-2024-00004 has 注 but not 注入
+        self.assertEqual(sorted(self.ids('注入')), ['ZD-2024-00001', 'ZD-2024-00003'])
+
+    def test_more_matched_terms_rank_first(self):
+        self.assertEqual(self.ids('sql 注入 漏洞')[0], 'ZD-2024-00001')
+
+    def test_shorter_title_ranks_first_on_equal_matches(self):
+        self.assertEqual(self.ids('sql'), ['ZD-2024-00003', 'ZD-2024-00001', 'ZD-2024-00004'])
+
+    def test_reindexed_title_replaces_old_terms(self):
+        self.index.add_all([vul(2, '某公司 CSRF')])
+        self.assertEqual(self.ids('洞'), ['ZD-2024-00001'])
+        self.assertEqual(self.ids('csrf'), ['ZD-2024-00002'])
+
+    def test_saved_index_answers_single_character_queries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'search_index.json')
+            index = SearchIndex(path=path)
+            index.add_all([vul(1, '某大學 SQL注入漏洞')])
+            index.save()
+            self.assertEqual([hit.zd_id for hit in SearchIndex(path=path).search('洞')],
+                             ['ZD-2024-00001'])
+
+
+if __name__ == '__main__':
+    unittest.main()
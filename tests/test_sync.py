@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental sync
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import HITCONVulsCrawler
+from sync import KnownIdStore, sync
+from transport import SyntheticTransport
+
+
+def make_crawler(page_count=3):
+    # Four records per page, ZD-2024-00012 at the top of page 1 down to ZD-2024-00001
+    return HITCONVulsCrawler(transport=SyntheticTransport(page_count=page_count, per_page=4),
+                             max_requests_per_second=0)
+
+
+class SyncTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.known_path = os.path.join(self.tmp.name, 'known_ids.txt')
+        self.out_path = os.path.join(self.tmp.name, 'vuls.txt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_known(self, *zd_ids):
+        with open(self.known_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(f'{zd_id}\n' for zd_id in zd_ids))
+
+    def test_stops_at_first_known_id(self):
+        self.write_known('ZD-2024-00006')
+        new_vulns, error = sync(make_crawler(), self.known_path, self.out_path)
+        self.assertIsNone(error)
+        self.assertEqual([v.zd_id for v in new_vulns],
+                         ['ZD-2024-00012', 'ZD-2024-00011', 'ZD-2024-00010', 'ZD-2024-00009',
+                          'ZD-2024-00008', 'ZD-2024-00007', 'ZD-2024-00005'])
+        self.assertIn('ZD-2024-00007', KnownIdStore(self.known_path))
+
+    def test_first_sync_walks_to_the_end(self):
+        new_vulns, error = sync(make_crawler(), self.known_path, self.out_path)
+        self.assertIsNone(error)
+        self.assertEqual(len(new_vulns), 12)
+
+    def test_max_pages_before_known_id_writes_nothing(self):
+        self.write_known('ZD-2024-00002')
+        new_vulns, error = sync(make_crawler(), self.known_path, self.out_path, max_pages=2)
+        self.assertIsNone(new_vulns)
+        self.assertIn('--max-pages', error)
+        self.assertFalse(os.path.exists(self.out_path))
+        self.assertEqual(KnownIdStore(self.known_path).ids, {'ZD-2024-00002'})
+
+        # A later run with enough pages still picks up every new record
+        new_vulns, error = sync(make_crawler(), self.known_path, self.out_path, max_pages=3)
+        self.assertIsNone(error)
+        self.assertEqual(len(new_vulns), 11)
+
+    def test_known_id_within_max_pages(self):
+        self.write_known('ZD-2024-00009')
+        new_vulns, error = sync(make_crawler(), self.known_path, self.out_path, max_pages=1)
+        self.assertIsNone(error)
+        self.assertEqual(len(new_vulns), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
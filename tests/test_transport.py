@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline transports
+"""
+
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transport import OfflineTransport, ReplayTransport, Transport
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / 'benchmarks' / 'fixtures'
+LISTING_URL = 'https://zeroday.hitcon.org/vulnerability/disclosed/page/{page}'
+
+
+class TransportTest(unittest.TestCase):
+    def test_base_classes_are_abstract(self):
+        with self.assertRaises(TypeError):
+            Transport()
+        with self.assertRaises(TypeError):
+            OfflineTransport()
+
+    def test_replay_from_many_sessions(self):
+        transport = ReplayTransport(str(FIXTURES_DIR), page_count=8)
+        urls = [LISTING_URL.format(page=page) for page in range(1, 10)] * 20
+
+        def fetch(url):
+            return transport.create_session().get(url).content
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            bodies = list(pool.map(fetch, urls))
+
+        for url, body in zip(urls, bodies):
+            # Every session sees the same body for a page
+            self.assertIs(body, transport.body_for(url))
+        self.assertEqual(transport.requests, len(urls))
+        self.assertEqual(len(transport._bodies), 9)
+
+    def test_replay_conditional_request(self):
+        transport = ReplayTransport(str(FIXTURES_DIR))
+        session = transport.create_session()
+        response = session.get(LISTING_URL.format(page=1))
+        self.assertEqual(response.status_code, 200)
+        again = session.get(LISTING_URL.format(page=1),
+                            headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(again.status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for watch mode
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import HITCONVulsCrawler, Vulnerability
+from page_cache import DiskPageCache
+from transport import SyntheticTransport
+from watch import DisclosureWatcher
+
+
+def zd(serial):
+    return f'ZD-2024-{serial:05d}'
+
+
+class ListingCrawler:
+    """Crawler stand-in serving a listing the test can change between requests"""
+
+    def __init__(self, serials, per_page=4):
+        self.serials = list(serials)
+        self.per_page = per_page
+        self.before_fetch = None
+
+    def _page(self, page_num):
+        start = (page_num - 1) * self.per_page
+        return [Vulnerability(url=f'/vulnerability/{zd(s)}', title=zd(s))
+                for s in self.serials[start:start + self.per_page]]
+
+    def poll_page(self, page_num=1, if_changed=True):
+        return self._page(page_num), None
+
+    def get_vulnerabilities_with_error(self, page_num, use_cache=True):
+        if self.before_fetch is not None:
+            self.before_fetch()
+        return self._page(page_num), None
+
+
+class DisclosureWatcherTest(unittest.TestCase):
+    def test_new_records_push_entries_onto_page_2(self):
+        crawler = ListingCrawler(range(12, 0, -1))
+        watcher = DisclosureWatcher(crawler)
+        self.assertEqual(watcher.poll(), ([], None))
+
+        # Two disclosures push 10 and 9 onto page 2; page 1 still holds known IDs
+        crawler.serials[:0] = [14, 13]
+        new_vulns, error = watcher.poll()
+        self.assertIsNone(error)
+        self.assertEqual([v.zd_id for v in new_vulns], [zd(13), zd(14)])
+
+    def test_entirely_new_page_1_walks_page_2(self):
+        crawler = ListingCrawler(range(12, 0, -1))
+        watcher = DisclosureWatcher(crawler)
+        watcher.poll()
+
+        crawler.serials[:0] = [18, 17, 16, 15, 14, 13]
+        new_vulns, _ = watcher.poll()
+        self.assertEqual([v.zd_id for v in new_vulns], [zd(s) for s in range(13, 19)])
+        self.assertEqual(watcher.poll()[0], [])
+
+    def test_shift_while_walking_does_not_repeat(self):
+        crawler = ListingCrawler(range(12, 0, -1))
+        watcher = DisclosureWatcher(crawler)
+        watcher.poll()
+
+        crawler.serials[:0] = [18, 17, 16, 15, 14, 13]
+
+        def disclose_one_more():
+            # Pushes 15 from page 1 onto page 2 before it is read
+            crawler.serials.insert(0, 19)
+            crawler.before_fetch = None
+
+        crawler.before_fetch = disclose_one_more
+        new_vulns, _ = watcher.poll()
+        # 19 arrived after page 1 was read and is reported by the next poll
+        self.assertEqual([v.zd_id for v in new_vulns], [zd(s) for s in range(13, 19)])
+        self.assertEqual([v.zd_id for v in watcher.poll()[0]], [zd(19)])
+
+    def test_walk_stops_at_max_pages(self):
+        crawler = ListingCrawler(range(12, 0, -1))
+        watcher = DisclosureWatcher(crawler, max_pages=2)
+        watcher.poll()
+
+        crawler.serials[:0] = range(24, 12, -1)
+        new_vulns, _ = watcher.poll()
+        self.assertEqual([v.zd_id for v in new_vulns], [zd(s) for s in range(17, 25)])
+
+    def test_synthetic_listing_through_crawler(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            transport = SyntheticTransport(page_count=3, per_page=4)
+            crawler = HITCONVulsCrawler(transport=transport, max_requests_per_second=0,
+                                        disk_cache=DiskPageCache(path=os.path.join(tmp, 'pages.db')))
+            watcher = DisclosureWatcher(crawler)
+            self.assertEqual(watcher.poll(), ([], None))
+            # Unchanged listing: a 304, nothing new
+            self.assertEqual(watcher.poll(), ([], None))
+
+            # A full page of disclosures moves the old page 1 onto page 2
+            transport.page_count = 4
+            new_vulns, error = watcher.poll()
+            self.assertIsNone(error)
+            self.assertEqual([v.zd_id for v in new_vulns], [zd(s) for s in range(13, 17)])
+            crawler.disk_cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
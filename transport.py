@@ -0,0 +1,453 @@
+"""
+Transports for HITCON Vuls Crawler
+Where HTTP responses come from: the live site through cloudscraper, a replay
+of recorded pages, or a synthetic generator. Offline transports run the
+same fetch, cache and parse path as live crawls, with no network.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from html import escape
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from page_archive import PageArchive
+from session_pool import create_default_scraper
+
+TRANSPORTS = ('live', 'replay', 'synthetic')
+
+LISTING_PATH_PATTERN = re.compile(r'/vulnerability/disclosed/page/(\d+)/?$')
+DETAIL_PATH_PATTERN = re.compile(r'/vulnerability/(ZD-(\d{4})-(\d+))/?$')
+FIXTURE_ID_PATTERN = re.compile(rb'ZD-(\d{4})-(\d+)')
+# Added to fixture IDs per page from the end, so every page lists its own records
+PAGE_ID_STRIDE = 1000
+EMPTY_LISTING = b"<html><body><ul class=\"vulnerability-list\"></ul></body></html>"
+
+# Recorded latencies: JSON object of URL path -> seconds
+LATENCIES_FILE = "latencies.json"
+LATENCIES_SUFFIX = ".latencies.json"
+
+
+def load_fixtures(fixtures_dir: str) -> List[bytes]:
+    """Load every recorded listing page (*.html) in a directory, in name order"""
+    paths = sorted(glob.glob(os.path.join(fixtures_dir, "*.html")))
+    if not paths:
+        raise FileNotFoundError(f"No listing fixtures in {fixtures_dir}")
+
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def fixture_page(fixtures: List[bytes], page_num: int, page_count: int) -> bytes:
+    """
+    Body of listing page `page_num` built from a rotation of fixtures
+
+    Fixtures are reused in order, with ZD IDs renumbered per page so pages
+    never share records (newest on page 1, like the real listing). Pages
+    outside 1..page_count are empty, like the site past its last page.
+    """
+    if page_num < 1 or page_num > page_count:
+        return EMPTY_LISTING
+    fixture = fixtures[(page_num - 1) % len(fixtures)]
+    shift = (page_count - page_num) * PAGE_ID_STRIDE
+    return FIXTURE_ID_PATTERN.sub(
+        lambda m: b'ZD-%s-%05d' % (m.group(1), int(m.group(2)) + shift), fixture
+    )
+
+
+def load_latencies(path: str) -> Dict[str, float]:
+    """Read recorded latencies, or an empty dict if there are none"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {str(k): float(v) for k, v in json.load(f).items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Warning: Could not read recorded latencies {path}: {e}")
+        return {}
+
+
+class TransportResponse:
+    """The parts of requests.Response the crawler uses"""
+
+    def __init__(self, status_code: int, body: bytes = b'',
+                 headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+        self.encoding = 'utf-8'
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+
+class Transport(ABC):
+    """
+    Source of sessions for the crawler's ScraperSessionPool
+
+    A session is anything with requests' `get(url, timeout=, headers=,
+    stream=)` and `close()`.
+    """
+
+    name = 'base'
+    # Shown in the TUI status bar when not talking to the live site
+    label: Optional[str] = None
+
+    @abstractmethod
+    def create_session(self) -> Any:
+        """Return a new session for the pool"""
+
+    def close(self) -> None:
+        """Release anything the transport holds open"""
+
+
+class _TimedSession:
+    """Session wrapper that records how long each GET took"""
+
+    def __init__(self, scraper: Any, transport: 'LiveTransport'):
+        self.scraper = scraper
+        self.transport = transport
+
+    def get(self, url: str, **kwargs) -> Any:
+        started = time.perf_counter()
+        response = self.scraper.get(url, **kwargs)
+        self.transport.record_latency(url, time.perf_counter() - started)
+        return response
+
+    def close(self) -> None:
+        self.scraper.close()
+
+
+class LiveTransport(Transport):
+    """The real site, through cloudscraper"""
+
+    name = 'live'
+
+    def __init__(self, record_latencies: bool = False):
+        """
+        Args:
+            record_latencies: Time every request so save_latencies() can
+                store them for a later replay
+        """
+        self.record_latencies = record_latencies
+        self.latencies: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def create_session(self) -> Any:
+        scraper = create_default_scraper()
+        return _TimedSession(scraper, self) if self.record_latencies else scraper
+
+    def record_latency(self, url: str, seconds: float) -> None:
+        with self._lock:
+            self.latencies[urlparse(url).path] = round(seconds, 4)
+
+    def save_latencies(self, path: str) -> None:
+        """Merge the recorded latencies into a latencies file"""
+        with self._lock:
+            latencies = dict(self.latencies)
+        if not latencies:
+            return
+        merged = load_latencies(path)
+        merged.update(latencies)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=0, sort_keys=True)
+            f.write('\n')
+
+
+class _OfflineSession:
+    """Session handed out by an OfflineTransport; all state is on the transport"""
+
+    def __init__(self, transport: 'OfflineTransport'):
+        self.transport = transport
+
+    def get(self, url: str, **kwargs) -> TransportResponse:
+        return self.transport.get(url, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+class OfflineTransport(Transport):
+    """
+    Answers requests in-process from bodies supplied by a subclass
+
+    Each response is delayed by its recorded latency, or by `latency`
+    with up to `jitter` (a fraction) either way, derived from the URL so
+    runs are repeatable. Bodies get an ETag, and a matching
+    If-None-Match is answered with 304, so conditional requests behave
+    as they do against the site.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0,
+                 latencies: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            latency: Seconds before answering a URL with no recorded latency
+            jitter: Spread of that delay, as a fraction of `latency`
+            latencies: Recorded seconds per URL path
+        """
+        self.latency = max(0.0, latency)
+        self.jitter = min(max(0.0, jitter), 1.0)
+        self.latencies = latencies or {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def create_session(self) -> _OfflineSession:
+        return _OfflineSession(self)
+
+    @abstractmethod
+    def body_for(self, url: str) -> Optional[bytes]:
+        """Body served for `url`, or None for a 404"""
+
+    def latency_for(self, url: str) -> float:
+        path = urlparse(url).path
+        recorded = self.latencies.get(path)
+        if recorded is not None:
+            return recorded
+        if not self.jitter:
+            return self.latency
+        # Same URL, same delay: a fixed point in [-1, 1) from its hash
+        spread = int.from_bytes(hashlib.blake2b(path.encode('utf-8'), digest_size=2).digest(), 'big')
+        return self.latency * (1 + self.jitter * (spread / 32768 - 1))
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> TransportResponse:
+        with self._lock:
+            self.requests += 1
+        delay = self.latency_for(url)
+        if delay > 0:
+            time.sleep(delay)
+
+        body = self.body_for(url)
+        if body is None:
+            return TransportResponse(404)
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+        if headers and headers.get('If-None-Match') == etag:
+            return TransportResponse(304, headers={'ETag': etag})
+        return TransportResponse(200, body, {
+            'Content-Type': 'text/html; charset=utf-8',
+            'ETag': etag,
+        })
+
+
+class ReplayTransport(OfflineTransport):
+    """
+    Replays recorded pages from a PageArchive or a directory of fixtures
+
+    From an archive, each URL gets its newest stored version; listing
+    pages that were never stored come back empty, like pages past the end
+    of the site. A fixture directory is served like the benchmark replay
+    server: listing pages 1..page_count from its *.html files in rotation.
+    Latencies recorded next to the source (`<archive>.latencies.json`, or
+    `latencies.json` in the directory) are replayed per URL.
+    """
+
+    name = 'replay'
+    label = '重播模式'
+
+    def __init__(self, source: str, latency: float = 0.0, jitter: float = 0.0,
+                 page_count: Optional[int] = None):
+        """
+        Args:
+            source: PageArchive data file or directory of HTML fixtures
+            latency: Seconds before answering a URL with no recorded latency
+            jitter: Spread of that delay, as a fraction of `latency`
+            page_count: Listing pages served from a fixture directory
+                (default: one per fixture)
+        """
+        source = os.path.expanduser(source)
+        self.archive: Optional[PageArchive] = None
+        self.fixtures: List[bytes] = []
+        if os.path.isdir(source):
+            self.fixtures = load_fixtures(source)
+            self.page_count = page_count or len(self.fixtures)
+            latencies_path = os.path.join(source, LATENCIES_FILE)
+        elif os.path.exists(source):
+            self.archive = PageArchive(path=source, readonly=True)
+            self.page_count = page_count
+            latencies_path = source + LATENCIES_SUFFIX
+        else:
+            raise FileNotFoundError(f"No page archive or fixture directory at {source}")
+        super().__init__(latency, jitter, load_latencies(latencies_path))
+        self._bodies: Dict[int, bytes] = {}
+
+    def body_for(self, url: str) -> Optional[bytes]:
+        listing = LISTING_PATH_PATTERN.search(urlparse(url).path)
+        if self.archive is None:
+            if listing is None:
+                return None
+            page_num = int(listing.group(1))
+            # Sessions on several threads ask for pages at once
+            with self._lock:
+                body = self._bodies.get(page_num)
+                if body is None:
+                    body = fixture_page(self.fixtures, page_num, self.page_count)
+                    self._bodies[page_num] = body
+            return body
+
+        page = self.archive.get(url)
+        if page is not None:
+            return page.body.encode('utf-8')
+        return EMPTY_LISTING if listing is not None else None
+
+    def close(self) -> None:
+        if self.archive is not None:
+            self.archive.close()
+
+
+class SyntheticTransport(OfflineTransport):
+    """
+    Generates listing and detail pages in the site's markup
+
+    Records are derived from their serial number and `seed`, so every run
+    (and every page, in any order) sees the same data. IDs count down from
+    page 1, pagination links to the last page, and each record has a
+    detail page with vendor, severity, description and timeline.
+    """
+
+    name = 'synthetic'
+    label = '合成資料'
+
+    DEFAULT_PAGE_COUNT = 100
+    VENDORS = ('某科技公司', '某大學', '某銀行', '某縣市政府', '某醫院', '某電信公司', '某電商平台')
+    WEAKNESSES = ('SQL Injection', 'Stored XSS', 'Reflected XSS', 'CSRF', 'IDOR',
+                  '任意檔案上傳', '敏感資訊洩漏', '命令注入', '未授權存取')
+    SEVERITIES = ('低', '中', '高', '嚴重')
+
+    def __init__(self, page_count: int = DEFAULT_PAGE_COUNT, per_page: int = 20,
+                 year: int = 2024, seed: int = 0, latency: float = 0.0, jitter: float = 0.0):
+        """
+        Args:
+            page_count: Non-empty listing pages
+            per_page: Records per listing page
+            year: Year in the generated ZD IDs and dates
+            seed: Varies the generated vendors, titles and dates
+            latency: Seconds before answering each request
+            jitter: Spread of that delay, as a fraction of `latency`
+        """
+        super().__init__(latency, jitter)
+        self.page_count = max(0, page_count)
+        self.per_page = max(1, per_page)
+        self.year = year
+        self.seed = seed
+
+    def _record(self, serial: int) -> dict:
+        rng = random.Random(f"{self.seed}:{serial}")
+        vendor = rng.choice(self.VENDORS)
+        reported = date(self.year, 1, 1) + timedelta(days=serial * 365 // (self.page_count * self.per_page + 1))
+        return {
+            'zd_id': f"ZD-{self.year}-{serial:05d}",
+            'title': f"{vendor} {rng.choice(self.WEAKNESSES)} 漏洞",
+            'vendor': vendor,
+            'severity': rng.choice(self.SEVERITIES),
+            'reported': reported,
+            'disclosed': reported + timedelta(days=rng.randint(30, 120)),
+        }
+
+    def _listing(self, page_num: int) -> bytes:
+        top = self.page_count * self.per_page
+        first = top - (page_num - 1) * self.per_page
+        if page_num < 1 or first < 1:
+            return EMPTY_LISTING
+
+        items = []
+        for serial in range(first, max(0, first - self.per_page), -1):
+            record = self._record(serial)
+            items.append(
+                '  <li class="strip">\n'
+                f'    <h4 class="title tx-overflow-ellipsis"><a href="/vulnerability/{record["zd_id"]}">'
+                f'{escape(record["title"])}</a></h4>\n'
+                '    <div class="info">\n'
+                f'      <span class="zdid">{record["zd_id"]}</span>\n'
+                f'      <span class="date">{record["disclosed"]:%Y/%m/%d}</span>\n'
+                f'      <span class="vendor">{escape(record["vendor"])}</span>\n'
+                '      <span class="status">已公開</span>\n'
+                '    </div>\n'
+                '  </li>\n'
+            )
+        links = sorted({*range(max(1, page_num - 2), min(self.page_count, page_num + 2) + 1),
+                        self.page_count})
+        pagination = ''.join(
+            f'  <li class="page-item"><a class="page-link" '
+            f'href="/vulnerability/disclosed/page/{n}">{n}</a></li>\n'
+            for n in links
+        )
+        return (
+            '<!DOCTYPE html>\n<html lang="zh-Hant">\n<head>\n<meta charset="utf-8">\n'
+            '<title>已公開漏洞 | HITCON ZeroDay</title>\n</head>\n<body>\n<div class="container">\n'
+            '<ul class="vulnerability-list">\n' + ''.join(items) + '</ul>\n'
+            '<ul class="pagination">\n' + pagination + '</ul>\n</div>\n</body>\n</html>\n'
+        ).encode('utf-8')
+
+    def _detail(self, serial: int) -> Optional[bytes]:
+        if serial < 1 or serial > self.page_count * self.per_page:
+            return None
+        record = self._record(serial)
+        return (
+            '<!DOCTYPE html>\n<html lang="zh-Hant">\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{record["zd_id"]} | HITCON ZeroDay</title>\n</head>\n<body>\n'
+            f'<h1>{escape(record["title"])}</h1>\n'
+            f'<div>廠商：{escape(record["vendor"])}</div>\n'
+            f'<div>風險：{record["severity"]}</div>\n'
+            '<div>處理狀態：已公開</div>\n'
+            '<div>漏洞說明</div>\n'
+            f'<p>{escape(record["vendor"])} 的網站存在漏洞，攻擊者可藉此存取未授權的資料。</p>\n'
+            '<ul>\n'
+            f'<li>{record["reported"]:%Y/%m/%d} 通報</li>\n'
+            f'<li>{record["disclosed"]:%Y/%m/%d} 公開</li>\n'
+            '</ul>\n</body>\n</html>\n'
+        ).encode('utf-8')
+
+    def body_for(self, url: str) -> Optional[bytes]:
+        path = urlparse(url).path
+        listing = LISTING_PATH_PATTERN.search(path)
+        if listing is not None:
+            return self._listing(int(listing.group(1)))
+        detail = DETAIL_PATH_PATTERN.search(path)
+        if detail is not None and int(detail.group(2)) == self.year:
+            return self._detail(int(detail.group(3)))
+        return None
+
+
+def create_transport(mode: str = 'live', path: Optional[str] = None, latency: float = 0.0,
+                     jitter: float = 0.0, page_count: Optional[int] = None) -> Transport:
+    """
+    Build a transport from settings (the config's transport section or CLI flags)
+
+    Args:
+        mode: One of TRANSPORTS
+        path: Page archive or fixture directory to replay
+        latency: Offline response delay in seconds, where none was recorded
+        jitter: Spread of that delay, as a fraction of `latency`
+        page_count: Listing pages to serve (fixtures and synthetic only)
+    """
+    if mode == 'live':
+        return LiveTransport()
+    if mode == 'replay':
+        if not path:
+            raise ValueError("Replay needs a page archive or fixture directory")
+        return ReplayTransport(path, latency=latency, jitter=jitter, page_count=page_count)
+    if mode == 'synthetic':
+        return SyntheticTransport(
+            page_count=page_count or SyntheticTransport.DEFAULT_PAGE_COUNT,
+            latency=latency, jitter=jitter
+        )
+    raise ValueError(f"Unknown transport {mode!r} (expected one of {', '.join(TRANSPORTS)})")
@@ -0,0 +1,136 @@
+"""
+Watch mode for HITCON Vuls Crawler
+Polls page 1 with conditional requests and reports newly disclosed vulnerabilities
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Set, Tuple
+
+from crawler import HITCONVulsCrawler, Vulnerability
+from exporter import vulnerability_record
+from sync import KnownIdStore
+
+
+class DisclosureWatcher:
+    """
+    Detects vulnerabilities that appear at the top of the listing
+
+    Each poll is a single conditional request for page 1; an unchanged
+    listing costs a 304 and nothing is parsed. Only when every entry on
+    page 1 is new are further pages walked, until a known ID is reached.
+    """
+
+    DEFAULT_INTERVAL = 300.0
+    DEFAULT_MAX_PAGES = 5
+
+    def __init__(
+        self,
+        crawler: HITCONVulsCrawler,
+        known: Optional[KnownIdStore] = None,
+        max_pages: int = DEFAULT_MAX_PAGES
+    ):
+        """
+        Args:
+            crawler: Crawler used for polling; give it a disk cache so
+                polls can be conditional
+            known: Persisted IDs to diff against; without one, the first
+                poll only records what is already listed
+            max_pages: Pages to walk at most when page 1 is entirely new
+        """
+        self.crawler = crawler
+        self.known = known
+        self.max_pages = max(1, max_pages)
+        self._seen: Set[str] = set(known.ids) if known is not None else set()
+        self._seeded = bool(self._seen)
+        # Set when a walk failed, so the next poll re-reads an unchanged page 1
+        self._incomplete = False
+
+    def seed(self, vulns: List[Vulnerability]) -> None:
+        """Treat records the caller has already shown as seen"""
+        self._remember(vulns)
+        self._seeded = True
+
+    def poll(self) -> Tuple[List[Vulnerability], Optional[str]]:
+        """
+        Check the listing once
+
+        Returns:
+            Tuple of (new vulnerabilities, oldest first; error message or None)
+        """
+        vulns, error = self.crawler.poll_page(1, if_changed=self._seeded and not self._incomplete)
+        if error is not None:
+            return [], error
+        if vulns is None:
+            return [], None
+
+        if not self._seeded:
+            self.seed(vulns)
+            return [], None
+
+        new_vulns: List[Vulnerability] = []
+        new_ids: Set[str] = set()
+        page_num = 1
+        while True:
+            fresh = [vul for vul in vulns if vul.zd_id not in self._seen]
+            for vul in fresh:
+                # The listing can shift between pages and repeat an entry
+                if vul.zd_id not in new_ids:
+                    new_ids.add(vul.zd_id)
+                    new_vulns.append(vul)
+            # A known ID (or the end of the listing) means nothing was missed
+            if len(fresh) < len(vulns) or not vulns or page_num >= self.max_pages:
+                break
+            page_num += 1
+            vulns, error = self.crawler.get_vulnerabilities_with_error(page_num, use_cache=False)
+            if error is not None:
+                # Report nothing rather than leave a gap behind the known IDs
+                self._incomplete = True
+                return [], error
+
+        self._incomplete = False
+        self._remember(new_vulns)
+        return list(reversed(new_vulns)), None
+
+    def _remember(self, vulns: List[Vulnerability]) -> None:
+        zd_ids = [vul.zd_id for vul in vulns]
+        self._seen.update(zd_ids)
+        if self.known is not None:
+            self.known.add_all(zd_ids)
+
+
+def new_vulnerability_event(vul: Vulnerability, detected_at: Optional[float] = None) -> dict:
+    """Build the JSON event emitted for one newly disclosed vulnerability"""
+    event = {"event": "new_vulnerability"}
+    event.update(vulnerability_record(vul))
+    event["detected_at"] = datetime.fromtimestamp(
+        time.time() if detected_at is None else detected_at, timezone.utc
+    ).isoformat(timespec='seconds')
+    return event
+
+
+def post_webhook(url: str, events: List[dict], timeout: float = 10.0) -> Optional[str]:
+    """
+    POST a batch of events to a webhook as {"events": [...]}
+
+    Returns:
+        Error message, or None if the webhook accepted the batch
+    """
+    # urllib is only needed when a webhook is configured
+    import urllib.error
+    import urllib.request
+
+    body = json.dumps({"events": events}, ensure_ascii=False).encode('utf-8')
+    request = urllib.request.Request(
+        url, data=body, method='POST',
+        headers={'Content-Type': 'application/json; charset=utf-8'}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        return f"HTTP {e.code}"
+    except Exception as e:
+        return str(e)
+    return None